@@ -7,6 +7,10 @@
 
 from abc import ABC
 from os import environ
+from typing import Union
+
+from framework_modules.fundamental_auto_libs.ui_automation.locator import \
+    Locator
 
 from .setup_driver import MOBILE_DRIVER
 
@@ -21,12 +25,14 @@ class BasedPage(ABC):
         self.driver.logger.info(f'The test is conducted '
                                 f'under version {self.version}')
 
-    def _click_on_locator(self, locator: str, timeout: int = -1):
+    def _click_on_locator(self, locator: Union[str, Locator],
+                          timeout: int = -1):
         self.driver.click_on_locator_with_wait_explicit(
             locator=locator, timeout=timeout
         )
 
-    def _send_string_to_locator(self, locator: str, str_to_be_sent: str):
+    def _send_string_to_locator(self, locator: Union[str, Locator],
+                                str_to_be_sent: str):
         self.driver.send_string_with_wait_explicit(
             locator=locator,
             str_to_be_sent=str_to_be_sent)
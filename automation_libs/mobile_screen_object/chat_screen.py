@@ -9,17 +9,20 @@ from test_data.common_variables import DEFAULT_APP_USER_TO_SEND_MESSAGE, \
     DEFAULT_APP_MESSAGE
 from random import randint
 
+from framework_modules.fundamental_auto_libs.ui_automation.locator import \
+    Locator
+
 from .based import BasedPage
 
 
 class ChatScreen(BasedPage):
     def __init__(self):
         super().__init__()
-        self.new_chat_button = 'id=com.vsee.vsee.beta:id/action_add'
-        self.demo_friend = 'xpath=//*[@text="{}"]'
-        self.done_button = 'id=com.vsee.vsee.beta:id/action_done'
-        self.chat_box = 'id=com.vsee.vsee.beta:id/chatEditText'
-        self.send_button = 'id=com.vsee.vsee.beta:id/chatSendBut'
+        self.new_chat_button = Locator('id=com.vsee.vsee.beta:id/action_add')
+        self.demo_friend = Locator('xpath=//*[@text="{}"]')
+        self.done_button = Locator('id=com.vsee.vsee.beta:id/action_done')
+        self.chat_box = Locator('id=com.vsee.vsee.beta:id/chatEditText')
+        self.send_button = Locator('id=com.vsee.vsee.beta:id/chatSendBut')
         self.random_num = str(randint(0, 1000))
 
     def start_new_chat(self, email: str = DEFAULT_APP_USER_TO_SEND_MESSAGE,
@@ -5,13 +5,16 @@
 
 """
 
+from framework_modules.fundamental_auto_libs.ui_automation.locator import \
+    Locator
+
 from .based import BasedPage
 
 
 class FooterMenu(BasedPage):
     def __init__(self):
         super().__init__()
-        self.chat = 'xpath=//*[@content-desc="Chats"]'
+        self.chat = Locator('xpath=//*[@content-desc="Chats"]')
 
     def navigate_to_chat_screen(self):
         self.driver.logger.info("Navigate to the Chat Screen.")
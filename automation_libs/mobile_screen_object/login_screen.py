@@ -7,15 +7,22 @@
 
 from test_data.common_variables import SenderEmail
 
+from framework_modules.fundamental_auto_libs.ui_automation.locator import \
+    Locator
+
 from .based import BasedPage
 
 
 class LoginScreen(BasedPage):
     def __init__(self):
         super().__init__()
-        self.email_field = 'id=com.vsee.vsee.beta:id/loginEmailEdit'
-        self.password_field = 'id=com.vsee.vsee.beta:id/loginPasswordEdit'
-        self.sign_in_button = 'id=com.vsee.vsee.beta:id/loginSignInBut'
+        self.email_field = Locator('id=com.vsee.vsee.beta:id/loginEmailEdit')
+        self.password_field = Locator(
+            'id=com.vsee.vsee.beta:id/loginPasswordEdit'
+        )
+        self.sign_in_button = Locator(
+            'id=com.vsee.vsee.beta:id/loginSignInBut'
+        )
 
     def sign_in(self, username: str = SenderEmail.username,
                 password: str = SenderEmail.password):
@@ -5,7 +5,11 @@
 
 """
 
+from robot.libraries.BuiltIn import BuiltIn
 from selenium.webdriver.common.keys import Keys
+from framework_modules import ARGUMENTS
+from framework_modules.fundamental_auto_libs.ui_automation.locator import \
+    Locator
 from .based import BasedPage
 from typing import Union
 
@@ -16,11 +20,15 @@ from random import randint
 class GmailPage(BasedPage):
     def __init__(self):
         super().__init__()
-        self.new_email_button = 'xpath=//div[@class="z0"]/div'
-        self.send_to_address_field = 'xpath=//div[@class="afp"]//input'
-        self.subject_field = 'xpath=//input[@name="subjectbox"]'
-        self.content_field = 'xpath=//td[@class="Ap"]/div/div[@role="textbox"]'
-        self.send_mail_button = 'xpath=//div[@class="dC"]/div[1]'
+        self.new_email_button = Locator('xpath=//div[@class="z0"]/div')
+        self.send_to_address_field = Locator(
+            'xpath=//div[@class="afp"]//input'
+        )
+        self.subject_field = Locator('xpath=//input[@name="subjectbox"]')
+        self.content_field = Locator(
+            'xpath=//td[@class="Ap"]/div/div[@role="textbox"]'
+        )
+        self.send_mail_button = Locator('xpath=//div[@class="dC"]/div[1]')
 
     def send_mail(self, receivers: Union[str, list] = Receiver.username,
                   subject: str = MailContent.subject,
@@ -44,6 +52,11 @@ class GmailPage(BasedPage):
 
         self.driver.logger.info("Send email")
         self._click_on_locator(self.new_email_button)
+        compose_fields = [self.send_to_address_field, self.subject_field,
+                          self.content_field, self.send_mail_button]
+        if not all(self.driver.are_visible(
+                compose_fields, timeout=self.driver.default_explicit_wait)):
+            raise AssertionError('The compose form is not opened.')
         list_receiver = []
         if type(receivers) == str:
             list_receiver = [receivers]
@@ -53,9 +66,8 @@ class GmailPage(BasedPage):
             self.driver.logger.debug(
                 f"Input '{receiver}' to the address field.")
             self._send_string_to_locator(self.send_to_address_field, receiver)
-            self.driver.get_element(
-                self.send_to_address_field
-            ).send_keys(Keys.ENTER)
+            self.driver.send_keys_to_element(self.send_to_address_field,
+                                             Keys.ENTER)
         random_number = str(randint(0, 1000))
         self.driver.logger.debug(f"Input '{subject.format(random_number)}' "
                                  f"to the subject field.")
@@ -67,5 +79,26 @@ class GmailPage(BasedPage):
         self._click_on_locator(self.content_field)
         self._send_string_to_locator(self.content_field,
                                      content.format(random_number))
+        typed_subject, typed_content = self.driver.get_texts(
+            [self.subject_field, self.content_field])
+        if subject.format(random_number) != typed_subject \
+                or content.format(random_number) not in (typed_content or ''):
+            raise AssertionError(f"The compose form holds the subject "
+                                 f"'{typed_subject}' and the content "
+                                 f"'{typed_content}'.")
         self._click_on_locator(self.send_mail_button)
         return random_number
+
+    def assert_inbox_page_budget(self, **budget):
+        """Assert the performance budget of the inbox once it is loaded,
+        e.g. load=10s. The test is skipped without the --page-metrics flag."""
+        if not ARGUMENTS.page_metrics:
+            BuiltIn().skip('The page budget is checked with --page-metrics.')
+        if not self.driver.wait_explicit(
+                condition="visibility_of_element_located",
+                locator=self.new_email_button):
+            raise AssertionError('The Gmail inbox is not loaded.')
+        if not self.driver.collect_page_metrics():
+            raise AssertionError('The metrics of the Gmail inbox are not '
+                                 'collected.')
+        self.assert_page_budget(**budget)
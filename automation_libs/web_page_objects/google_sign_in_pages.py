@@ -5,34 +5,65 @@
 
 """
 
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
 from time import sleep
+from urllib.parse import urlsplit
 from test_data.common_variables import GMAIL_LOGIN_URL, SenderEmail
 
+from framework_modules.fundamental_auto_libs.ui_automation.locator import \
+    Locator
+
 from .based import BasedPage
 
 
 class GoogleSignInPage(BasedPage):
     def __init__(self):
         super().__init__()
-        self.email_or_phone_number_field = 'xpath=//input[@type="email"]'
-        self.next_button = 'xpath=//div[@id="identifierNext"]/div/button'
-        self.password_field = 'xpath=//input[@type="password"]'
-        self.login_button = 'xpath=//button[@name="login"]'
+        self.email_or_phone_number_field = Locator(
+            'xpath=//input[@type="email"]'
+        )
+        self.next_button = Locator(
+            'xpath=//div[@id="identifierNext"]/div/button'
+        )
+        self.password_field = Locator('xpath=//input[@type="password"]')
+        self.login_button = Locator('xpath=//button[@name="login"]')
+        self.signed_in_email = None
+
+    def __is_signed_in(self) -> bool:
+        """The signed out sessions are redirected to the sign in pages."""
+        current_url = urlsplit(self.driver.driver.current_url)
+        return current_url.netloc == urlsplit(GMAIL_LOGIN_URL).netloc \
+            and current_url.path.startswith('/mail')
 
-    def access_gmail_url(self):
+    def access_gmail_url(self, email: str = SenderEmail.username):
+        """Access the Gmail URL, signed in with the saved storage state of
+        the email when it is still valid."""
+        self.signed_in_email = None
+        if self.driver.restore_storage_state(email, GMAIL_LOGIN_URL):
+            self.driver.logger.info("Access Gmail URL with the saved "
+                                    "storage state.")
+            self.driver.go_to_url(GMAIL_LOGIN_URL)
+            if self.__is_signed_in():
+                self.signed_in_email = email
+                return
+            self.driver.discard_storage_state(email, GMAIL_LOGIN_URL)
         self.driver.logger.info("Access Gmail login URL.")
         self.driver.go_to_url(GMAIL_LOGIN_URL)
 
     def sign_in_gmail(self, email: str = SenderEmail.username,
                       password: str = SenderEmail.password):
+        if self.signed_in_email == email:
+            self.driver.logger.info(f"{email} is already signed in.")
+            return
         self.driver.logger.info("Enter Gmail.")
         self._send_string_to_locator(
                 locator=self.email_or_phone_number_field, str_to_be_sent=email
             )
         self.driver.logger.info("Press Enter.")
-        self.driver.get_element(
-            self.email_or_phone_number_field).send_keys(Keys.RETURN)
+        self.driver.send_keys_to_element(self.email_or_phone_number_field,
+                                         Keys.RETURN)
         self.driver.logger.info("Enter Password.")
         for try_times in range(5):
             if self.driver.wait_explicit(
@@ -47,4 +78,18 @@ class GoogleSignInPage(BasedPage):
                 locator=self.password_field, str_to_be_sent=password
             )
         self.driver.logger.info("Press Enter.")
-        self.driver.get_element(self.password_field).send_keys(Keys.RETURN)
+        self.driver.send_keys_to_element(self.password_field, Keys.RETURN)
+        try:
+            WebDriverWait(self.driver.driver, 30).until(
+                lambda _: self.__is_signed_in())
+        except TimeoutException:
+            self.driver.logger.warn("Gmail is not loaded after signing in, "
+                                    "the storage state is not saved.")
+            return
+        self.signed_in_email = email
+        # Gmail writes its storage while the inbox loads, the state is saved
+        # once the page is quiet.
+        if not self.driver.is_page_fully_loaded():
+            self.driver.logger.warn("Gmail is still loading, the storage "
+                                    "state may be incomplete.")
+        self.driver.save_storage_state(email, GMAIL_LOGIN_URL)
@@ -15,7 +15,7 @@ def __get_args() -> argparse.Namespace:
     Returns
     -------
     argparse.Namespace
-        browser : browser to execute test on
+        browser : browsers to execute test on
         mobile_device : device to test on
         mobile_platform : {iOS, Android}
         mobile_platform_ver : mobile platform version
@@ -27,6 +27,26 @@ def __get_args() -> argparse.Namespace:
                       default = 3.
         run_allure : Start allure reporting server after test.
         headless : Run browser in headless mode.
+        parallel_modules : The amount of worker processes that execute test
+                           modules concurrently, default = 1 (serial).
+        shard_by : {suite, test} split every module into shards that are
+                   executed by a pool of worker processes.
+        shard_workers : The amount of worker processes for shards and
+                        retries, default = CPU count.
+        robot_html : Generate robot log and report from the merged outputs.
+        extract_test_log : Print the events of a test from the event logs.
+        events_dir : Directory to search the event logs, default = logs.
+        retention_max_age : Remove the runs older than this amount of days.
+        retention_max_size : Remove the oldest runs until the logs of runs
+                             take at most this amount of MB.
+        retention_keep_last : Keep this amount of latest runs per module.
+        retention_compress_after : Compress the runs per module except this
+                                   amount of latest ones.
+        browser_pool : The amount of warm browser sessions per process,
+                       default = 0 (no pool).
+        browser_max_uses : The amount of tests after which a pooled browser
+                           session is replaced, default = 10.
+        driver_mirror : Directory or URL that mirrors the driver downloads.
     """
     parser = argparse.ArgumentParser(description='Test Execution arguments '
                                                  'handling')
@@ -35,8 +55,10 @@ def __get_args() -> argparse.Namespace:
                         help='{api, mobile, web, all}')
     parser.add_argument('-t', '--tags', required=False, nargs='*',
                         help='Identifier of test cases to be run')
-    parser.add_argument('--browser', required=False,
-                        default='chrome', help='Browser to be run')
+    parser.add_argument('--browser', required=False, nargs='+',
+                        default=['chrome'],
+                        help='Browsers to be run, the web module runs once '
+                             'per browser in parallel: chrome brave')
     parser.add_argument('--device-name', required=False,
                         help='Device to run test cases for mobile apps')
     parser.add_argument('--mobile-platform-ver', required=False,
@@ -59,6 +81,76 @@ def __get_args() -> argparse.Namespace:
                              "failed, default=3")
     parser.add_argument('--gen-doc', required=False, action='store_true',
                         help='Generate test case documentation')
+    parser.add_argument('--parallel-modules', required=False, type=int,
+                        default=1,
+                        help='The amount of worker processes that execute '
+                             'test modules concurrently, default=1')
+    parser.add_argument('--shard-by', required=False,
+                        choices=['suite', 'test'],
+                        help='Split every module into suites or tests that '
+                             'are executed by a pool of worker processes')
+    parser.add_argument('--shard-workers', required=False, type=int,
+                        help='The amount of worker processes for shards and '
+                             'retries, default=CPU count')
+    parser.add_argument('--robot-html', required=False, action='store_true',
+                        help='Generate robot log and report from the merged '
+                             'outputs')
+    parser.add_argument('--extract-test-log', required=False,
+                        help='Print the events of the given test name from '
+                             'the event logs')
+    parser.add_argument('--events-dir', required=False,
+                        help='Directory of a run to search the event logs, '
+                             'default=logs')
+    parser.add_argument('--retention-max-age', required=False, type=float,
+                        help='Remove the logs of runs older than this amount '
+                             'of days')
+    parser.add_argument('--retention-max-size', required=False, type=float,
+                        help='Remove the oldest logs of runs until they take '
+                             'at most this amount of MB')
+    parser.add_argument('--retention-keep-last', required=False, type=int,
+                        help='Keep the logs of this amount of latest runs '
+                             'per module')
+    parser.add_argument('--retention-compress-after', required=False,
+                        type=int,
+                        help='Compress the logs of runs per module except '
+                             'this amount of latest ones')
+    parser.add_argument('--browser-pool', required=False, type=int,
+                        default=0,
+                        help='The amount of browser sessions that are '
+                             'launched in advance and reused by the tests '
+                             'of every process, default=0 (no pool)')
+    parser.add_argument('--browser-max-uses', required=False, type=int,
+                        default=10,
+                        help='The amount of tests after which a pooled '
+                             'browser session is replaced, default=10')
+    parser.add_argument('--driver-mirror', required=False,
+                        help='Directory or file://, http:// URL that mirrors '
+                             'the driver download server, for offline runs')
+    parser.add_argument('--network-profile', required=False,
+                        help='Comma separated network profiles of the web '
+                             'runs: lean, cold-cache, fast-3g, slow-3g, the '
+                             'Network Profile metadata of a suite overrides '
+                             'it')
+    parser.add_argument('--storage-state-ttl', required=False, type=float,
+                        default=60,
+                        help='The amount of minutes that the cookies and '
+                             'local storage saved after a login are reused '
+                             'by the next sessions, 0 disables them, '
+                             'default=60')
+    parser.add_argument('--in-browser-wait', required=False,
+                        action='store_true',
+                        help='Evaluate the explicit waits of the web and '
+                             'webview tests in the browser instead of '
+                             'polling the driver')
+    parser.add_argument('--command-latency', required=False,
+                        action='store_true',
+                        help='Time every WebDriver and Appium command, the '
+                             'latency histograms are saved next to the '
+                             'output.xml and attached to the Allure report')
+    parser.add_argument('--page-metrics', required=False,
+                        action='store_true',
+                        help='Collect the navigation timing and Web Vitals '
+                             'of every page that the web tests access')
     return parser.parse_args()
 
 
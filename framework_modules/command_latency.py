@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module measures the latency of the WebDriver commands.
+
+The command executor of a driver is wrapped to time every command, the
+timings go into latency histograms per test and per command. The histograms
+have exponential buckets, thus they merge by adding counts and give the
+p50/p95/p99 within 25%.
+
+The feature is enabled by registering CommandLatencyListener, drivers are
+instrumented only when the listener is registered in the current process:
+without it instrument_driver returns the driver untouched.
+
+Every worker process saves its histograms next to the output.xml of the
+module when it exits, and the listener attaches the latencies of every test
+to the Allure report:
+    {robot report dir}/command-latency-{pid}.json
+They are merged into command-latency.json once the module is executed.
+
+Only the commands issued by the tests are charged to the running test. The
+commands of the browser pool, its launcher thread and the reset of released
+sessions, are recorded under the POOL_TEST bucket.
+
+    Functions in this module:
+
+        +   instrument_driver(driver) -> driver
+                Time every command of the driver.
+
+        +   pool_commands() -> ContextManager
+                Record the commands of the block under the pool bucket.
+
+        +   merge_command_latency(output_dir: str) -> dict
+                Merge the command latencies of the worker processes.
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from glob import glob
+from json import load, dump
+from os import getpid, remove, path
+from threading import get_ident, local, Lock
+from time import perf_counter
+
+import allure
+from allure_commons.types import AttachmentType
+
+from .internal_path import INTERNAL_PATH
+from .log_sink import register_exit_handler
+
+
+# Upper bounds of the buckets in milliseconds, from 0.5 ms to about 10 min.
+BUCKET_BOUNDS = [0.5 * 1.25 ** index_ for index_ in range(64)]
+
+PERCENTILES = (50, 95, 99)
+
+# Test name that the commands of the browser pool are recorded under.
+POOL_TEST = '(browser pool)'
+
+_POOL_COMMANDS = local()
+
+
+class LatencyHistogram:
+    """Latency histogram.
+
+    Attributes
+    ----------
+    buckets : dict
+        Amount of latencies per bucket index.
+    count : int
+    total : float
+        Sum of the latencies in milliseconds.
+    maximum : float
+        Longest latency in milliseconds.
+    """
+
+    def __init__(self, buckets: dict = None, count: int = 0,
+                 total: float = 0.0, maximum: float = 0.0):
+        """Constructor."""
+        self.buckets = {int(key_): value_
+                        for key_, value_ in (buckets or {}).items()}
+        self.count = count
+        self.total = total
+        self.maximum = maximum
+
+    def add(self, latency: float) -> None:
+        index = min(bisect_left(BUCKET_BOUNDS, latency),
+                    len(BUCKET_BOUNDS) - 1)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += latency
+        self.maximum = max(self.maximum, latency)
+
+    def merge(self, histogram: 'LatencyHistogram') -> None:
+        for index_, count_ in histogram.buckets.items():
+            self.buckets[index_] = self.buckets.get(index_, 0) + count_
+        self.count += histogram.count
+        self.total += histogram.total
+        self.maximum = max(self.maximum, histogram.maximum)
+
+    def percentile(self, percent: float) -> float:
+        """Get the upper bound of the bucket of the percentile."""
+        rank = percent / 100 * self.count
+        cumulative = 0
+        for index_ in sorted(self.buckets):
+            cumulative += self.buckets[index_]
+            if cumulative >= rank:
+                return min(BUCKET_BOUNDS[index_], self.maximum)
+        return self.maximum
+
+    def to_dict(self) -> dict:
+        return {'buckets': self.buckets, 'count': self.count,
+                'total': self.total, 'maximum': self.maximum}
+
+    def summarize(self) -> dict:
+        summary = {'count': self.count, 'total_ms': round(self.total, 1),
+                   'max_ms': round(self.maximum, 1)}
+        summary.update({f'p{percent_}_ms': round(self.percentile(percent_), 1)
+                        for percent_ in PERCENTILES})
+        return summary
+
+
+class CommandLatencyRecorder:
+    """Command latency recorder.
+
+    Attributes
+    ----------
+    latency_file : str
+        Path to the file that the histograms are saved to.
+    current_test : str
+        Long name of the running test.
+    test_thread : int
+        Identifier of the thread that runs the tests, the commands of the
+        other threads are recorded under POOL_TEST.
+    """
+
+    def __init__(self, latency_file: str):
+        """Constructor."""
+        self.latency_file = latency_file
+        self.current_test = None
+        self.test_thread = get_ident()
+        self.__histograms = {}
+        self.__lock = Lock()
+
+    def record(self, command: str, latency: float) -> None:
+        test = self.current_test
+        if get_ident() != self.test_thread \
+                or getattr(_POOL_COMMANDS, 'active', False):
+            test = POOL_TEST
+        with self.__lock:
+            key = (test, command)
+            if key not in self.__histograms:
+                self.__histograms[key] = LatencyHistogram()
+            self.__histograms[key].add(latency)
+
+    def get_test_histograms(self, test_name: str) -> dict:
+        with self.__lock:
+            return {command_: histogram_ for (test_, command_), histogram_
+                    in self.__histograms.items() if test_ == test_name}
+
+    def save(self) -> None:
+        with self.__lock:
+            histograms = [dict(histogram_.to_dict(), test=test_,
+                               command=command_)
+                          for (test_, command_), histogram_
+                          in self.__histograms.items()]
+        if not histograms:
+            return
+        with open(self.latency_file, 'w', encoding='utf-8') as file_:
+            dump(histograms, file_)
+
+
+_RECORDER = {'recorder': None}
+
+
+def instrument_driver(driver):
+    """Instrument driver.
+
+    Wrap the command executor of the driver to time every command, when the
+    command latency is enabled in the current process.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium or Appium driver.
+
+    Returns
+    -------
+    WebDriver
+        The driver.
+    """
+    recorder = _RECORDER.get('recorder')
+    if recorder is None:
+        return driver
+    executor = driver.command_executor
+    execute = executor.execute
+
+    def timed_execute(command: str, params: dict):
+        started = perf_counter()
+        try:
+            return execute(command, params)
+        finally:
+            recorder.record(command, (perf_counter() - started) * 1000)
+
+    executor.execute = timed_execute
+    return driver
+
+
+@contextmanager
+def pool_commands():
+    """Pool commands.
+
+    Record the commands issued in the block under the pool bucket instead of
+    the running test, e.g. the reset of a released session.
+    """
+    active = getattr(_POOL_COMMANDS, 'active', False)
+    _POOL_COMMANDS.active = True
+    try:
+        yield
+    finally:
+        _POOL_COMMANDS.active = active
+
+
+def _format_table(histograms: dict) -> str:
+    """Format the histograms of the commands, the longest total first."""
+    lines = [f"{'command':<32}{'count':>8}{'total ms':>12}"
+             f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for command_, histogram_ in sorted(histograms.items(),
+                                       key=lambda item_: -item_[1].total):
+        lines.append(
+            f"{command_:<32}{histogram_.count:>8}{histogram_.total:>12.1f}"
+            f"{histogram_.percentile(50):>10.1f}"
+            f"{histogram_.percentile(95):>10.1f}"
+            f"{histogram_.percentile(99):>10.1f}"
+            f"{histogram_.maximum:>10.1f}"
+        )
+    return '\n'.join(lines)
+
+
+class CommandLatencyListener:
+    """Command latency listener.
+
+    Robot listener that enables the command latency in the current process,
+    tracks the current test and attaches the latencies of every test to the
+    Allure report. It must be registered before the Allure listener, which
+    closes the test at its end.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, test_module: str):
+        """Constructor."""
+        output_dir = path.dirname(
+            INTERNAL_PATH.current_output_xml.get(test_module)
+        )
+        recorder = _RECORDER.get('recorder')
+        if recorder is None or path.dirname(recorder.latency_file) \
+                != output_dir:
+            recorder = CommandLatencyRecorder(
+                f"{output_dir}/command-latency-{getpid()}.json"
+            )
+            register_exit_handler(recorder, CommandLatencyRecorder.save)
+            _RECORDER['recorder'] = recorder
+        self.recorder = recorder
+
+    def start_test(self, name: str, attributes: dict) -> None:
+        self.recorder.current_test = attributes.get('longname')
+
+    def end_test(self, name: str, attributes: dict) -> None:
+        histograms = self.recorder.get_test_histograms(
+            attributes.get('longname'))
+        self.recorder.current_test = None
+        if histograms:
+            allure.attach(_format_table(histograms),
+                          name='WebDriver command latency',
+                          attachment_type=AttachmentType.TEXT)
+
+
+def merge_command_latency(output_dir: str) -> dict:
+    """Merge command latency.
+
+    Merge the histograms of the worker processes into command-latency.json,
+    the files of the workers are removed.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directory of the output.xml of the module.
+
+    Returns
+    -------
+    dict
+        Summary per command and per test and command, None if no command
+        was recorded.
+    """
+    commands = {}
+    tests = {}
+    for latency_file in glob(f"{output_dir}/command-latency-*.json"):
+        try:
+            with open(latency_file, encoding='utf-8') as file_:
+                histograms = load(file_)
+        except (OSError, ValueError):
+            continue
+        remove(latency_file)
+        for histogram_ in histograms:
+            test = histogram_.pop('test')
+            command = histogram_.pop('command')
+            commands.setdefault(command, LatencyHistogram()).merge(
+                LatencyHistogram(**histogram_))
+            tests.setdefault(test, {}).setdefault(
+                command, LatencyHistogram()).merge(
+                LatencyHistogram(**histogram_))
+    if not commands:
+        return None
+    merged = {
+        'commands': {command_: histogram_.summarize() for command_, histogram_
+                     in sorted(commands.items(),
+                               key=lambda item_: -item_[1].total)},
+        'tests': {str(test_): {command_: histogram_.summarize()
+                               for command_, histogram_ in commands_.items()}
+                  for test_, commands_ in tests.items()}
+    }
+    with open(path.join(output_dir, 'command-latency.json'), 'w',
+              encoding='utf-8') as file_:
+        dump(merged, file_, indent=4)
+    return merged
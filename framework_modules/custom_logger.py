@@ -6,10 +6,19 @@ Custom logging module.
 """
 
 from robot.api import logger
-from robot.libraries.BuiltIn import BuiltIn
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
 from datetime import datetime
+from time import time
+from typing import Callable, Union
 
 from .internal_path import INTERNAL_PATH
+from .log_sink import get_log_sink
+from .event_log import emit_event
+
+
+# Severity of robot log levels.
+LOG_LEVELS = {'TRACE': 0, 'DEBUG': 1, 'INFO': 2, 'WARN': 3, 'ERROR': 4,
+              'NONE': 5}
 
 
 class CustomLogger:
@@ -19,6 +28,12 @@ class CustomLogger:
     logger of robot.api library, this class provides logging for multiple
     levels (info, debug, warn, error).
 
+    A message is rendered only when the active robot log level emits it. The
+    message can be a callable that returns the text, or a format string with
+    its arguments:
+        LOGGER.debug(lambda: make_beauty_json(response))
+        LOGGER.debug("Status code: %s", status_code)
+
     Attributes
     ----------
     __current_test_name : str
@@ -31,30 +46,101 @@ class CustomLogger:
     __log_to_console(self, level: str, message: str) -> None
         Private method, print log to console.
 
-    debug(self, message: str) -> None:
+    is_enabled(level: str) -> bool:
+        Check if the active log level emits the level.
+
+    debug(self, message: str, *args) -> None:
         Call Logger at Debug level.
 
-    info(self, message: str, timestamp=True) -> None:
+    info(self, message: str, *args, timestamp=True) -> None:
         Call Logger at Info level.
 
-    warn(self, message: str) -> None:
+    warn(self, message: str, *args) -> None:
         Call Logger at Warn level.
 
-    error(self, message: str) -> None:
+    error(self, message: str, *args) -> None:
         Call Logger at Error level.
     """
 
+    # [epoch second, formatted second] of the latest timestamp.
+    __timestamp_cache = [None, '']
+
     def __init__(self, test_module: str):
         """Constructor."""
         self.__current_test_name = BuiltIn().get_variable_value("${TEST_NAME}")
         self._logging = logger
         self.__test_module = test_module
 
+    @classmethod
+    def _format_timestamp(cls) -> str:
+        """Format timestamp.
+
+        The date and time part is formatted once per second, only the
+        microseconds are formatted on every call.
+
+        Returns
+        -------
+        str
+        """
+        now = time()
+        second = int(now)
+        if cls.__timestamp_cache[0] != second:
+            cls.__timestamp_cache = [
+                second,
+                datetime.fromtimestamp(second).strftime("%Y-%m-%d %H-%M-%S")
+            ]
+        return f"{cls.__timestamp_cache[1]}.{int((now - second) * 1e6):06d}"
+
+    @staticmethod
+    def is_enabled(level: str) -> bool:
+        """Is enabled.
+
+        Check if the active robot log level, INFO or TRACE as set by
+        execute_robot_test_cases, emits the given level.
+
+        Parameters
+        ----------
+        level : str
+            {TRACE, DEBUG, INFO, WARN, ERROR}
+
+        Returns
+        -------
+        bool
+        """
+        try:
+            active_level = BuiltIn().get_variable_value("${LOG LEVEL}",
+                                                        "INFO")
+        except RobotNotRunningError:
+            active_level = "INFO"
+        return LOG_LEVELS.get(level, 0) \
+            >= LOG_LEVELS.get(str(active_level).upper(), 2)
+
+    @staticmethod
+    def _render(message: Union[str, Callable[[], str]], args: tuple) -> str:
+        """Render message.
+
+        Parameters
+        ----------
+        message : Union[str, Callable]
+            Message, format string or callable that returns the message.
+        args : tuple
+            Arguments of the format string.
+
+        Returns
+        -------
+        str
+        """
+        if callable(message):
+            message = message()
+        if args:
+            return str(message) % args
+        return str(message)
+
     def __log_to_console(self, level: str, message: str,
                          timestamp: bool = True) -> None:
         """Log to console.
 
-        This method print log to console.
+        This method print log to console, execution.log and the event log.
 
         Parameters
         ----------
@@ -69,43 +155,51 @@ class CustomLogger:
         -------
         None
         """
-        current = datetime.now().strftime("%Y-%m-%d %H-%M-%S.%f")
-        time_stamp_prefix = current + ' - ' + level + ' - '
-        if not timestamp:
-            time_stamp_prefix = ''
-        self._logging.console(time_stamp_prefix + str(message))
-        execution_log = open(
+        time_stamp_prefix = ''
+        if timestamp:
+            time_stamp_prefix = \
+                self._format_timestamp() + ' - ' + level + ' - '
+        self._logging.console(time_stamp_prefix + message)
+        get_log_sink(
             INTERNAL_PATH.current_execution_log_dir.get(self.__test_module)
-            + '/execution.log', 'a+'
-        )
-        execution_log.write(time_stamp_prefix + str(message) + '\n')
+            + '/execution.log'
+        ).write(time_stamp_prefix + message + '\n')
+        emit_event(self.__test_module, level, message)
 
-    def debug(self, message: str) -> None:
+    def debug(self, message: Union[str, Callable[[], str]], *args) -> None:
         """Debug.
 
         This method logs at Debug level.
 
         Parameters
         ----------
-        message : str
+        message : Union[str, Callable]
             Content to be logged.
+        args
+            Arguments of the format string.
 
         Returns
         -------
         None
         """
+        if not self.is_enabled('DEBUG'):
+            return
+        message = self._render(message, args)
         self._logging.debug(message)
         self.__log_to_console(level='DEBUG', message=message)
 
-    def info(self, message: str, timestamp: bool = True, **kwargs) -> None:
+    def info(self, message: Union[str, Callable[[], str]], *args,
+             timestamp: bool = True, **kwargs) -> None:
         """Info.
 
         This method logs at Info level.
 
         Parameters
         ----------
-        message : str
+        message : Union[str, Callable]
             Content to be logged.
+        args
+            Arguments of the format string.
         timestamp : bool
             True -> add timestamp to message.
 
@@ -113,41 +207,54 @@ class CustomLogger:
         -------
         None
         """
+        if not self.is_enabled('INFO'):
+            return
+        message = self._render(message, args)
         self._logging.info(message, **kwargs)
         self.__log_to_console(level='INFO', message=message,
                               timestamp=timestamp)
 
-    def warn(self, message: str) -> None:
+    def warn(self, message: Union[str, Callable[[], str]], *args) -> None:
         """Warn.
 
         This method logs at Warn level.
 
         Parameters
         ----------
-        message : str
+        message : Union[str, Callable]
             Content to be logged.
+        args
+            Arguments of the format string.
 
         Returns
         -------
         None
         """
+        if not self.is_enabled('WARN'):
+            return
+        message = self._render(message, args)
         self._logging.warn(message)
         self.__log_to_console(level='WARN', message=message)
 
-    def error(self, message: str) -> None:
+    def error(self, message: Union[str, Callable[[], str]], *args) -> None:
         """Error.
 
         This method logs at Error level.
 
         Parameters
         ----------
-        message : str
+        message : Union[str, Callable]
             Content tobe logged.
+        args
+            Arguments of the format string.
 
         Returns
         -------
         None
         """
+        if not self.is_enabled('ERROR'):
+            return
+        message = self._render(message, args)
         self._logging.error(message)
         self.__log_to_console(level='ERROR', message=message)
 
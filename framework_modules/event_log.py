@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module writes a structured JSONL event log and a per-test index next to
+the execution.log of every module.
+
+Every process writes its own files in {module log dir}/events:
+    events-{pid}.jsonl : one JSON event per line
+        {"timestamp": , "level": , "module": , "test": , "keyword": ,
+         "message": }
+    events-{pid}.idx : one JSON entry per finished test
+        {"test": <long name>, "name": , "status": , "file": , "offset": ,
+         "length": }
+
+Once the module is executed, the indexes of the processes are merged into
+one index of the run, keyed by the lower-case long name of the test:
+    test-index.json
+        {"tests": {<long name>: [entries]}, "names": {<name>: [long names]}}
+
+The events of a test are contiguous in the file of its process, so the log
+of one test is read with a dict lookup per run and a single seek.
+
+    Functions in this module:
+
+        +   emit_event(test_module: str, level: str, message: str) -> None
+                Write an event of the current test and keyword.
+
+        +   merge_test_index(execution_log_dir: str) -> str
+                Merge the indexes of the processes into the run index.
+
+        +   extract_test_log(test_name: str, events_dir: str = None) -> None
+                Print the events of a test by using the indexes.
+"""
+
+from glob import glob
+from json import dumps, loads, load, dump
+from os import getpid, path, remove, replace
+from time import time, localtime, strftime
+
+from .internal_path import INTERNAL_PATH
+from .log_sink import get_log_sink
+
+
+TEST_INDEX_FILE = 'test-index.json'
+
+# Current test and keyword stack of this process, set by EventLogListener.
+_CURRENT = {'test': None, 'keywords': []}
+_EVENT_LOGS = {}
+
+
+class EventLog:
+    """Event log.
+
+    JSONL writer of one process for one module log directory, it keeps the
+    byte position of the file to index the events of every test.
+
+    Attributes
+    ----------
+    events_file : str
+        Path to the JSONL file.
+    index_file : str
+        Path to the index file.
+    position : int
+        Size in bytes of the JSONL file including the buffered events.
+    """
+
+    def __init__(self, execution_log_dir: str):
+        """Constructor."""
+        events_dir = f"{execution_log_dir}/events"
+        self.events_file = f"{events_dir}/events-{getpid()}.jsonl"
+        self.index_file = f"{events_dir}/events-{getpid()}.idx"
+        self.__events = get_log_sink(self.events_file)
+        self.__index = get_log_sink(self.index_file)
+        self.position = path.getsize(self.events_file)
+        self.__test_offset = None
+
+    def write_event(self, event: dict) -> None:
+        self.position += self.__events.write(
+            dumps(event, ensure_ascii=False) + '\n'
+        )
+
+    def start_test(self) -> None:
+        self.__test_offset = self.position
+
+    def end_test(self, long_name: str, name: str, status: str) -> None:
+        if self.__test_offset is None:
+            return
+        self.__index.write(dumps({
+            'test': long_name, 'name': name, 'status': status,
+            'file': path.basename(self.events_file),
+            'offset': self.__test_offset,
+            'length': self.position - self.__test_offset
+        }, ensure_ascii=False) + '\n')
+        self.__test_offset = None
+
+
+def get_event_log(execution_log_dir: str) -> EventLog:
+    """Get the event log of the current process.
+
+    Parameters
+    ----------
+    execution_log_dir : str
+        Log directory of the module in current execution.
+
+    Returns
+    -------
+    EventLog
+    """
+    key_ = (getpid(), execution_log_dir)
+    if key_ not in _EVENT_LOGS:
+        _EVENT_LOGS[key_] = EventLog(execution_log_dir)
+    return _EVENT_LOGS[key_]
+
+
+def emit_event(test_module: str, level: str, message: str) -> None:
+    """Emit event.
+
+    Write an event with the current test and keyword.
+
+    Parameters
+    ----------
+    test_module : str
+        Test module: api, web, mobile
+    level : str
+        Level of log.
+    message : str
+        Content to be logged.
+
+    Returns
+    -------
+    None
+    """
+    execution_log_dir = \
+        INTERNAL_PATH.current_execution_log_dir.get(test_module)
+    if not execution_log_dir:
+        return
+    get_event_log(execution_log_dir).write_event({
+        'timestamp': time(), 'level': level, 'module': test_module,
+        'test': _CURRENT.get('test'),
+        'keyword': _CURRENT['keywords'][-1] if _CURRENT['keywords'] else None,
+        'message': message
+    })
+
+
+class EventLogListener:
+    """Event log listener.
+
+    Robot listener that tracks the current test and keyword for the events,
+    and indexes the events of every test when it ends.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, test_module: str):
+        """Constructor."""
+        self.test_module = test_module
+
+    def __event_log(self) -> EventLog:
+        return get_event_log(
+            INTERNAL_PATH.current_execution_log_dir.get(self.test_module)
+        )
+
+    def start_test(self, name: str, attributes: dict) -> None:
+        _CURRENT['test'] = attributes.get('longname')
+        _CURRENT['keywords'] = []
+        self.__event_log().start_test()
+
+    def end_test(self, name: str, attributes: dict) -> None:
+        self.__event_log().end_test(attributes.get('longname'), name,
+                                    attributes.get('status'))
+        _CURRENT['test'] = None
+
+    def start_keyword(self, name: str, attributes: dict) -> None:
+        _CURRENT['keywords'].append(name)
+
+    def end_keyword(self, name: str, attributes: dict) -> None:
+        if _CURRENT['keywords']:
+            _CURRENT['keywords'].pop()
+
+
+def merge_test_index(execution_log_dir: str) -> str:
+    """Merge test index.
+
+    Merge the indexes of the processes into the index of the run, the
+    indexes of the processes are removed.
+
+    Parameters
+    ----------
+    execution_log_dir : str
+        Log directory of the module in current execution.
+
+    Returns
+    -------
+    str
+        Path to the index of the run, None if no test is indexed.
+    """
+    events_dir = f"{execution_log_dir}/events"
+    index_files = glob(f"{events_dir}/events-*.idx")
+    if not index_files:
+        return None
+    test_index = {'tests': {}, 'names': {}}
+    for index_file in index_files:
+        with open(index_file, encoding='utf-8') as index:
+            for line in index:
+                entry = loads(line)
+                long_name = entry.get('test', '').lower()
+                test_index['tests'].setdefault(long_name, []).append(entry)
+                long_names = test_index['names'].setdefault(
+                    entry.get('name', '').lower(), [])
+                if long_name not in long_names:
+                    long_names.append(long_name)
+    test_index_file = f"{events_dir}/{TEST_INDEX_FILE}"
+    with open(f"{test_index_file}.{getpid()}.tmp", 'w',
+              encoding='utf-8') as index:
+        dump(test_index, index, ensure_ascii=False)
+    replace(f"{test_index_file}.{getpid()}.tmp", test_index_file)
+    for index_file in index_files:
+        remove(index_file)
+    return test_index_file
+
+
+def _scan_process_indexes(test_name: str, events_dir: str) -> list:
+    """Scan the indexes of the processes of a run that is not merged,
+    such as an interrupted run."""
+    entries = []
+    for index_file in sorted(glob(f"{events_dir}/events-*.idx")):
+        with open(index_file, encoding='utf-8') as index:
+            for line in index:
+                entry = loads(line)
+                if test_name in (entry.get('test', '').lower(),
+                                 entry.get('name', '').lower()):
+                    entries.append(entry)
+    return entries
+
+
+def _find_test_entries(test_name: str, events_dir: str) -> list:
+    """Find index entries of a test.
+
+    Parameters
+    ----------
+    test_name : str
+        Name or long name of the test, case-insensitive.
+    events_dir : str
+        Directory to search the runs recursively.
+
+    Returns
+    -------
+    list
+        Index entries with the absolute path of their JSONL file.
+    """
+    test_name = test_name.lower()
+    run_events_dirs = {
+        path.dirname(file_) for file_
+        in glob(f"{events_dir}/**/events/{TEST_INDEX_FILE}", recursive=True)
+        + glob(f"{events_dir}/**/events/events-*.idx", recursive=True)
+    }
+    entries = []
+    for run_events_dir in sorted(run_events_dirs):
+        test_index_file = f"{run_events_dir}/{TEST_INDEX_FILE}"
+        if not path.exists(test_index_file):
+            run_entries = _scan_process_indexes(test_name, run_events_dir)
+        else:
+            with open(test_index_file, encoding='utf-8') as index:
+                test_index = load(index)
+            long_names = [test_name] if test_name in test_index.get('tests') \
+                else test_index.get('names').get(test_name, [])
+            run_entries = [entry_ for long_name_ in long_names
+                           for entry_ in test_index.get('tests').get(
+                               long_name_, [])]
+        for entry_ in run_entries:
+            entry_['file'] = f"{run_events_dir}/{entry_.get('file')}"
+        entries += run_entries
+    return entries
+
+
+def extract_test_log(test_name: str, events_dir: str = None) -> None:
+    """Extract test log.
+
+    Print the events of a test by seeking to the ranges in the indexes,
+    instead of scanning the whole logs.
+
+    Parameters
+    ----------
+    test_name : str
+        Name or long name of the test.
+    events_dir : str
+        Directory of a run or a module run, default is the logs directory.
+
+    Returns
+    -------
+    None
+    """
+    entries = _find_test_entries(test_name,
+                                 events_dir or INTERNAL_PATH.log_dir_path)
+    if not entries:
+        print(f"No events of the test {test_name} are found.")
+        return
+    for entry in entries:
+        print(f"========== {entry.get('test')} - {entry.get('status')} "
+              f"({entry.get('file')}) ==========")
+        with open(entry.get('file'), 'rb') as events:
+            events.seek(entry.get('offset'))
+            lines = events.read(entry.get('length')).decode('utf-8')
+        for line in lines.splitlines():
+            event = loads(line)
+            timestamp = strftime("%Y-%m-%d %H-%M-%S",
+                                 localtime(event.get('timestamp')))
+            keyword = f"[{event.get('keyword')}] " \
+                if event.get('keyword') else ''
+            print(f"{timestamp} - {event.get('level')} - {keyword}"
+                  f"{event.get('message')}")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module collects the files of several directories into one directory
+without copying their content when possible.
+
+A file is hardlinked when the source and the destination are on the same
+filesystem, cloned by reflink when the filesystem does not allow the
+hardlink, and copied by a pool of threads otherwise.
+
+    Functions in this module:
+
+        +   collect_files(source_dirs: list, destination: str,
+                          max_workers: int = None) -> int
+                Collect the files of the directories into the destination.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from os import scandir, stat, link, remove, makedirs, name
+from shutil import copyfile
+
+if name == "posix":
+    import fcntl
+
+
+# ioctl request of Linux that clones a file by reflink.
+FICLONE = 0x40049409
+
+
+def _remove_existing(destination: str) -> None:
+    """Remove a file of the destination that has the same name.
+
+    A hardlinked destination shares its content with the source, it must be
+    unlinked instead of being written through.
+    """
+    try:
+        remove(destination)
+    except FileNotFoundError:
+        pass
+
+
+def _hardlink(source: str, destination: str) -> bool:
+    """Hardlink a file.
+
+    Returns
+    -------
+    bool
+        False if the filesystem refuses the hardlink.
+    """
+    try:
+        link(source, destination)
+    except FileExistsError:
+        _remove_existing(destination)
+        return _hardlink(source, destination)
+    except OSError:
+        return False
+    return True
+
+
+def _reflink(source: str, destination: str) -> bool:
+    """Clone a file by reflink, the clone shares the blocks of the source
+    until one of them is modified.
+
+    Returns
+    -------
+    bool
+        False if the platform or the filesystem does not support reflink.
+    """
+    if name != "posix" or not hasattr(fcntl, 'ioctl'):
+        return False
+    try:
+        with open(source, 'rb') as source_file, \
+                open(destination, 'wb') as destination_file:
+            fcntl.ioctl(destination_file.fileno(), FICLONE,
+                        source_file.fileno())
+    except OSError:
+        _remove_existing(destination)
+        return False
+    return True
+
+
+def _clone_or_copy(source: str, destination: str, same_filesystem: bool) \
+        -> None:
+    _remove_existing(destination)
+    if same_filesystem and _reflink(source, destination):
+        return
+    copyfile(source, destination)
+
+
+def collect_files(source_dirs: list, destination: str,
+                  max_workers: int = None) -> int:
+    """Collect files.
+
+    Every source directory is listed once, the files keep their names in the
+    destination and a later source directory wins on the same name.
+
+    Parameters
+    ----------
+    source_dirs : list
+        Directories whose files are collected, sub-directories are skipped.
+    destination : str
+        Directory to collect the files to.
+    max_workers : int
+        The amount of threads that copy the files that cannot be linked.
+
+    Returns
+    -------
+    int
+        The amount of collected files.
+    """
+    makedirs(destination, exist_ok=True)
+    destination_device = stat(destination).st_dev
+    files = {}
+    for source_dir in source_dirs:
+        same_filesystem = stat(source_dir).st_dev == destination_device
+        with scandir(source_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    files[entry.name] = (entry.path, same_filesystem)
+
+    pending_copies = []
+    for file_name, (source, same_filesystem) in files.items():
+        target = f"{destination}/{file_name}"
+        if not same_filesystem or not _hardlink(source, target):
+            pending_copies.append((source, target, same_filesystem))
+
+    if pending_copies:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in executor.map(lambda args: _clone_or_copy(*args),
+                                  pending_copies):
+                pass
+    return len(files)
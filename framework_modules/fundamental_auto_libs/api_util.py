@@ -57,20 +57,21 @@ def send_request_and_receive_response(method: str, uri: str, **kwargs) -> dict:
     headers = kwargs.pop('headers', {'Accept': '*/*'})
     body = kwargs.pop('body', {})
 
-    beauty_headers = make_beauty_json(headers)
-    beauty_body = make_beauty_json(body)
-    LOGGER.debug("Request Headers: \n" + beauty_headers)
-    LOGGER.debug("Request data: \n" + beauty_body)
+    # The JSON is only pretty-printed when the debug level is emitted
+    LOGGER.debug(lambda: "Request Headers: \n"
+                 + str(make_beauty_json(headers)))
+    LOGGER.debug(lambda: "Request data: \n" + str(make_beauty_json(body)))
 
     response = request(method, uri, headers=headers,
                        data=body, **kwargs)
 
-    print('status: ', response.headers, response.content)
     response_message = response.json()
-    beauty_response = make_beauty_json(response_message)
     status_code = response.status_code
 
-    LOGGER.debug("Got response message: \n" + beauty_response)
-    LOGGER.info("Status code: " + str(status_code))
+    LOGGER.debug(lambda: "Got response headers: \n"
+                 + str(make_beauty_json(dict(response.headers))))
+    LOGGER.debug(lambda: "Got response message: \n"
+                 + str(make_beauty_json(response_message)))
+    LOGGER.info("Status code: %s", status_code)
 
     return {'message': response_message, 'status_code': status_code}
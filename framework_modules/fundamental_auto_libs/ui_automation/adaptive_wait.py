@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the adaptive wait of the UI drivers.
+
+The condition is polled fast at first, then the interval backs off
+exponentially up to a maximum: a condition that becomes true in 50 ms costs
+about 50 ms, and a long wait does not flood the driver with requests. Every
+expected condition has its own poll policy.
+"""
+
+from collections import namedtuple
+from time import monotonic, sleep
+from typing import Callable
+
+from selenium.common.exceptions import NoSuchElementException, \
+    TimeoutException
+
+
+# Intervals in seconds: initial, multiplied by factor after every poll, up to
+# maximum.
+PollPolicy = namedtuple('PollPolicy', ['initial', 'factor', 'maximum'])
+
+DEFAULT_POLL_POLICY = PollPolicy(initial=0.05, factor=1.5, maximum=0.5)
+
+POLL_POLICIES = {
+    'presence_of_element_located': DEFAULT_POLL_POLICY,
+    'visibility_of_element_located': DEFAULT_POLL_POLICY,
+    'element_to_be_clickable': DEFAULT_POLL_POLICY,
+    'element_located_to_be_selected': DEFAULT_POLL_POLICY,
+    # Lists and disappearing elements (spinners, dialogs) take longer.
+    'presence_of_all_elements_located':
+        PollPolicy(initial=0.1, factor=1.5, maximum=0.5),
+    'invisibility_of_element_located':
+        PollPolicy(initial=0.1, factor=2, maximum=1.0),
+}
+
+
+class AdaptiveWait:
+    """Adaptive wait.
+
+    Attributes
+    ----------
+    driver : WebDriver
+    timeout : float
+        Maximum time in seconds to wait.
+    policy : PollPolicy
+        Poll intervals of the wait.
+    """
+
+    def __init__(self, driver, timeout: float,
+                 policy: PollPolicy = DEFAULT_POLL_POLICY,
+                 ignored_exceptions: tuple = (NoSuchElementException,)):
+        """Constructor."""
+        self.driver = driver
+        self.timeout = timeout
+        self.policy = policy
+        self.__ignored_exceptions = ignored_exceptions
+
+    def __poll(self, method: Callable, inverse: bool):
+        deadline = monotonic() + self.timeout
+        interval = self.policy.initial
+        while True:
+            try:
+                value = method(self.driver)
+                if bool(value) != inverse:
+                    return value if not inverse else True
+            except self.__ignored_exceptions:
+                if inverse:
+                    return True
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                raise TimeoutException()
+            sleep(min(interval, remaining))
+            interval = min(interval * self.policy.factor,
+                           self.policy.maximum)
+
+    def until(self, method: Callable):
+        """Wait until the method returns a truthy value, and return it.
+
+        Raises
+        ------
+        TimeoutException
+        """
+        return self.__poll(method, inverse=False)
+
+    def until_not(self, method: Callable) -> bool:
+        """Wait until the method returns a falsy value.
+
+        Raises
+        ------
+        TimeoutException
+        """
+        return self.__poll(method, inverse=True)
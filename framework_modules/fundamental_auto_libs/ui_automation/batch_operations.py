@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module runs operations on many elements in one script round-trip.
+
+Each operation is a locator and an action: fill the element with a text, get
+its text (the value of a form field) or check its visibility. The script
+waits in the browser until every element is found (and visible, for the
+visibility checks) or the timeout is over, then runs the actions and returns
+one result per operation:
+    {"found": bool, "value": <text, visibility or null>, "error": str}
+
+Filling sets the value of inputs, text areas and selects and dispatches the
+input and change events, a content editable element gets the text through
+insertText. No key event is sent, the fields that react to key strokes
+(autocomplete, Enter to submit) and the forms whose framework tracks the
+typing, such as the Gmail compose form, still need send_keys.
+
+    Functions in this module:
+
+        +   ensure_script_timeout(driver, timeout: float) -> None
+                Raise the script timeout of the session when it is too low.
+
+        +   run_batch(driver, operations: list, timeout: float) -> list
+                Run the operations in one script round-trip.
+
+        +   wait_in_browser(driver, strategy: str, value: str,
+                            condition: str, inverse: bool,
+                            timeout: float) -> bool
+                Wait for an expected condition in one script round-trip.
+"""
+
+
+# Locator strategies that the script resolves in the browser.
+SUPPORTED_STRATEGIES = ('xpath', 'id', 'name', 'css_selector', 'class_name',
+                        'tag_name', 'partial_text')
+
+ELEMENT_FUNCTIONS = """
+function find(strategy, value) {
+    switch (strategy) {
+    case 'xpath':
+        return document.evaluate(value, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    case 'id':
+        return document.getElementById(value);
+    case 'name':
+        return document.getElementsByName(value)[0] || null;
+    case 'css_selector':
+        return document.querySelector(value);
+    case 'class_name':
+        return document.getElementsByClassName(value)[0] || null;
+    case 'tag_name':
+        return document.getElementsByTagName(value)[0] || null;
+    case 'partial_text':
+        return Array.prototype.find.call(
+            document.getElementsByTagName('a'),
+            function (link) { return link.textContent.indexOf(value) >= 0; }
+        ) || null;
+    }
+    return null;
+}
+
+function isVisible(element) {
+    if (!element.isConnected || element.getClientRects().length === 0) {
+        return false;
+    }
+    if (element.checkVisibility) {
+        return element.checkVisibility(
+            {checkOpacity: true, checkVisibilityCSS: true});
+    }
+    var style = getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.opacity !== '0';
+}
+"""
+
+BATCH_SCRIPT = ELEMENT_FUNCTIONS + """
+var operations = arguments[0];
+var timeout = arguments[1];
+var callback = arguments[arguments.length - 1];
+var deadline = Date.now() + timeout;
+
+function fill(element, text) {
+    element.focus();
+    if (element.isContentEditable) {
+        document.execCommand('selectAll', false, null);
+        if (!document.execCommand('insertText', false, text)) {
+            element.textContent = text;
+            element.dispatchEvent(new Event('input', {bubbles: true}));
+        }
+        return;
+    }
+    var prototype = element instanceof HTMLTextAreaElement
+        ? HTMLTextAreaElement.prototype
+        : element instanceof HTMLSelectElement
+            ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    // The native setter keeps the frameworks that track the value in sync.
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(
+        element, text);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+}
+
+function isFormField(element) {
+    return element instanceof HTMLInputElement
+        || element instanceof HTMLTextAreaElement
+        || element instanceof HTMLSelectElement;
+}
+
+function resolve() {
+    var ready = true;
+    var elements = operations.map(function (operation) {
+        var element = null;
+        try {
+            element = find(operation.strategy, operation.value);
+        } catch (error) {
+            // Invalid selector, reported as not found.
+        }
+        if (!element || (operation.action === 'visible'
+                         && !isVisible(element))) {
+            ready = false;
+        }
+        return element;
+    });
+    return ready || Date.now() >= deadline ? elements : null;
+}
+
+function run(elements) {
+    return operations.map(function (operation, index) {
+        var element = elements[index];
+        var result = {found: element !== null, value: null, error: null};
+        if (operation.action === 'visible') {
+            result.value = element !== null && isVisible(element);
+            return result;
+        }
+        if (element === null) {
+            return result;
+        }
+        try {
+            if (operation.action === 'fill') {
+                fill(element, operation.text);
+            } else if (operation.action === 'text') {
+                result.value = isFormField(element)
+                    ? element.value : element.innerText;
+            }
+        } catch (error) {
+            result.error = String(error);
+        }
+        return result;
+    });
+}
+
+(function check() {
+    var elements = resolve();
+    if (elements) {
+        callback(run(elements));
+    } else {
+        setTimeout(check, Math.min(50, Math.max(deadline - Date.now(), 0)));
+    }
+})();
+"""
+
+
+# Expected conditions that the wait script evaluates in the browser.
+WAIT_CONDITIONS = ('presence_of_element_located',
+                   'visibility_of_element_located',
+                   'presence_of_all_elements_located',
+                   'invisibility_of_element_located',
+                   'element_to_be_clickable',
+                   'element_located_to_be_selected')
+
+WAIT_SCRIPT = ELEMENT_FUNCTIONS + """
+var strategy = arguments[0];
+var value = arguments[1];
+var condition = arguments[2];
+var inverse = arguments[3];
+var timeout = arguments[4];
+var callback = arguments[arguments.length - 1];
+var deadline = Date.now() + timeout;
+
+function evaluate() {
+    var element = null;
+    try {
+        element = find(strategy, value);
+    } catch (error) {
+        // Invalid selector, evaluated as not found.
+    }
+    switch (condition) {
+    case 'visibility_of_element_located':
+        return element !== null && isVisible(element);
+    case 'invisibility_of_element_located':
+        return element === null || !isVisible(element);
+    case 'element_to_be_clickable':
+        return element !== null && isVisible(element) && !element.disabled;
+    case 'element_located_to_be_selected':
+        return element !== null
+            && Boolean(element.selected || element.checked);
+    }
+    return element !== null;
+}
+
+(function check() {
+    if (evaluate() !== inverse) {
+        callback(true);
+    } else if (Date.now() >= deadline) {
+        callback(false);
+    } else {
+        setTimeout(check, 25);
+    }
+})();
+"""
+
+
+def ensure_script_timeout(driver, timeout: float) -> None:
+    """Ensure script timeout.
+
+    Raise the script timeout of the session when it is lower than the
+    timeout, thus a script call costs no extra round-trip to set it.
+
+    Parameters
+    ----------
+    driver : WebDriver
+    timeout : float
+        Time in seconds that the script may run.
+
+    Returns
+    -------
+    None
+    """
+    if getattr(driver, '_script_timeout', 0) < timeout:
+        driver.set_script_timeout(timeout)
+        driver._script_timeout = timeout
+
+
+def run_batch(driver, operations: list, timeout: float) -> list:
+    """Run batch.
+
+    Parameters
+    ----------
+    driver : WebDriver
+    operations : list
+        Dicts of strategy, value, action ('fill', 'text' or 'visible') and
+        text to fill.
+    timeout : float
+        Maximum time in seconds to wait for the elements.
+
+    Returns
+    -------
+    list
+        The result of every operation.
+    """
+    ensure_script_timeout(driver, timeout + 5)
+    return driver.execute_async_script(BATCH_SCRIPT, operations,
+                                       timeout * 1000)
+
+
+def wait_in_browser(driver, strategy: str, value: str, condition: str,
+                    inverse: bool, timeout: float) -> bool:
+    """Wait in browser.
+
+    Evaluate the expected condition in the browser until it is met, thus the
+    wait is one round-trip instead of a poll over HTTP.
+
+    Parameters
+    ----------
+    driver : WebDriver
+    strategy : str
+        Strategy of the locator.
+    value : str
+        Value of the locator.
+    condition : str
+        One of WAIT_CONDITIONS.
+    inverse : bool
+        True to wait until the condition is not met.
+    timeout : float
+        Maximum time in seconds to wait.
+
+    Returns
+    -------
+    bool
+        False if the timeout is over.
+    """
+    ensure_script_timeout(driver, timeout + 5)
+    return bool(driver.execute_async_script(
+        WAIT_SCRIPT, strategy, value, condition, inverse, timeout * 1000
+    ))
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module keeps a pool of warm browser sessions in every process.
+
+The sessions are launched one by one in a background thread, before the tests
+need them. A test acquires a session and releases it when it is done: the
+session is reset (tabs, cookies, storage) and goes back to the pool, or it is
+quit and replaced when it crashed or reached the max amount of uses.
+
+    Functions in this module:
+
+        +   get_browser_pool(browser: str, launcher: Callable, size: int,
+                             max_uses: int = None) -> BrowserPool
+                Get the browser pool of the current process.
+"""
+
+from queue import Queue
+from threading import Thread, Lock
+from typing import Callable
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from framework_modules.command_latency import pool_commands
+from framework_modules.log_sink import register_exit_handler
+
+
+# Maximum time in seconds to wait for a session to be launched.
+ACQUIRE_TIMEOUT = 120
+
+
+def get_origin(url: str) -> str:
+    """Get the origin (scheme://host:port) of a URL, None if it has none."""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class PooledBrowser:
+    """Pooled browser.
+
+    Attributes
+    ----------
+    driver : WebDriver
+        The browser session.
+    uses : int
+        The amount of tests that used the session.
+    origins : set
+        Origins visited by the current test, their storage is cleared on
+        release.
+    """
+
+    def __init__(self, driver):
+        """Constructor."""
+        self.driver = driver
+        self.uses = 0
+        self.origins = set()
+
+    def visit(self, url: str) -> None:
+        origin = get_origin(url)
+        if origin:
+            self.origins.add(origin)
+
+    @property
+    def is_alive(self) -> bool:
+        try:
+            return bool(self.driver.window_handles)
+        except WebDriverException:
+            return False
+
+    def reset(self) -> bool:
+        """Reset the state of the session for the next test.
+
+        Returns
+        -------
+        bool
+            False if the session could not be reset.
+        """
+        driver = self.driver
+        try:
+            handles = driver.window_handles
+            for handle in reversed(handles):
+                driver.switch_to.window(handle)
+                self.visit(driver.current_url)
+                if handle != handles[0]:
+                    driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            for origin in self.origins:
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                    'origin': origin, 'storageTypes': 'all'
+                })
+            driver.get('about:blank')
+        except WebDriverException:
+            return False
+        self.origins.clear()
+        return True
+
+    def quit(self) -> None:
+        try:
+            self.driver.quit()
+        except (WebDriverException, OSError):
+            pass
+
+
+class BrowserPool:
+    """Browser pool.
+
+    Attributes
+    ----------
+    size : int
+        The amount of sessions kept by the pool.
+    max_uses : int
+        The amount of tests after which a session is replaced, None for no
+        limit.
+    """
+
+    def __init__(self, launcher: Callable, size: int, max_uses: int = None):
+        """Constructor.
+
+        Parameters
+        ----------
+        launcher : Callable
+            Function that launches a new browser session.
+        size : int
+            The amount of sessions kept by the pool.
+        max_uses : int
+            The amount of tests after which a session is replaced.
+        """
+        self.size = size
+        self.max_uses = max_uses
+        self.__launcher = launcher
+        self.__idle = Queue()
+        self.__launch_requests = Queue()
+        self.__browsers = set()
+        self.__lock = Lock()
+        self.__closed = False
+        for _ in range(size):
+            self.__launch_requests.put(True)
+        Thread(target=self.__launch_in_background, daemon=True,
+               name='browser-pool-launcher').start()
+
+    def __launch_in_background(self) -> None:
+        """Launch the requested sessions one by one, concurrent launches of
+        undetected chromedriver would patch the same driver binary."""
+        while self.__launch_requests.get():
+            try:
+                browser = PooledBrowser(self.__launcher())
+            except Exception as error:
+                self.__idle.put(error)
+                continue
+            with self.__lock:
+                if self.__closed:
+                    browser.quit()
+                    return
+                self.__browsers.add(browser)
+            self.__idle.put(browser)
+
+    def __discard(self, browser: PooledBrowser) -> None:
+        """Quit a session and request its replacement."""
+        with self.__lock:
+            self.__browsers.discard(browser)
+            closed = self.__closed
+        browser.quit()
+        if not closed:
+            self.__launch_requests.put(True)
+
+    def acquire(self, timeout: float = ACQUIRE_TIMEOUT) -> PooledBrowser:
+        """Acquire a session.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time in seconds to wait for a session.
+
+        Returns
+        -------
+        PooledBrowser
+        """
+        while True:
+            browser = self.__idle.get(timeout=timeout)
+            if isinstance(browser, Exception):
+                self.__launch_requests.put(True)
+                raise browser
+            if browser.is_alive:
+                return browser
+            self.__discard(browser)
+
+    def release(self, browser: PooledBrowser) -> None:
+        """Release a session.
+
+        Parameters
+        ----------
+        browser : PooledBrowser
+            The session acquired by the test.
+
+        Returns
+        -------
+        None
+        """
+        browser.uses += 1
+        with pool_commands():
+            if (self.max_uses and browser.uses >= self.max_uses) \
+                    or not browser.reset():
+                self.__discard(browser)
+                return
+        self.__idle.put(browser)
+
+    def close(self) -> None:
+        """Quit every session of the pool."""
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            browsers = list(self.__browsers)
+            self.__browsers.clear()
+        self.__launch_requests.put(False)
+        for browser in browsers:
+            browser.quit()
+
+
+_POOLS = {}
+
+
+def get_browser_pool(browser: str, launcher: Callable, size: int,
+                     max_uses: int = None) -> BrowserPool:
+    """Get browser pool.
+
+    The pool is created on the first call of the current process, thus every
+    worker process launches its own sessions.
+
+    Parameters
+    ----------
+    browser : str
+        Browser name.
+    launcher : Callable
+        Function that launches a new browser session.
+    size : int
+        The amount of sessions kept by the pool.
+    max_uses : int
+        The amount of tests after which a session is replaced.
+
+    Returns
+    -------
+    BrowserPool
+    """
+    if browser not in _POOLS:
+        pool = BrowserPool(launcher, size, max_uses)
+        register_exit_handler(pool, BrowserPool.close)
+        _POOLS[browser] = pool
+    return _POOLS[browser]
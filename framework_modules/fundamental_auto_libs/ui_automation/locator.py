@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the locator value type and the element cache of the UI
+drivers.
+
+A locator is written as 'type=value', such as 'xpath=//input[@type="email"]'
+or 'id=com.vsee.vsee.beta:id/action_add'. It is parsed once, when the page
+object is constructed, instead of on every action.
+"""
+
+from functools import lru_cache
+from typing import Union
+
+
+class Locator:
+    """Locator.
+
+    Attributes
+    ----------
+    text : str
+        The locator as 'type=value'.
+    strategy : str
+        Type of the locator: xpath, id, name, css_selector, coordinate...
+    value : str
+        Value of the locator.
+    """
+
+    __slots__ = ('text', 'strategy', 'value')
+
+    def __init__(self, text: str):
+        """Constructor."""
+        self.text = text
+        self.strategy, self.value = text.split("=", 1)
+
+    @staticmethod
+    def parse(locator: Union[str, 'Locator']) -> 'Locator':
+        """Get the locator of a 'type=value' string, the parsed locators are
+        cached."""
+        if isinstance(locator, Locator):
+            return locator
+        return _parse_locator(locator)
+
+    def format(self, *args, **kwargs) -> 'Locator':
+        """Get the locator whose value is formatted with the arguments."""
+        return Locator.parse(
+            f"{self.strategy}={self.value.format(*args, **kwargs)}"
+        )
+
+    @property
+    def is_coordinate(self) -> bool:
+        return self.strategy == "coordinate"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Locator) and other.text == self.text
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"Locator({self.text!r})"
+
+
+@lru_cache(maxsize=1024)
+def _parse_locator(text: str) -> Locator:
+    return Locator(text)
+
+
+class ElementCache:
+    """Element cache.
+
+    Keep the resolved element of every locator of the current page. A cached
+    element is resolved again only when it raises StaleElementReference, and
+    the cache is cleared when the driver navigates or changes its session.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self.__elements = {}
+
+    def get(self, locator: Locator):
+        return self.__elements.get(locator)
+
+    def put(self, locator: Locator, element) -> None:
+        self.__elements[locator] = element
+
+    def invalidate(self, locator: Locator) -> None:
+        self.__elements.pop(locator, None)
+
+    def clear(self) -> None:
+        self.__elements.clear()
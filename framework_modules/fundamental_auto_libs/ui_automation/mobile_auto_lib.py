@@ -10,6 +10,7 @@ from appium.webdriver.common.touch_action import TouchAction
 from selenium.webdriver.common.utils import is_url_connectable
 
 from framework_modules import INTERNAL_PATH, ARGUMENTS, APPIUM_PROPERTIES
+from framework_modules.command_latency import instrument_driver
 from test_data.common_variables import APP_DOWNLOAD_URL
 from .ui_based_class import AbstractDriver
 
@@ -55,6 +56,7 @@ class MobileFundamentalAction(AbstractDriver):
         self.desired_cap = {}
 
     def set_driver(self):
+        self.element_cache.clear()
         self.desired_cap.update({
             'platformName': self.platform,
             'platformVersion': self.platform_version,
@@ -77,8 +79,8 @@ class MobileFundamentalAction(AbstractDriver):
         if ARGUMENTS.debug:
             self.desired_cap.pop('fullReset', None)
 
-        self.driver = webdriver.Remote(self.appium_remote_server,
-                                       self.desired_cap)
+        self.driver = instrument_driver(webdriver.Remote(
+            self.appium_remote_server, self.desired_cap))
         self.init_activity = self.driver.current_activity
         self.init_package = self.driver.current_package
         self.window_size = self.driver.get_window_size()
@@ -106,8 +108,16 @@ class MobileFundamentalAction(AbstractDriver):
         self.logger.debug(f'Current context: {self.driver.context}')
         self.logger.debug(f'Available contexts: {self.driver.contexts}')
         self.driver.switch_to.context(context_name)
+        self.context = context_name
+        self.element_cache.clear()
         self.logger.debug(f'Switched to {context_name} context')
 
+    @property
+    def supports_script(self) -> bool:
+        """Whether the current context runs JavaScript, only the webviews
+        do."""
+        return self.context != 'NATIVE_APP'
+
     def click_on_coordinate(self, coordinate) -> bool:
         """
 
@@ -161,6 +171,7 @@ class MobileFundamentalAction(AbstractDriver):
     def go_to_url(self, url: str):
         if not self.driver:
             self.set_driver()
+        self.element_cache.clear()
         self.driver.get(url)
         self.logger.info('', timestamp=False)
         self.logger.info(f'Access {url}')
@@ -169,6 +180,7 @@ class MobileFundamentalAction(AbstractDriver):
         self.logger.info('End session.')
         self.driver.quit()
         self.driver = None
+        self.element_cache.clear()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.driver.terminate_app()
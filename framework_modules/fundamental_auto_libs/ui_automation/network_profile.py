@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module applies the network profiles of the web runs through the Chrome
+DevTools Protocol.
+
+A profile blocks the URL patterns of the resources that the assertions never
+look at (images, fonts, media, analytics), controls the cache and emulates
+slow links. Profiles are combined with a comma: 'lean,slow-3g'.
+
+The blocked requests are counted from the performance log of the session.
+The bytes of a blocked request are never downloaded, thus the savings report
+the bytes that were transferred and the bytes served from the cache.
+
+    Functions in this module:
+
+        +   get_network_profile(names: str) -> dict
+                Get the combined profile of the comma separated names.
+
+        +   needs_performance_log(names: str) -> bool
+                Check if the sessions of the profile record the network.
+
+        +   apply_network_profile(driver, names: str) -> bool
+                Apply the network profile to the browser session.
+
+        +   get_network_savings(driver) -> dict
+                Get the requests and bytes of the session since the last call.
+"""
+
+from json import loads
+
+from selenium.common.exceptions import WebDriverException
+
+
+def _get_url_patterns(extensions: tuple) -> list:
+    """Get the patterns of the URLs with the extensions, with and without a
+    query string."""
+    return [pattern_ for extension_ in extensions
+            for pattern_ in (f"*.{extension_}", f"*.{extension_}?*")]
+
+
+NETWORK_PROFILES = {
+    'none': {},
+    'lean': {
+        'blocked_urls': _get_url_patterns((
+            'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'ico', 'woff',
+            'woff2', 'ttf', 'otf', 'mp4', 'webm', 'mp3', 'ogg'
+        )) + [
+            '*google-analytics.com*', '*googletagmanager.com*',
+            '*doubleclick.net*', '*connect.facebook.net*', '*hotjar.com*'
+        ]
+    },
+    'cold-cache': {'cache_disabled': True},
+    'fast-3g': {
+        'throttling': {'latency': 563, 'downloadThroughput': 180000,
+                       'uploadThroughput': 84375}
+    },
+    'slow-3g': {
+        'throttling': {'latency': 2000, 'downloadThroughput': 50000,
+                       'uploadThroughput': 50000}
+    },
+}
+
+# Chromium records the network events of the session for the savings.
+PERFORMANCE_LOGGING_PREFS = {'enableNetwork': True, 'enablePage': False}
+
+
+def get_network_profile(names: str) -> dict:
+    """Get network profile.
+
+    Parameters
+    ----------
+    names : str
+        Comma separated profile names.
+
+    Returns
+    -------
+    dict
+        blocked_urls, cache_disabled and throttling of the profiles.
+
+    Raises
+    ------
+    Exception
+        A profile name is unknown.
+    """
+    profile = {'blocked_urls': [], 'cache_disabled': False,
+               'throttling': None}
+    for name_ in filter(None, (name_.strip().lower()
+                               for name_ in (names or '').split(','))):
+        if name_ not in NETWORK_PROFILES:
+            raise Exception(f"Unknown network profile '{name_}', "
+                            f"available: {', '.join(NETWORK_PROFILES)}")
+        profile_ = NETWORK_PROFILES.get(name_)
+        profile['blocked_urls'] += profile_.get('blocked_urls', [])
+        profile['cache_disabled'] |= profile_.get('cache_disabled', False)
+        profile['throttling'] = profile_.get('throttling') \
+            or profile['throttling']
+    return profile
+
+
+def needs_performance_log(names: str) -> bool:
+    """Needs performance log.
+
+    The savings of a profile are read from the performance log, which is
+    recorded only for the sessions with a profile.
+
+    Parameters
+    ----------
+    names : str
+        Comma separated profile names, None or 'none' for no profile.
+
+    Returns
+    -------
+    bool
+    """
+    return any(name_.strip().lower() not in ('', 'none')
+               for name_ in (names or '').split(','))
+
+
+def apply_network_profile(driver, names: str) -> bool:
+    """Apply network profile.
+
+    The profile of a session is applied again only when it changes, thus a
+    pooled session keeps its profile between the tests of a suite.
+
+    Parameters
+    ----------
+    driver : WebDriver
+    names : str
+        Comma separated profile names, None or 'none' for no profile.
+
+    Returns
+    -------
+    bool
+        False if the browser does not support CDP.
+    """
+    names = names or 'none'
+    if getattr(driver, '_network_profile', 'none') == names:
+        return True
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        return False
+    profile = get_network_profile(names)
+    throttling = profile.get('throttling') or {
+        'latency': 0, 'downloadThroughput': -1, 'uploadThroughput': -1
+    }
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs',
+                               {'urls': profile.get('blocked_urls')})
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {
+            'cacheDisabled': profile.get('cache_disabled')
+        })
+        driver.execute_cdp_cmd('Network.emulateNetworkConditions',
+                               dict(throttling, offline=False))
+    except WebDriverException:
+        return False
+    driver._network_profile = names
+    return True
+
+
+def get_network_savings(driver) -> dict:
+    """Get network savings.
+
+    Read the network events of the performance log, the log is emptied.
+
+    Parameters
+    ----------
+    driver : WebDriver
+
+    Returns
+    -------
+    dict
+        requests, blocked_requests, blocked_by_type, transferred_bytes,
+        cached_requests and cached_bytes. None if the session has no
+        performance log.
+    """
+    try:
+        entries = driver.get_log('performance')
+    except (WebDriverException, AttributeError):
+        return None
+    savings = {'requests': 0, 'blocked_requests': 0, 'blocked_by_type': {},
+               'transferred_bytes': 0, 'cached_requests': 0,
+               'cached_bytes': 0}
+    cached_ids = set()
+    for entry_ in entries:
+        try:
+            message = loads(entry_.get('message')).get('message', {})
+        except (TypeError, ValueError):
+            continue
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            savings['requests'] += 1
+        elif method == 'Network.loadingFailed' \
+                and params.get('blockedReason'):
+            savings['blocked_requests'] += 1
+            resource_type = params.get('type', 'Other')
+            savings['blocked_by_type'][resource_type] = \
+                savings['blocked_by_type'].get(resource_type, 0) + 1
+        elif method == 'Network.loadingFinished':
+            savings['transferred_bytes'] += \
+                int(params.get('encodedDataLength') or 0)
+        elif method == 'Network.requestServedFromCache':
+            cached_ids.add(params.get('requestId'))
+        elif method == 'Network.responseReceived':
+            response = params.get('response', {})
+            if params.get('requestId') not in cached_ids \
+                    and not response.get('fromDiskCache'):
+                continue
+            savings['cached_requests'] += 1
+            headers = {key_.lower(): value_ for key_, value_
+                       in response.get('headers', {}).items()}
+            try:
+                savings['cached_bytes'] += int(headers.get('content-length'))
+            except (TypeError, ValueError):
+                pass
+    return savings
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module collects the performance metrics of a web page.
+
+One async script waits for the load event, then reads the Navigation Timing,
+the paint timings, the Web Vitals (largest contentful paint and layout
+shifts, from the buffered performance entries) and a summary of the
+resources. The times are in milliseconds from the start of the navigation:
+    {
+        "url": , "navigation_type": ,
+        "metrics": {"ttfb": , "dom_content_loaded": , "load": ,
+                    "first_paint": , "first_contentful_paint": ,
+                    "largest_contentful_paint": ,
+                    "cumulative_layout_shift": , "transfer_size": ,
+                    "resource_count": },
+        "slowest_resources": [{"name": , "initiator_type": ,
+                               "duration": , "transfer_size": }]
+    }
+
+    Functions in this module:
+
+        +   collect_page_metrics(driver, timeout: float = 10) -> dict
+                Collect the performance metrics of the current page.
+
+        +   save_page_metrics(metrics_dir: str, test_name: str,
+                              navigations: list) -> str
+                Save the metrics of the navigations of a test.
+
+        +   check_page_budget(metrics: dict, budget: dict) -> list
+                Get the metrics that exceed the budget.
+"""
+
+from json import dump
+from os import makedirs
+from re import sub
+
+from selenium.common.exceptions import WebDriverException
+
+from .batch_operations import ensure_script_timeout
+
+
+METRICS_SCRIPT = """
+var timeout = arguments[0];
+var callback = arguments[arguments.length - 1];
+var deadline = Date.now() + timeout;
+
+function getBufferedEntries(type) {
+    try {
+        var observer = new PerformanceObserver(function () {});
+        observer.observe({type: type, buffered: true});
+        var entries = observer.takeRecords();
+        observer.disconnect();
+        return entries;
+    } catch (error) {
+        // The browser does not support this entry type.
+        return [];
+    }
+}
+
+function round(value) {
+    return value === null ? null : Math.round(value * 10) / 10;
+}
+
+function collect() {
+    var navigation = performance.getEntriesByType('navigation')[0] || {};
+    var paints = {};
+    performance.getEntriesByType('paint').forEach(function (entry) {
+        paints[entry.name] = entry.startTime;
+    });
+    var largestPaints = getBufferedEntries('largest-contentful-paint');
+    var layoutShift = 0;
+    getBufferedEntries('layout-shift').forEach(function (entry) {
+        if (!entry.hadRecentInput) {
+            layoutShift += entry.value;
+        }
+    });
+    var resources = performance.getEntriesByType('resource');
+    var transferSize = navigation.transferSize || 0;
+    resources.forEach(function (entry) {
+        transferSize += entry.transferSize || 0;
+    });
+    return {
+        url: location.href,
+        navigation_type: navigation.type || null,
+        metrics: {
+            ttfb: round(navigation.responseStart || null),
+            dom_content_loaded:
+                round(navigation.domContentLoadedEventEnd || null),
+            load: round(navigation.loadEventEnd || null),
+            first_paint: round(paints['first-paint'] || null),
+            first_contentful_paint:
+                round(paints['first-contentful-paint'] || null),
+            largest_contentful_paint: largestPaints.length
+                ? round(largestPaints[largestPaints.length - 1].startTime)
+                : null,
+            cumulative_layout_shift: Math.round(layoutShift * 1000) / 1000,
+            transfer_size: transferSize,
+            resource_count: resources.length
+        },
+        slowest_resources: resources.slice().sort(function (a, b) {
+            return b.duration - a.duration;
+        }).slice(0, 5).map(function (entry) {
+            return {name: entry.name, initiator_type: entry.initiatorType,
+                    duration: round(entry.duration),
+                    transfer_size: entry.transferSize || 0};
+        })
+    };
+}
+
+(function check() {
+    var navigation = performance.getEntriesByType('navigation')[0];
+    if ((navigation && navigation.loadEventEnd > 0)
+            || Date.now() >= deadline) {
+        callback(collect());
+    } else {
+        setTimeout(check, 50);
+    }
+})();
+"""
+
+# Metrics that are not times in milliseconds.
+UNITLESS_METRICS = ('cumulative_layout_shift', 'transfer_size',
+                    'resource_count')
+
+
+def collect_page_metrics(driver, timeout: float = 10) -> dict:
+    """Collect page metrics.
+
+    Parameters
+    ----------
+    driver : WebDriver
+    timeout : float
+        Maximum time in seconds to wait for the load event.
+
+    Returns
+    -------
+    dict
+        The metrics of the current page, None if they can not be collected.
+    """
+    ensure_script_timeout(driver, timeout + 5)
+    try:
+        return driver.execute_async_script(METRICS_SCRIPT, timeout * 1000)
+    except WebDriverException:
+        return None
+
+
+def save_page_metrics(metrics_dir: str, test_name: str,
+                      navigations: list) -> str:
+    """Save page metrics.
+
+    Parameters
+    ----------
+    metrics_dir : str
+        Directory of the metrics files.
+    test_name : str
+    navigations : list
+        Metrics of every navigation of the test.
+
+    Returns
+    -------
+    str
+        Path to the metrics file of the test.
+    """
+    makedirs(metrics_dir, exist_ok=True)
+    file_name = sub(r'[^\w.-]+', '_', test_name)
+    metrics_file = f"{metrics_dir}/{file_name}.json"
+    with open(metrics_file, 'w', encoding='utf-8') as file_:
+        dump({'test': test_name, 'navigations': navigations}, file_,
+             indent=4)
+    return metrics_file
+
+
+def check_page_budget(metrics: dict, budget: dict) -> list:
+    """Check page budget.
+
+    Parameters
+    ----------
+    metrics : dict
+        The metrics of a page.
+    budget : dict
+        Maximum value of the metrics, in milliseconds for the times.
+
+    Returns
+    -------
+    list
+        Messages of the metrics that exceed the budget or are missing.
+
+    Raises
+    ------
+    Exception
+        A metric of the budget is unknown.
+    """
+    violations = []
+    for metric_, maximum_ in budget.items():
+        if metric_ not in metrics.get('metrics', {}):
+            raise Exception(f"Unknown page metric '{metric_}', available: "
+                            f"{', '.join(metrics.get('metrics', {}))}")
+        value = metrics.get('metrics').get(metric_)
+        unit = '' if metric_ in UNITLESS_METRICS else ' ms'
+        if value is None:
+            violations.append(f"{metric_} is not measured")
+        elif value > maximum_:
+            violations.append(f"{metric_} {value}{unit} > {maximum_}{unit}")
+    return violations
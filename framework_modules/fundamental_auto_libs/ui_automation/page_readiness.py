@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module waits for a web page to be ready inside the browser.
+
+A MutationObserver records the time of the latest change of the DOM tree,
+and fetch and XMLHttpRequest are wrapped to track the requests in flight.
+The page is ready when the document is complete, no request is in flight and
+neither the DOM tree nor the network changed for the quiet period. The whole
+wait is one async script round-trip.
+
+Live pages never stop changing attributes and texts (timestamps, animations)
+and keep long-polling channels open, thus only the elements added or
+removed count as DOM changes, and the requests in flight for longer than
+LONG_REQUEST_TIME are ignored.
+
+    Functions in this module:
+
+        +   install_page_readiness(driver) -> None
+                Install the instrumentation in every new document.
+
+        +   wait_for_page_ready(driver, quiet_period: float = 0.5,
+                                timeout: float = 10) -> bool
+                Wait until the DOM is quiet and the network is idle.
+"""
+
+from selenium.common.exceptions import WebDriverException
+
+from .batch_operations import ensure_script_timeout
+
+
+# Time in seconds after which a request in flight is a long-polling channel.
+LONG_REQUEST_TIME = 5
+
+INSTRUMENTATION_SCRIPT = """
+(function () {
+    if (window.__pageReadiness) {
+        return;
+    }
+    var state = {lastActivity: performance.now(), requests: {},
+                 nextRequest: 0};
+    window.__pageReadiness = state;
+    var touch = function () { state.lastActivity = performance.now(); };
+    var isElement = function (node) {
+        return node.nodeType === Node.ELEMENT_NODE;
+    };
+    var isTreeChange = function (mutation) {
+        return Array.prototype.some.call(mutation.addedNodes, isElement)
+            || Array.prototype.some.call(mutation.removedNodes, isElement);
+    };
+    var observe = function () {
+        new MutationObserver(function (mutations) {
+            if (mutations.some(isTreeChange)) {
+                touch();
+            }
+        }).observe(document, {subtree: true, childList: true});
+    };
+    if (document.documentElement) {
+        observe();
+    } else {
+        document.addEventListener('DOMContentLoaded', observe);
+    }
+    var started = function () {
+        var request = state.nextRequest++;
+        state.requests[request] = performance.now();
+        touch();
+        return function () {
+            delete state.requests[request];
+            touch();
+        };
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            var finished = started();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { finished(); return response; },
+                function (error) { finished(); throw error; }
+            );
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        this.addEventListener('loadend', started());
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+WAIT_SCRIPT = INSTRUMENTATION_SCRIPT + """
+var quietPeriod = arguments[0];
+var timeout = arguments[1];
+var longRequestTime = arguments[2];
+var callback = arguments[arguments.length - 1];
+var state = window.__pageReadiness;
+var deadline = performance.now() + timeout;
+
+function isNetworkIdle(now) {
+    return Object.keys(state.requests).every(function (request) {
+        return now - state.requests[request] >= longRequestTime;
+    });
+}
+
+(function check() {
+    var now = performance.now();
+    if (document.readyState === 'complete' && isNetworkIdle(now)
+            && now - state.lastActivity >= quietPeriod) {
+        callback(true);
+    } else if (now >= deadline) {
+        callback(false);
+    } else {
+        setTimeout(check, Math.min(50, Math.max(deadline - now, 0)));
+    }
+})();
+"""
+
+
+def install_page_readiness(driver) -> None:
+    """Install page readiness.
+
+    Evaluate the instrumentation before the scripts of every new document,
+    thus the requests sent while the page loads are counted too. The browsers
+    without CDP get the instrumentation on the first wait of each page.
+
+    Parameters
+    ----------
+    driver : WebDriver
+
+    Returns
+    -------
+    None
+    """
+    if getattr(driver, '_page_readiness_installed', False) \
+            or not hasattr(driver, 'execute_cdp_cmd'):
+        return
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                               {'source': INSTRUMENTATION_SCRIPT})
+    except WebDriverException:
+        return
+    driver._page_readiness_installed = True
+
+
+def wait_for_page_ready(driver, quiet_period: float = 0.5,
+                        timeout: float = 10) -> bool:
+    """Wait for page ready.
+
+    Parameters
+    ----------
+    driver : WebDriver
+    quiet_period : float
+        Time in seconds without DOM change and request in flight.
+    timeout : float
+        Maximum time to wait in seconds.
+
+    Returns
+    -------
+    bool
+        True if the page is ready, False if the timeout is over.
+    """
+    ensure_script_timeout(driver, timeout + 5)
+    try:
+        return bool(driver.execute_async_script(
+            WAIT_SCRIPT, quiet_period * 1000, timeout * 1000,
+            LONG_REQUEST_TIME * 1000
+        ))
+    except WebDriverException:
+        # The page navigated away or the script timed out.
+        return False
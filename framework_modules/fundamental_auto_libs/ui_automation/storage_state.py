@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module saves the storage state of a signed in browser session, thus the
+next sessions skip the UI login.
+
+A storage state is the cookies of the browser and the local storage of the
+origin, it is keyed by account and origin and expires after a TTL. A new
+session is seeded with it before its first navigation: the cookies are set
+through CDP, and the local storage is written by a script that runs before
+the scripts of the next document of the origin.
+
+The states are stored in the workspace, readable by the owner only:
+    .storage_states/{sha256 of account and origin}.json
+
+    Functions in this module:
+
+        +   capture_storage_state(driver) -> dict
+                Get the cookies and the local storage of the session.
+
+        +   restore_storage_state(driver, state: dict) -> None
+                Seed the session with a storage state.
+
+        +   clear_storage_state_script(driver) -> None
+                Remove the local storage seeding script of the session.
+"""
+
+from hashlib import sha256
+from json import load, dump, dumps
+from os import makedirs, remove, replace, getpid, chmod
+from time import time
+
+from selenium.common.exceptions import WebDriverException
+
+from framework_modules import INTERNAL_PATH, ARGUMENTS
+
+
+# Fields of a cookie that Network.setCookies accepts.
+COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly',
+                 'sameSite', 'expires')
+
+SEED_SCRIPT = """
+(function () {
+    if (location.origin !== %s) {
+        return;
+    }
+    var items = %s;
+    Object.keys(items).forEach(function (key) {
+        localStorage.setItem(key, items[key]);
+    });
+})();
+"""
+
+
+class StorageStateCache:
+    """Storage state cache.
+
+    Attributes
+    ----------
+    cache_dir : str
+        Directory of the storage states.
+    ttl : float
+        Time in seconds that a storage state is valid.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float):
+        """Constructor."""
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def __get_state_file(self, account: str, origin: str) -> str:
+        key = sha256(f"{account}\n{origin}".encode()).hexdigest()
+        return f"{self.cache_dir}/{key}.json"
+
+    def load(self, account: str, origin: str) -> dict:
+        """Load the storage state of an account and an origin.
+
+        Parameters
+        ----------
+        account : str
+        origin : str
+
+        Returns
+        -------
+        dict
+            The storage state, None if there is none or it is expired.
+        """
+        if not self.ttl:
+            return None
+        try:
+            with open(self.__get_state_file(account, origin),
+                      encoding='utf-8') as state_file:
+                state = load(state_file)
+        except (OSError, ValueError):
+            return None
+        if time() - state.get('saved_at', 0) > self.ttl:
+            return None
+        return state
+
+    def save(self, account: str, origin: str, state: dict) -> None:
+        """Save the storage state of an account and an origin.
+
+        Parameters
+        ----------
+        account : str
+        origin : str
+        state : dict
+            The cookies and local storage of the session.
+
+        Returns
+        -------
+        None
+        """
+        if not self.ttl:
+            return
+        makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        state_file = self.__get_state_file(account, origin)
+        temp_file = f"{state_file}.{getpid()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as state_file_:
+            chmod(temp_file, 0o600)
+            dump(dict(state, saved_at=time()), state_file_)
+        replace(temp_file, state_file)
+
+    def invalidate(self, account: str, origin: str) -> None:
+        try:
+            remove(self.__get_state_file(account, origin))
+        except OSError:
+            pass
+
+
+STORAGE_STATES = StorageStateCache(INTERNAL_PATH.storage_state_dir,
+                                   ARGUMENTS.storage_state_ttl * 60)
+
+
+def capture_storage_state(driver) -> dict:
+    """Capture storage state.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        The signed in session, on a page of the origin.
+
+    Returns
+    -------
+    dict
+        cookies of every domain, origin and local_storage of the current
+        page.
+    """
+    cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})
+    page_storage = driver.execute_script(
+        "return {origin: location.origin, "
+        "items: Object.assign({}, localStorage)};"
+    )
+    return {'cookies': cookies.get('cookies', []),
+            'origin': page_storage.get('origin'),
+            'local_storage': page_storage.get('items')}
+
+
+def restore_storage_state(driver, state: dict) -> None:
+    """Restore storage state.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        The session, before its navigation to the origin.
+    state : dict
+        The captured storage state.
+
+    Returns
+    -------
+    None
+    """
+    clear_storage_state_script(driver)
+    driver.execute_cdp_cmd('Network.setCookies', {'cookies': [
+        {key_: value_ for key_, value_ in cookie_.items()
+         if key_ in COOKIE_FIELDS
+         and not (key_ == 'expires' and cookie_.get('session'))}
+        for cookie_ in state.get('cookies', [])
+    ]})
+    if state.get('local_storage'):
+        driver._storage_state_script = driver.execute_cdp_cmd(
+            'Page.addScriptToEvaluateOnNewDocument',
+            {'source': SEED_SCRIPT % (dumps(state.get('origin')),
+                                      dumps(state.get('local_storage')))}
+        ).get('identifier')
+
+
+def clear_storage_state_script(driver) -> None:
+    """Remove the local storage seeding script, the documents loaded since
+    the restore have been seeded."""
+    identifier = getattr(driver, '_storage_state_script', None)
+    if not identifier:
+        return
+    driver._storage_state_script = None
+    try:
+        driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument',
+                               {'identifier': identifier})
+    except WebDriverException:
+        pass
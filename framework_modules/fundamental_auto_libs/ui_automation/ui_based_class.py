@@ -9,21 +9,38 @@ testing module.
 
 from abc import ABC
 from datetime import datetime
+from os import path
 
 from json import loads
+from time import monotonic
+from typing import Callable, Union, Iterable
 
 from robot.libraries.BuiltIn import BuiltIn
 from robot.utils import get_link_path
 from selenium.common.exceptions import NoSuchElementException, \
     TimeoutException, InvalidElementStateException, \
     StaleElementReferenceException, ElementNotInteractableException
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.common.keys import Keys
 
-from framework_modules import CustomLogger, INTERNAL_PATH
+from framework_modules import CustomLogger, INTERNAL_PATH, ARGUMENTS
+from framework_modules.wait_statistics import get_wait_statistics
 
 from framework_modules.fundamental_auto_libs import attach_file_to_report
+from .locator import Locator, ElementCache
+from .batch_operations import SUPPORTED_STRATEGIES, WAIT_CONDITIONS, \
+    run_batch, wait_in_browser
+from .adaptive_wait import AdaptiveWait, POLL_POLICIES, DEFAULT_POLL_POLICY
+
+
+EXPECTED_CONDITIONS = {
+    'presence_of_element_located': ec.presence_of_element_located,
+    'visibility_of_element_located': ec.visibility_of_element_located,
+    'presence_of_all_elements_located': ec.presence_of_all_elements_located,
+    'invisibility_of_element_located': ec.invisibility_of_element_located,
+    'element_to_be_clickable': ec.element_to_be_clickable,
+    'element_located_to_be_selected': ec.element_located_to_be_selected,
+}
 
 
 class AbstractDriver(ABC):
@@ -37,8 +54,10 @@ class AbstractDriver(ABC):
         self.test_module = BuiltIn().get_variable_value("${TEST_MODULE}")
         self.logger = CustomLogger(self.test_module)
         self.driver = None
+        self.element_cache = ElementCache()
         self.implicitly_wait = 5
         self.default_explicit_wait = 5
+        self.in_browser_wait = ARGUMENTS.in_browser_wait
         self.context_by = context_by
         self.current_test_name = BuiltIn().get_variable_value("${TEST NAME}")
         self.element_mapping = {
@@ -51,110 +70,163 @@ class AbstractDriver(ABC):
             'tag_name': self.context_by.TAG_NAME
         }
 
-    @staticmethod
-    def __split_element_value(locator: str) -> tuple:
-        """Split element value.
+    def __resolve(self, locator: Locator):
+        """Resolve locator.
+
+        Find the element of the locator, or get it from the element cache.
 
         Parameters
         ----------
-        locator : str
+        locator : Locator
 
         Returns
         -------
-        tuple
-            locator and its type
+        The Webview Element.
         """
-        value = locator.split("=", 1)
-        location_type = value[0]
-        location = value[1]
-        return location, location_type
+        element = self.element_cache.get(locator)
+        if element is not None:
+            return element
+        try:
+            element = self.driver.find_element(
+                self.element_mapping.get(locator.strategy), locator.value)
+        except NoSuchElementException:
+            self.take_screenshot()
+            raise NoSuchElementException
+        self.element_cache.put(locator, element)
+        return element
 
-    def get_element(self, locator: str):
+    def __act_on_element(self, locator: Locator, action: Callable):
+        """Act on element.
+
+        Call the action with the element of the locator. The cached element
+        is resolved again once when it is stale.
+
+        Parameters
+        ----------
+        locator : Locator
+        action : Callable
+            Function that takes the element.
+
+        Returns
+        -------
+        The result of the action.
+        """
+        try:
+            return action(self.__resolve(locator))
+        except StaleElementReferenceException:
+            self.element_cache.invalidate(locator)
+            return action(self.__resolve(locator))
+
+    def get_element(self, locator: Union[str, Locator]):
         """Get element.
 
         This function resolves the webview element identifier.
 
         Parameters
         ----------
-        locator : str
+        locator : Union[str, Locator]
 
         Returns
         -------
         The Webview Element.
         """
-        locator, locator_type = self.__split_element_value(locator)
-        if locator_type == "coordinate":
-            return loads(locator)
-        try:
-            return self.driver.find_element(
-                self.element_mapping.get(locator_type), locator)
-        except NoSuchElementException:
-            self.take_screenshot()
-            raise NoSuchElementException
+        locator = Locator.parse(locator)
+        if locator.is_coordinate:
+            return loads(locator.value)
+        return self.__resolve(locator)
 
-    def get_elements(self, locator: str):
+    def get_elements(self, locator: Union[str, Locator]):
         """Get element.
 
         This function resolves the webview element identifier.
 
         Parameters
         ----------
-        locator : str
+        locator : Union[str, Locator]
 
         Returns
         -------
         The Webview Element.
         """
-        locator, locator_type = self.__split_element_value(locator)
+        locator = Locator.parse(locator)
         try:
             return self.driver.find_elements(
-                self.element_mapping.get(locator_type), locator)
+                self.element_mapping.get(locator.strategy), locator.value)
         except NoSuchElementException:
             self.take_screenshot()
             raise NoSuchElementException
 
-    def wait_explicit(self, condition: str, locator: str,
-                      timeout: int = -1, inverse: bool = False) -> bool:
-        """
+    def wait_explicit(self, condition: str, locator: Union[str, Locator],
+                      timeout: int = -1, inverse: bool = False,
+                      in_browser: bool = None) -> bool:
+        """Wait explicit.
+
+        Poll the expected condition with the adaptive wait, or evaluate it
+        in the browser in one round-trip. The time of every wait is recorded
+        per test and per locator.
 
         Parameters
         ----------
-        condition
-        locator
-        timeout
-        inverse
+        condition : str
+            Name of the expected condition.
+        locator : Union[str, Locator]
+        timeout : int
+            Maximum time in seconds to wait.
+        inverse : bool
+            True to wait until the condition is not met.
+        in_browser : bool
+            True to wait in the browser, default=--in-browser-wait.
 
         Returns
         -------
         bool
+            False if the timeout is over.
         """
         if timeout < 0:
             timeout = self.default_explicit_wait
-        mapping_condition = {
-            'presence_of_element_located': ec.presence_of_element_located,
-            'visibility_of_element_located': ec.visibility_of_element_located,
-            'presence_of_all_elements_located':
-                ec.presence_of_all_elements_located,
-            'invisibility_of_element_located':
-                ec.invisibility_of_element_located,
-            'element_to_be_clickable': ec.element_to_be_clickable,
-            'element_located_to_be_selected':
-                ec.element_located_to_be_selected,
-        }
-        locator, locator_type = self.__split_element_value(locator)
-        wait = WebDriverWait(self.driver, timeout)
-        condition = mapping_condition.get(condition)
+        if in_browser is None:
+            in_browser = self.in_browser_wait
+        locator = Locator.parse(locator)
+        started = monotonic()
+        if in_browser and condition in WAIT_CONDITIONS \
+                and self.__can_batch([locator]):
+            result = wait_in_browser(self.driver, locator.strategy,
+                                     locator.value, condition, inverse,
+                                     timeout)
+        else:
+            result = self.__poll_condition(condition, locator, timeout,
+                                           inverse)
+        self.__record_wait(condition, locator, monotonic() - started, result)
+        return result
+
+    def __poll_condition(self, condition: str, locator: Locator,
+                         timeout: int, inverse: bool) -> bool:
+        wait = AdaptiveWait(self.driver, timeout, POLL_POLICIES.get(
+            condition, DEFAULT_POLL_POLICY))
+        expected_condition = EXPECTED_CONDITIONS.get(condition)((
+            self.element_mapping.get(locator.strategy), locator.value
+        ))
         try:
             if not inverse:
-                wait.until(condition((self.element_mapping.get(locator_type),
-                                     locator)))
+                wait.until(expected_condition)
                 return True
-            wait.until_not(condition((self.element_mapping.get(locator_type),
-                                     locator)))
+            wait.until_not(expected_condition)
             return True
         except TimeoutException:
             return False
 
+    def __record_wait(self, condition: str, locator: Locator,
+                      elapsed: float, result: bool) -> None:
+        output_xml = INTERNAL_PATH.current_output_xml.get(self.test_module)
+        if not output_xml:
+            return
+        get_wait_statistics(path.dirname(output_xml)).record(
+            BuiltIn().get_variable_value("${TEST NAME}"), str(locator),
+            condition, elapsed, result
+        )
+        self.logger.debug(f'Wait {elapsed:.3f}s for {condition} of '
+                          f'{locator}: {result}')
+
     def take_screenshot(self) -> None:
         """Take screenshot.
 
@@ -184,26 +256,169 @@ class AbstractDriver(ABC):
             f'width="1500"></a>',
             html=True)
 
-    def click_on_element(self, locator: str) -> None:
-        if locator.split("=")[0] == "coordinate":
+    def click_on_element(self, locator: Union[str, Locator]) -> None:
+        locator = Locator.parse(locator)
+        if locator.is_coordinate:
             return self.click_on_coordinate(self.get_element(locator))
         try:
-            self.get_element(locator).click()
+            self.__act_on_element(locator, lambda element: element.click())
         except (StaleElementReferenceException,
                 ElementNotInteractableException):
             self.take_screenshot()
         self.logger.debug(f'click to {locator}')
 
-    def send_string_to_element(self, locator: str,
+    def send_string_to_element(self, locator: Union[str, Locator],
                                str_to_be_sent: str) -> None:
+        locator = Locator.parse(locator)
         try:
-            self.get_element(locator).clear()
+            self.__act_on_element(locator, lambda element: element.clear())
         except IndexError:
             self.logger.warn("Can not clear before send new string on mobile")
         except InvalidElementStateException:
-            self.get_element(locator).send_keys(Keys.DELETE)
+            self.send_keys_to_element(locator, Keys.DELETE)
         self.logger.debug(f'Send "{str_to_be_sent} to {locator}')
-        self.get_element(locator).send_keys(str_to_be_sent)
+        self.send_keys_to_element(locator, str_to_be_sent)
+
+    def send_keys_to_element(self, locator: Union[str, Locator],
+                             *keys: str) -> None:
+        self.__act_on_element(Locator.parse(locator),
+                              lambda element: element.send_keys(*keys))
+
+    @property
+    def supports_script(self) -> bool:
+        """Whether the current context runs JavaScript."""
+        return True
+
+    def __can_batch(self, locators: Iterable[Locator]) -> bool:
+        return self.supports_script and all(
+            locator.strategy in SUPPORTED_STRATEGIES for locator in locators)
+
+    def __run_batch(self, locators: list, action: str, timeout: int,
+                    texts: list = None) -> list:
+        """Run the action on every locator in one script round-trip."""
+        if timeout < 0:
+            timeout = self.default_explicit_wait
+        texts = texts or [None] * len(locators)
+        return run_batch(self.driver, [
+            {'strategy': locator.strategy, 'value': locator.value,
+             'action': action, 'text': text}
+            for locator, text in zip(locators, texts)
+        ], timeout)
+
+    def fill_form(self, fields: dict, timeout: int = -1) -> None:
+        """Fill form.
+
+        Fill every field in one script round-trip, the fields are waited for
+        in the browser. The native context fills the fields one by one.
+
+        The values are set by script, without any key event: the fields that
+        react to key strokes, and the forms whose framework only registers
+        typed input (e.g. the Gmail compose form), must be filled with
+        send_string_with_wait_explicit.
+
+        Parameters
+        ----------
+        fields : dict
+            Text to fill of every locator.
+        timeout : int
+            Maximum time in seconds to wait for the fields.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        NoSuchElementException
+            A field is not found.
+        InvalidElementStateException
+            A field can not be filled.
+        """
+        locators = [Locator.parse(locator) for locator in fields]
+        texts = [str(text) for text in fields.values()]
+        if not self.__can_batch(locators):
+            for locator, text in zip(locators, texts):
+                self.send_string_with_wait_explicit(locator, text, timeout)
+            return
+        results = self.__run_batch(locators, 'fill', timeout, texts)
+        missing = [str(locator) for locator, result in zip(locators, results)
+                   if not result.get('found')]
+        if missing:
+            self.take_screenshot()
+            raise NoSuchElementException(
+                f"Fields not found: {', '.join(missing)}")
+        errors = [f"{locator}: {result.get('error')}"
+                  for locator, result in zip(locators, results)
+                  if result.get('error')]
+        if errors:
+            self.take_screenshot()
+            raise InvalidElementStateException(
+                f"Fields can not be filled: {'; '.join(errors)}")
+        self.logger.debug(f"Fill {len(locators)} fields: "
+                          f"{', '.join(map(str, locators))}")
+
+    @staticmethod
+    def __get_text(element) -> str:
+        if element.tag_name in ('input', 'textarea', 'select'):
+            return element.get_attribute('value')
+        return element.text
+
+    def get_texts(self, locators: Iterable[Union[str, Locator]],
+                  timeout: int = -1) -> list:
+        """Get texts.
+
+        Get the text of every element in one script round-trip, the elements
+        are waited for in the browser. The text of an input, text area or
+        select is its value.
+
+        Parameters
+        ----------
+        locators : Iterable[Union[str, Locator]]
+        timeout : int
+            Maximum time in seconds to wait for the elements.
+
+        Returns
+        -------
+        list
+            The text of every element, None for the elements not found.
+        """
+        locators = [Locator.parse(locator) for locator in locators]
+        if not self.__can_batch(locators):
+            return [
+                self.__get_text(self.get_element(locator))
+                if self.wait_explicit(
+                    condition="presence_of_element_located",
+                    locator=locator, timeout=timeout) else None
+                for locator in locators
+            ]
+        return [result.get('value') for result
+                in self.__run_batch(locators, 'text', timeout)]
+
+    def are_visible(self, locators: Iterable[Union[str, Locator]],
+                    timeout: int = 0) -> list:
+        """Are visible.
+
+        Check the visibility of every element in one script round-trip.
+
+        Parameters
+        ----------
+        locators : Iterable[Union[str, Locator]]
+        timeout : int
+            Maximum time in seconds to wait for every element to be visible,
+            0 checks them once.
+
+        Returns
+        -------
+        list
+            Whether every element is visible.
+        """
+        locators = [Locator.parse(locator) for locator in locators]
+        if not self.__can_batch(locators):
+            return [self.wait_explicit(
+                condition="visibility_of_element_located", locator=locator,
+                timeout=timeout) for locator in locators]
+        return [bool(result.get('value')) for result
+                in self.__run_batch(locators, 'visible', timeout)]
 
     def click_on_coordinate(self, coordinate) -> None:
         """
@@ -218,7 +433,8 @@ class AbstractDriver(ABC):
         """
         pass
 
-    def click_on_locator_with_wait_explicit(self, locator: str,
+    def click_on_locator_with_wait_explicit(self,
+                                            locator: Union[str, Locator],
                                             timeout: int = -1):
         """
 
@@ -231,7 +447,7 @@ class AbstractDriver(ABC):
             self.take_screenshot()
         self.click_on_element(locator)
 
-    def send_string_with_wait_explicit(self, locator: str,
+    def send_string_with_wait_explicit(self, locator: Union[str, Locator],
                                        str_to_be_sent: str,
                                        timeout: int = -1):
         """
@@ -6,17 +6,25 @@ This module contains functions and abstract class for the keywords lib in every
 testing module.
 """
 
-from time import sleep
-
+from robot.libraries.BuiltIn import BuiltIn
+from robot.utils import timestr_to_secs
 from selenium.webdriver.common.by import By
 
-from framework_modules import ARGUMENTS
+from framework_modules import ARGUMENTS, INTERNAL_PATH
 from .ui_based_class import AbstractDriver
+from .browser_pool import get_browser_pool, get_origin
+from .page_readiness import install_page_readiness, wait_for_page_ready
+from .network_profile import apply_network_profile, get_network_savings, \
+    needs_performance_log
+from .page_metrics import UNITLESS_METRICS, collect_page_metrics, \
+    save_page_metrics, check_page_budget
+from .storage_state import STORAGE_STATES, capture_storage_state, \
+    restore_storage_state, clear_storage_state_script
 
 from .webdrivers_hanler import get_undetected_brave, get_undetected_chrome
 
 
-def get_browser(name: str):
+def get_browser(name: str, performance_log: bool = False):
     """This function is used for quick selection of browser."""
     name = name.lower()
     switcher = {
@@ -24,7 +32,16 @@ def get_browser(name: str):
         "brave": get_undetected_brave,
     }
     func = switcher.get(name, "chrome")
-    return func()
+    return func(performance_log=performance_log)
+
+
+def launch_browser(name: str, performance_log: bool = False):
+    """This function launches a browser that is ready for the tests."""
+    driver = get_browser(name, performance_log)
+    driver.implicitly_wait(10)
+    driver.maximize_window()
+    install_page_readiness(driver)
+    return driver
 
 
 class WebFundamentalAction(AbstractDriver):
@@ -36,33 +53,258 @@ class WebFundamentalAction(AbstractDriver):
     def __init__(self):
         """Constructor."""
         super().__init__(By)
-        self.browser = ARGUMENTS.browser
+        # Every run of the browser matrix passes its browser.
+        self.browser = BuiltIn().get_variable_value("${BROWSER}") \
+            or ARGUMENTS.browser[0]
+        self.pooled_browser = None
+        self.browser_pool = None
+        self.session_test_name = None
+        self.page_metrics = []
+        self.page_metrics_test_name = None
+        if ARGUMENTS.browser_pool:
+            # The pool launches its sessions in the background as soon as
+            # the library is imported, the first test gets a warm session.
+            self.browser_pool = self.__get_browser_pool(
+                needs_performance_log(self.__get_network_profile()))
 
     def __exit__(self, exception_type, exception_value, exception_traceback):
         self.close_browser()
 
+    def __get_browser_pool(self, performance_log: bool):
+        """Get the pool of the sessions with or without the performance
+        log, they are pooled apart."""
+        pool_name = self.browser
+        if performance_log:
+            pool_name = f'{self.browser}-performance-log'
+        return get_browser_pool(
+            pool_name, lambda: launch_browser(self.browser, performance_log),
+            size=ARGUMENTS.browser_pool, max_uses=ARGUMENTS.browser_max_uses
+        )
+
+    @staticmethod
+    def __get_network_profile() -> str:
+        """Get the network profile of the current suite, its 'Network
+        Profile' metadata overrides the --network-profile flag."""
+        metadata = BuiltIn().get_variable_value("${SUITE METADATA}") or {}
+        for key_, value_ in metadata.items():
+            if key_.lower() == 'network profile':
+                return value_
+        return ARGUMENTS.network_profile
+
+    def __apply_network_profile(self) -> None:
+        network_profile = self.__get_network_profile()
+        if not apply_network_profile(self.driver, network_profile):
+            self.logger.warn(f'Can not apply the network profile '
+                             f'{network_profile} to {self.browser}')
+        elif network_profile:
+            self.logger.info(f'Network profile: {network_profile}')
+
+    def __log_network_savings(self) -> None:
+        """Log the requests blocked and the bytes transferred by the session
+        with a network profile."""
+        network_profile = getattr(self.driver, '_network_profile', 'none')
+        if network_profile == 'none':
+            return
+        savings = get_network_savings(self.driver)
+        if not savings:
+            return
+        blocked_by_type = ', '.join(
+            f'{type_}: {count_}' for type_, count_
+            in sorted(savings.get('blocked_by_type').items()))
+        self.logger.info(
+            f"Network profile {network_profile}: blocked "
+            f"{savings.get('blocked_requests')} of "
+            f"{savings.get('requests')} requests ({blocked_by_type}), "
+            f"transferred {savings.get('transferred_bytes') / 1024:.1f} KB, "
+            f"{savings.get('cached_requests')} requests "
+            f"({savings.get('cached_bytes') / 1024:.1f} KB) "
+            f"served from the cache."
+        )
+
     def initial_webdriver_session(self):
-        self.driver = get_browser(self.browser)
-        self.driver.implicitly_wait(10)
-        self.driver.maximize_window()
+        self.element_cache.clear()
         self.logger.info('', timestamp=False)
-        self.logger.info(f'Open {self.browser.upper()} browser')
+        # Only the sessions with a network profile record the network events
+        # for the savings.
+        performance_log = needs_performance_log(self.__get_network_profile())
+        if ARGUMENTS.browser_pool:
+            self.browser_pool = self.__get_browser_pool(performance_log)
+            self.pooled_browser = self.browser_pool.acquire()
+            self.driver = self.pooled_browser.driver
+            self.session_test_name = \
+                BuiltIn().get_variable_value("${TEST NAME}")
+            self.logger.info(f'Acquire {self.browser.upper()} browser from '
+                             f'the pool')
+        else:
+            self.driver = launch_browser(self.browser, performance_log)
+            self.logger.info(f'Open {self.browser.upper()} browser')
+        self.__apply_network_profile()
+
+    def release_webdriver_session(self):
+        self.__log_network_savings()
+        self.browser_pool.release(self.pooled_browser)
+        self.pooled_browser = None
+        self.driver = None
+        self.element_cache.clear()
+        self.logger.info('Release browser to the pool.')
 
     def close_browser(self):
+        if self.pooled_browser:
+            return self.release_webdriver_session()
+        self.__log_network_savings()
         self.driver.close()
         self.logger.info('Close browser tab.')
 
     def close_session(self):
+        if self.pooled_browser:
+            return self.release_webdriver_session()
+        self.__log_network_savings()
         self.logger.info('Close session.')
         self.driver.quit()
         self.driver = None
+        self.element_cache.clear()
 
-    def go_to_url(self, url: str):
+    def __ensure_webdriver_session(self):
+        # A pooled session belongs to one test, the next test gets a clean
+        # session from the pool.
+        if self.pooled_browser and self.session_test_name != \
+                BuiltIn().get_variable_value("${TEST NAME}"):
+            self.release_webdriver_session()
         if not self.driver:
             self.initial_webdriver_session()
+
+    def go_to_url(self, url: str):
+        self.__ensure_webdriver_session()
+        self.element_cache.clear()
         self.driver.get(url)
+        clear_storage_state_script(self.driver)
+        if self.pooled_browser:
+            self.pooled_browser.visit(url)
         self.logger.info('', timestamp=False)
         self.logger.info(f'Access {url}')
+        if ARGUMENTS.page_metrics:
+            self.collect_page_metrics()
+
+    def collect_page_metrics(self) -> dict:
+        """Collect page metrics.
+
+        Collect the Navigation Timing, paint and Web Vitals metrics of the
+        current page in one script call, and save them with the other
+        navigations of the test next to the output.xml.
+
+        Returns
+        -------
+        dict
+            The metrics of the current page, None if they can not be
+            collected.
+        """
+        metrics = collect_page_metrics(self.driver)
+        if not metrics:
+            self.logger.warn('Can not collect the page metrics.')
+            return None
+        test_name = BuiltIn().get_variable_value("${TEST NAME}")
+        if self.page_metrics_test_name != test_name:
+            self.page_metrics = []
+            self.page_metrics_test_name = test_name
+        self.page_metrics.append(metrics)
+        report_dir = INTERNAL_PATH.current_robot_report_dir.get(
+            self.test_module)
+        if report_dir and test_name:
+            save_page_metrics(f'{report_dir}/page_metrics', test_name,
+                              self.page_metrics)
+        page_metrics = metrics.get('metrics')
+        self.logger.info(
+            f"Page metrics of {metrics.get('url')}: "
+            f"TTFB {page_metrics.get('ttfb')} ms, "
+            f"load {page_metrics.get('load')} ms, "
+            f"FCP {page_metrics.get('first_contentful_paint')} ms, "
+            f"LCP {page_metrics.get('largest_contentful_paint')} ms, "
+            f"CLS {page_metrics.get('cumulative_layout_shift')}, "
+            f"{page_metrics.get('resource_count')} resources"
+        )
+        return metrics
+
+    def assert_page_budget(self, **budget) -> None:
+        """Assert page budget.
+
+        Check the metrics of the last navigation of the test, they are
+        collected from the current page when there are none.
+
+        Parameters
+        ----------
+        budget
+            Maximum of every metric: robot time strings for the times,
+            e.g. load=3s first_contentful_paint=1.5s, numbers for
+            cumulative_layout_shift, transfer_size and resource_count.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        AssertionError
+            A metric exceeds the budget.
+        """
+        metrics = self.page_metrics[-1] if self.page_metrics \
+            and self.page_metrics_test_name == \
+            BuiltIn().get_variable_value("${TEST NAME}") else None
+        metrics = metrics or self.collect_page_metrics()
+        if not metrics:
+            raise AssertionError('The page metrics are not collected.')
+        violations = check_page_budget(metrics, {
+            metric_: float(maximum_) if metric_ in UNITLESS_METRICS
+            else timestr_to_secs(maximum_) * 1000
+            for metric_, maximum_ in budget.items()
+        })
+        if violations:
+            raise AssertionError(
+                f"The page {metrics.get('url')} exceeds the budget: "
+                f"{'; '.join(violations)}")
+        self.logger.info(f"The page {metrics.get('url')} is within the "
+                         f"budget.")
+
+    def restore_storage_state(self, account: str, url: str) -> bool:
+        """Restore storage state.
+
+        Seed the session with the saved storage state of the account, before
+        its navigation to the URL.
+
+        Parameters
+        ----------
+        account : str
+        url : str
+
+        Returns
+        -------
+        bool
+            False if there is no valid storage state.
+        """
+        state = STORAGE_STATES.load(account, get_origin(url))
+        if not state:
+            return False
+        self.__ensure_webdriver_session()
+        restore_storage_state(self.driver, state)
+        self.logger.info(f'Restore the storage state of {account}.')
+        return True
+
+    def save_storage_state(self, account: str, url: str) -> None:
+        """Save the storage state of the signed in account, the session is on
+        a page of the URL origin."""
+        STORAGE_STATES.save(account, get_origin(url),
+                            capture_storage_state(self.driver))
+        self.logger.debug(f'Save the storage state of {account}.')
+
+    def discard_storage_state(self, account: str, url: str) -> None:
+        """Discard the invalid storage state of the account, and its cookies
+        from the session."""
+        STORAGE_STATES.invalidate(account, get_origin(url))
+        clear_storage_state_script(self.driver)
+        self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+            'origin': get_origin(url), 'storageTypes': 'local_storage'
+        })
+        self.logger.info(f'The storage state of {account} is invalid.')
 
     def read_alert_box_message(self) -> str:
         alert = self.driver.switch_to.alert
@@ -70,10 +312,9 @@ class WebFundamentalAction(AbstractDriver):
         alert.accept()
         return alert_text
 
-    def is_page_fully_loaded(self) -> bool:
-        state = self.driver.execute_script("return document.readyState")
-        page_source_1 = self.driver.page_source
-        sleep(1)
-        page_source_2 = self.driver.page_source
-        complete_page_source = page_source_1 == page_source_2
-        return state and complete_page_source
+    def is_page_fully_loaded(self, quiet_period: float = 0.5,
+                             timeout: float = 10) -> bool:
+        """Wait in the browser until the document is complete, and the DOM
+        and the network are quiet for the quiet period in seconds."""
+        return wait_for_page_ready(self.driver, quiet_period=quiet_period,
+                                   timeout=timeout)
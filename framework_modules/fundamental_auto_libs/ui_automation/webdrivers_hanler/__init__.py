@@ -8,3 +8,4 @@
 from .chrome import get_undetected_chrome
 from .brave import get_undetected_brave
 from ._chromium import download_chromium_driver, get_chromium_driver
+from .browser_discovery import find_browser_binary, get_browser_version
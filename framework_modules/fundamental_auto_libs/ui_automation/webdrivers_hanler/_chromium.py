@@ -5,17 +5,55 @@
 Chrome.
 """
 
-from urllib.request import urlopen
+from contextlib import nullcontext
 from urllib.error import URLError
 
-from os import access, X_OK, chmod
-
-from io import BytesIO
-from shutil import move
-from zipfile import ZipFile
+from os import access, X_OK, path, remove, listdir
+from zipfile import BadZipFile
 
 from selenium import webdriver
 
+from chromedriver_autoinstaller.utils import check_version
+
+from framework_modules import ARGUMENTS
+from framework_modules.command_latency import instrument_driver
+from ..network_profile import PERFORMANCE_LOGGING_PREFS
+from .download_manager import FileLock, get_mirror_url, download_file, \
+    extract_atomically
+
+
+def find_chromium_driver(chromium_driver_folder: str,
+                         chromium_version: str) -> str:
+    """Find chromium driver.
+
+    Find a downloaded driver of the version. The drivers are named after
+    their version, those are checked first and the other files are checked
+    only when none of them matches.
+
+    Parameters
+    ----------
+    chromium_driver_folder : str
+        Directory of the drivers.
+    chromium_version : str
+        Version of the driver.
+
+    Returns
+    -------
+    str
+        Absolute path to the driver, None if there is none.
+    """
+    drivers = [
+        f'{chromium_driver_folder}/{file_}'
+        for file_ in listdir(chromium_driver_folder)
+        if path.isfile(f'{chromium_driver_folder}/{file_}')
+        and access(f'{chromium_driver_folder}/{file_}', X_OK)
+    ]
+    drivers.sort(key=lambda driver_: f'_v{chromium_version}' not in driver_)
+    for driver_ in drivers:
+        if check_version(driver_, chromium_version):
+            return driver_
+    return None
+
 
 def download_chromium_driver(**kwargs) -> str:
     """
@@ -41,35 +79,42 @@ def download_chromium_driver(**kwargs) -> str:
         f'/{chromium_distro}driver_{platform}{architect}_v{chromium_version}' \
         f'{extension}'
 
-    # Download chromedriver
-    try:
-        response = urlopen(chromium_download_url)
-        if response.getcode() != 200:
-            raise URLError('Not Found')
-    except URLError:
-        try:
-            response = urlopen(chromium_download_url_backup)
-            chromium_driver_binary_path = chromium_driver_binary_path.replace(
-                chromium_version, current_client_chromium_version
+    # Candidates of (download url, driver path), the mirror first
+    candidates = [(chromium_download_url, chromium_driver_binary_path)]
+    if chromium_download_url_backup:
+        candidates.append((
+            chromium_download_url_backup,
+            chromium_driver_binary_path.replace(
+                chromium_version, str(current_client_chromium_version)
             )
-        except URLError:
-            raise RuntimeError(f'Failed to download chromedriver archive: '
-                               f'{chromium_download_url} or'
-                               f'{chromium_download_url_backup}')
-    archive = BytesIO(response.read())
-    with ZipFile(archive) as zip_file:
-        chromium_driver_filename = get_chromium_driver_file_name()
-        zip_file.extract(chromium_driver_filename, chromium_driver_folder)
-        move(
-            f'{chromium_driver_folder}/{chromium_driver_filename}',
-            chromium_driver_binary_path
-        )
-
-    # Check access mode of the current chromedriver
-    if not access(chromium_driver_binary_path, X_OK):
-        chmod(chromium_driver_binary_path, 0o744)
-
-    return chromium_driver_binary_path
+        ))
+    if ARGUMENTS.driver_mirror:
+        candidates = [
+            (get_mirror_url(url, ARGUMENTS.driver_mirror), binary_path)
+            for url, binary_path in candidates
+        ] + candidates
+
+    # Only one process downloads the driver, the others wait and reuse it
+    with FileLock(f'{chromium_driver_folder}/.download.lock'):
+        for url, binary_path in candidates:
+            if path.isfile(binary_path) and access(binary_path, X_OK):
+                return binary_path
+        for url, binary_path in candidates:
+            try:
+                archive = download_file(url, chromium_driver_folder)
+            except (URLError, OSError, ValueError):
+                continue
+            try:
+                return extract_atomically(
+                    archive, get_chromium_driver_file_name(), binary_path
+                )
+            except (BadZipFile, KeyError):
+                continue
+            finally:
+                remove(archive)
+    raise RuntimeError(f'Failed to download chromedriver archive: '
+                       f'{chromium_download_url} or '
+                       f'{chromium_download_url_backup}')
 
 
 def get_chromium_driver(**kwargs) -> webdriver:
@@ -81,6 +126,7 @@ def get_chromium_driver(**kwargs) -> webdriver:
     headless = kwargs.get("headless")
     driver = kwargs.get("driver")
     browser_executable_path = kwargs.get("browser_executable_path")
+    performance_log = kwargs.get("performance_log")
 
     if headless:
         chromium_options.add_argument('--headless')
@@ -93,12 +139,24 @@ def get_chromium_driver(**kwargs) -> webdriver:
     chromium_options.add_experimental_option("prefs", {
         "profile.default_content_setting_values.notifications": 1
     })
-    try:
-        return chromium_driver(
-            options=chromium_options, executable_path=driver,
-            driver_executable_path=driver,
-            browser_executable_path=browser_executable_path
-        )
-    except TypeError:
-        return chromium_driver(options=chromium_options,
-                               executable_path=driver)
+    if performance_log:
+        # Chromedriver buffers the network events until they are read.
+        chromium_options.set_capability('goog:loggingPrefs',
+                                        {'performance': 'ALL'})
+        chromium_options.add_experimental_option('perfLoggingPrefs',
+                                                 PERFORMANCE_LOGGING_PREFS)
+    # Undetected chromedriver patches the driver binary while launching, the
+    # processes that share the binary (shards, parallel browsers) launch
+    # their sessions one by one.
+    launch_lock = FileLock(f'{path.dirname(driver)}/.launch.lock') \
+        if driver else nullcontext()
+    with launch_lock:
+        try:
+            return instrument_driver(chromium_driver(
+                options=chromium_options, executable_path=driver,
+                driver_executable_path=driver,
+                browser_executable_path=browser_executable_path
+            ))
+        except TypeError:
+            return instrument_driver(chromium_driver(
+                options=chromium_options, executable_path=driver))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Browser discovery.
+
+Find the binaries of the Chromium based browsers on Linux, macOS and Windows,
+and get their versions. A version is read from the binary once per process
+and cached on the path and mtime of the binary, thus an update of the
+browser is detected.
+
+The versions of Chrome, Chromium and Brave start with the Chromium major
+version (Brave 110.1.48.171 is Chromium 110), which the chromedriver is
+matched on.
+
+    Functions in this module:
+
+        +   find_browser_binary(browser: str) -> str
+                Find the binary of a browser.
+
+        +   get_browser_version(binary_path: str) -> str
+                Get the version of a browser binary.
+"""
+
+from os import environ, listdir, path, stat
+from re import compile as compile_regex
+from shutil import which
+from subprocess import check_output, DEVNULL, SubprocessError
+
+from chromedriver_autoinstaller.utils import get_platform_architecture
+
+
+# Candidates of the binaries per browser and platform, in order of
+# preference: absolute paths, or commands to look up in PATH on Linux.
+BROWSER_BINARIES = {
+    'chrome': {
+        'mac': ['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+                '/Applications/Chromium.app/Contents/MacOS/Chromium'],
+        'win': ['Google/Chrome/Application/chrome.exe',
+                'Chromium/Application/chrome.exe'],
+        'linux': ['google-chrome', 'google-chrome-stable', 'chromium',
+                  'chromium-browser'],
+    },
+    'brave': {
+        'mac': ['/Applications/Brave Browser.app/Contents/MacOS/'
+                'Brave Browser'],
+        'win': ['BraveSoftware/Brave-Browser/Application/brave.exe'],
+        'linux': ['brave-browser', 'brave-browser-stable', 'brave',
+                  '/opt/brave.com/brave/brave', '/snap/bin/brave'],
+    },
+}
+
+# Directories that the Windows installers use, the candidates are relative to
+# them.
+WINDOWS_INSTALL_DIRS = ('PROGRAMFILES', 'PROGRAMFILES(X86)', 'LOCALAPPDATA')
+
+VERSION_PATTERN = compile_regex(r'\d+(?:\.\d+){2,3}')
+
+_BINARIES = {}
+_VERSIONS = {}
+
+
+def _get_candidates(browser: str, platform: str) -> list:
+    """Get the absolute paths of the candidate binaries of a browser."""
+    candidates = BROWSER_BINARIES.get(browser, {}).get(platform, [])
+    if platform == 'win':
+        return [f'{environ.get(variable_)}/{candidate_}'
+                for candidate_ in candidates
+                for variable_ in WINDOWS_INSTALL_DIRS
+                if environ.get(variable_)]
+    if platform == 'linux':
+        return [which(candidate_) for candidate_ in candidates
+                if which(candidate_)]
+    return candidates
+
+
+def find_browser_binary(browser: str) -> str:
+    """Find browser binary.
+
+    Parameters
+    ----------
+    browser : str
+        {chrome, brave}, chrome falls back to Chromium.
+
+    Returns
+    -------
+    str
+        Real path to the binary, None if the browser is not installed.
+    """
+    browser = browser.lower()
+    if browser not in _BINARIES:
+        platform, _ = get_platform_architecture()
+        _BINARIES[browser] = next(
+            (path.realpath(candidate_) for candidate_
+             in _get_candidates(browser, platform)
+             if path.isfile(candidate_)), None
+        )
+    return _BINARIES[browser]
+
+
+def _read_version(binary_path: str) -> str:
+    """Read the version of a browser binary, None if it can not be read."""
+    if get_platform_architecture()[0] == 'win':
+        # The Windows binaries do not print their version, the installers
+        # put the resources in a directory named after it.
+        versions = [entry_ for entry_ in listdir(path.dirname(binary_path))
+                    if VERSION_PATTERN.fullmatch(entry_)]
+        return max(versions, default=None,
+                   key=lambda version_: tuple(map(int, version_.split('.'))))
+    try:
+        output = check_output([binary_path, '--version'], stderr=DEVNULL,
+                              timeout=30)
+    except (OSError, SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output.decode('utf-8', 'replace'))
+    return match.group(0) if match else None
+
+
+def get_browser_version(binary_path: str) -> str:
+    """Get browser version.
+
+    Parameters
+    ----------
+    binary_path : str
+        Path to the browser binary.
+
+    Returns
+    -------
+    str
+        Version of the browser, None if it can not be read.
+    """
+    try:
+        key = (binary_path, stat(binary_path).st_mtime_ns)
+    except OSError:
+        return None
+    if key not in _VERSIONS:
+        _VERSIONS[key] = _read_version(binary_path)
+    return _VERSIONS[key]
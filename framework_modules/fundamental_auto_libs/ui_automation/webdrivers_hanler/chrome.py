@@ -5,63 +5,93 @@
 Chrome.
 """
 
-from os import listdir
-
 from selenium import webdriver
 
 from chromedriver_autoinstaller import get_chrome_version
 from undetected_chromedriver import Chrome, ChromeOptions
 from chromedriver_autoinstaller.utils import (
-    get_matched_chromedriver_version, check_version, get_platform_architecture,
+    get_matched_chromedriver_version, get_platform_architecture,
     get_chromedriver_url, get_chromedriver_filename
 )
 
-from ._chromium import download_chromium_driver, get_chromium_driver
+from ._chromium import download_chromium_driver, find_chromium_driver, \
+    get_chromium_driver
+from .browser_discovery import find_browser_binary, get_browser_version
+from .driver_manifest import resolve_driver
 
 from framework_modules import INTERNAL_PATH
 
 
-def get_chromedriver():
-    """Get chromedriver.
+def _probe_chromedriver(chrome_binary: str) -> tuple:
+    """Probe chromedriver.
 
     Check if there is a chromedriver corresponding to the current chrome
     version. If not, auto download the corresponding one.
 
+    Parameters
+    ----------
+    chrome_binary : str
+        Path to the chrome binary, None if it is not found.
+
     Returns
     -------
-    str
-        Absolute path to the chromedriver.
+    tuple
+        (chrome version, chromedriver version, absolute path to the
+         chromedriver)
     """
     # Get chrome version on local machine
-    current_client_chrome_version = get_chrome_version()
+    current_client_chrome_version = None
+    if chrome_binary:
+        current_client_chrome_version = get_browser_version(chrome_binary)
+    if not current_client_chrome_version:
+        current_client_chrome_version = get_chrome_version()
     # Get chromedriver that is needed for automation
     chromedriver_version = \
         get_matched_chromedriver_version(current_client_chrome_version)
 
     # Check if there is an existed chromedriver could be used
-    for file_ in listdir(INTERNAL_PATH.chromedriver_dir):
-        if check_version(f'{INTERNAL_PATH.chromedriver_dir}/{file_}',
-                         chromedriver_version):
-            chrome_binary_path = f'{INTERNAL_PATH.chromedriver_dir}/{file_}'
-            return chrome_binary_path
+    chromedriver_path = find_chromium_driver(INTERNAL_PATH.chromedriver_dir,
+                                             chromedriver_version)
+    if chromedriver_path:
+        return (current_client_chrome_version, chromedriver_version,
+                chromedriver_path)
 
     # Get chromedriver download url
     chromedriver_download_url = get_chromedriver_url(chromedriver_version)
     # Check platform and architect of machine's OS
     platform, architect = get_platform_architecture()
 
-    return download_chromium_driver(
-        platform=platform, architect=architect, chromium_distro="chrome",
-        chromium_version=chromedriver_version,
-        chromium_download_url=chromedriver_download_url,
-        chromium_driver_folder=INTERNAL_PATH.chromedriver_dir,
-        get_chromium_driver_file_name=get_chromedriver_filename
-    )
+    return current_client_chrome_version, chromedriver_version, \
+        download_chromium_driver(
+            platform=platform, architect=architect, chromium_distro="chrome",
+            chromium_version=chromedriver_version,
+            chromium_download_url=chromedriver_download_url,
+            chromium_driver_folder=INTERNAL_PATH.chromedriver_dir,
+            get_chromium_driver_file_name=get_chromedriver_filename
+        )
+
+
+def get_chromedriver():
+    """Get chromedriver.
+
+    Get the chromedriver of the chrome binary from the driver manifest, the
+    versions are probed only when chrome is new or updated.
+
+    Returns
+    -------
+    str
+        Absolute path to the chromedriver.
+    """
+    chrome_binary = find_browser_binary('chrome')
+    return resolve_driver(chrome_binary,
+                          lambda: _probe_chromedriver(chrome_binary))
 
 
-def get_undetected_chrome() -> webdriver:
+def get_undetected_chrome(performance_log: bool = False) -> webdriver:
     """This function establishes chrome browser."""
     return get_chromium_driver(
         chromium_options=ChromeOptions(),
-        chromium_driver=Chrome, headless=False, driver=get_chromedriver()
+        chromium_driver=Chrome, headless=False, driver=get_chromedriver(),
+        browser_executable_path=find_browser_binary('chrome'),
+        performance_log=performance_log
     )
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Download manager.
+
+Drivers are streamed to a temporary file while their checksum is computed,
+verified, and extracted with an atomic rename. A download is done under an
+inter-process file lock, thus the workers that start at the same time
+download a driver only once.
+
+A mirror can replace the download server for offline runs. It is a directory
+or a file://, http:// URL with the same paths as the server:
+    {mirror}/110.0.5481.77/chromedriver_linux64.zip
+An optional {file}.sha256 next to a mirrored file is verified.
+"""
+
+from base64 import b64decode
+from hashlib import md5, sha256
+from os import path, remove, replace, chmod, name, getpid
+from tempfile import NamedTemporaryFile
+from time import sleep
+from urllib.error import URLError
+from urllib.parse import urlsplit
+from urllib.request import urlopen, pathname2url
+from zipfile import ZipFile, BadZipFile
+
+if name == "posix":
+    import fcntl
+else:
+    import msvcrt
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FileLock:
+    """Inter-process file lock.
+
+    Attributes
+    ----------
+    lock_file : str
+        Path to the lock file.
+    """
+
+    def __init__(self, lock_file: str):
+        """Constructor."""
+        self.lock_file = lock_file
+        self.__file = None
+
+    def __enter__(self):
+        self.__file = open(self.lock_file, 'a+b')
+        if name == "posix":
+            fcntl.flock(self.__file.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    self.__file.seek(0)
+                    msvcrt.locking(self.__file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds, keep waiting.
+                    sleep(1)
+        return self
+
+    def __exit__(self, *args) -> None:
+        if name == "posix":
+            fcntl.flock(self.__file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.__file.seek(0)
+            msvcrt.locking(self.__file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.__file.close()
+
+
+def get_mirror_url(url: str, mirror: str) -> str:
+    """Get the URL of a file in the mirror.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file in the download server.
+    mirror : str
+        Directory or URL of the mirror.
+
+    Returns
+    -------
+    str
+    """
+    if '://' not in mirror:
+        mirror = f"file:{pathname2url(path.abspath(mirror))}"
+    return f"{mirror.rstrip('/')}{urlsplit(url).path}"
+
+
+def _get_expected_sha256(url: str) -> str:
+    """Get the sha256 published next to a file, None if there is none."""
+    try:
+        with urlopen(f"{url}.sha256") as response:
+            return response.read().decode().split()[0].lower()
+    except (URLError, OSError, IndexError):
+        return None
+
+
+def download_file(url: str, destination_dir: str) -> str:
+    """Download file.
+
+    Stream the file to a temporary file of the destination directory and
+    verify its checksum: the md5 of the x-goog-hash header of the Google
+    storage, and the {url}.sha256 file when it exists.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file.
+    destination_dir : str
+        Directory of the temporary file.
+
+    Returns
+    -------
+    str
+        Path to the temporary file.
+
+    Raises
+    ------
+    URLError
+        The file could not be downloaded or its checksum does not match.
+    """
+    md5_hash = md5()
+    sha256_hash = sha256()
+    temp_file = None
+    try:
+        with urlopen(url) as response:
+            if response.getcode() not in (None, 200):
+                raise URLError('Not Found')
+            goog_hashes = dict(
+                value_.strip().split('=', 1) for value_
+                in (response.headers.get('x-goog-hash') or '').split(',')
+                if '=' in value_
+            )
+            with NamedTemporaryFile(dir=destination_dir, suffix='.download',
+                                    delete=False) as temp_file:
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b''):
+                    md5_hash.update(chunk)
+                    sha256_hash.update(chunk)
+                    temp_file.write(chunk)
+
+        expected_sha256 = _get_expected_sha256(url)
+        if (goog_hashes.get('md5')
+                and b64decode(goog_hashes.get('md5')) != md5_hash.digest()) \
+                or (expected_sha256
+                    and expected_sha256 != sha256_hash.hexdigest()):
+            raise URLError(f'Checksum mismatch: {url}')
+    except BaseException:
+        # No partial or corrupted download is left in the directory.
+        if temp_file is not None and path.exists(temp_file.name):
+            remove(temp_file.name)
+        raise
+    return temp_file.name
+
+
+def extract_atomically(archive: str, member: str, target: str) -> str:
+    """Extract a file of a zip archive with an atomic rename.
+
+    Parameters
+    ----------
+    archive : str
+        Path to the zip archive.
+    member : str
+        Name of the file in the archive.
+    target : str
+        Path to the extracted file.
+
+    Returns
+    -------
+    str
+        Path to the extracted file.
+    """
+    temp_target = f"{target}.{getpid()}.tmp"
+    try:
+        with ZipFile(archive) as zip_file, \
+                zip_file.open(member) as source, \
+                open(temp_target, 'wb') as destination:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                destination.write(chunk)
+        chmod(temp_target, 0o744)
+        replace(temp_target, target)
+    except (BadZipFile, KeyError):
+        if path.exists(temp_target):
+            remove(temp_target)
+        raise
+    return target
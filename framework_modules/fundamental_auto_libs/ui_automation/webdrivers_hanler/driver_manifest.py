@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Driver manifest.
+
+The manifest maps a browser binary to the driver that was verified for it.
+An entry is keyed on the path, inode, size and mtime of the binary, thus an
+update of the browser invalidates it. A resolution is one stat of the binary
+plus a dict lookup, the browser version and the driver files are probed only
+on a cache miss.
+
+The manifest is stored in the drivers directory:
+    {
+        "<browser binary path>": {
+            "inode": , "size": , "mtime_ns": ,
+            "browser_version": , "driver_version": , "driver_path":
+        }
+    }
+"""
+
+from json import load, dump
+from os import stat, path, replace, getpid
+from typing import Callable
+
+from framework_modules import INTERNAL_PATH
+
+
+class DriverManifest:
+    """Driver manifest.
+
+    Attributes
+    ----------
+    manifest_file : str
+        Path to the manifest file.
+    """
+
+    def __init__(self, manifest_file: str):
+        """Constructor."""
+        self.manifest_file = manifest_file
+        self.__entries = None
+
+    def __load(self) -> dict:
+        try:
+            with open(self.manifest_file, encoding='utf-8') as manifest:
+                entries = load(manifest)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def __save(self) -> None:
+        """Save the manifest atomically, the entries written by other
+        processes in the meantime are kept."""
+        entries = self.__load()
+        entries.update(self.__entries)
+        self.__entries = entries
+        temp_file = f"{self.manifest_file}.{getpid()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as manifest:
+            dump(entries, manifest, indent=4)
+        replace(temp_file, self.manifest_file)
+
+    @staticmethod
+    def __get_binary_key(binary_path: str) -> dict:
+        binary_stat = stat(binary_path)
+        return {'inode': binary_stat.st_ino, 'size': binary_stat.st_size,
+                'mtime_ns': binary_stat.st_mtime_ns}
+
+    def lookup(self, binary_path: str) -> dict:
+        """Lookup the verified driver of a browser binary.
+
+        Parameters
+        ----------
+        binary_path : str
+            Path to the browser binary.
+
+        Returns
+        -------
+        dict
+            The manifest entry, None on a cache miss.
+        """
+        if self.__entries is None:
+            self.__entries = self.__load()
+        entry = self.__entries.get(binary_path)
+        if not entry:
+            # Another process may have recorded it since the manifest loaded.
+            self.__entries = self.__load()
+            entry = self.__entries.get(binary_path)
+        if not entry:
+            return None
+        try:
+            binary_key = self.__get_binary_key(binary_path)
+        except OSError:
+            return None
+        if any(entry.get(key_) != value_
+               for key_, value_ in binary_key.items()) \
+                or not path.isfile(entry.get('driver_path', '')):
+            return None
+        return entry
+
+    def record(self, binary_path: str, browser_version: str,
+               driver_version: str, driver_path: str) -> None:
+        """Record the verified driver of a browser binary.
+
+        Parameters
+        ----------
+        binary_path : str
+            Path to the browser binary.
+        browser_version : str
+            Version of the browser.
+        driver_version : str
+            Version of the driver.
+        driver_path : str
+            Path to the driver.
+
+        Returns
+        -------
+        None
+        """
+        if self.__entries is None:
+            self.__entries = self.__load()
+        entry = self.__get_binary_key(binary_path)
+        entry.update({'browser_version': browser_version,
+                      'driver_version': driver_version,
+                      'driver_path': driver_path})
+        self.__entries[binary_path] = entry
+        self.__save()
+
+
+DRIVER_MANIFEST = DriverManifest(INTERNAL_PATH.driver_manifest_file)
+
+
+def resolve_driver(binary_path: str, probe: Callable[[], tuple]) -> str:
+    """Resolve driver.
+
+    Get the driver of a browser binary from the manifest, or probe it and
+    record it on a cache miss.
+
+    Parameters
+    ----------
+    binary_path : str
+        Path to the browser binary, None if it is unknown: the driver is
+        probed on every call.
+    probe : Callable
+        Function that probes the driver, returns
+        (browser_version, driver_version, driver_path).
+
+    Returns
+    -------
+    str
+        Path to the driver.
+    """
+    if binary_path:
+        entry = DRIVER_MANIFEST.lookup(binary_path)
+        if entry:
+            return entry.get('driver_path')
+    browser_version, driver_version, driver_path = probe()
+    if binary_path:
+        try:
+            DRIVER_MANIFEST.record(binary_path, browser_version,
+                                   driver_version, driver_path)
+        except OSError:
+            pass
+    return driver_path
@@ -22,12 +22,15 @@ class InternalPath:
     __document_dir = f'{__workspace_path}/documentations'
     __test_case_dir = f'{__workspace_path}/test_cases'
     __latest_combined_log_path = f"{__log_dir_path}/latest_combined_log"
+    __test_duration_dir = f"{__log_dir_path}/test_durations"
     __allure_bin_dir = f'{__workspace_path}/framework_modules/tools/allure/bin'
 
     __chromedriver_dir = \
         f'{__workspace_path}/framework_modules/tools/web_drivers'
     __chromedriver_mapping_file = \
         f'{__chromedriver_dir}/chrome_mapping_version.json'
+    __driver_manifest_file = f'{__chromedriver_dir}/driver_manifest.json'
+    __storage_state_dir = f'{__workspace_path}/.storage_states'
 
     # Public var
     current_execution_log_dir = dict()
@@ -36,6 +39,14 @@ class InternalPath:
     def chromedriver_mapping_file(self) -> str:
         return self.__chromedriver_mapping_file
 
+    @property
+    def driver_manifest_file(self) -> str:
+        return self.__driver_manifest_file
+
+    @property
+    def storage_state_dir(self) -> str:
+        return self.__storage_state_dir
+
     @property
     def chromedriver_dir(self) -> str:
         return self.__chromedriver_dir
@@ -60,6 +71,10 @@ class InternalPath:
     def latest_combined_log(self) -> str:
         return self.__latest_combined_log_path
 
+    @property
+    def test_duration_dir(self) -> str:
+        return self.__test_duration_dir
+
     @property
     def allure_bin(self) -> str:
         if name == 'nt':
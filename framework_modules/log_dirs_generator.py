@@ -9,6 +9,7 @@ from datetime import datetime
 from os import mkdir, path
 from .internal_path import INTERNAL_PATH
 from .args_parser import ARGUMENTS
+from .test_runs import get_test_runs
 
 
 def generate_current_time_execution_log_dir() -> None:
@@ -19,7 +20,9 @@ def generate_current_time_execution_log_dir() -> None:
     is the current time (hh-mmm-ss).
 
     The structure of generated folders:
-        workspace/{today}/{module}/{current_time}
+        workspace/{today}/{run}/{current_time}
+    where run is the module, or {module}-{browser} when the web module runs
+    on several browsers.
 
     Returns
     -------
@@ -34,8 +37,9 @@ def generate_current_time_execution_log_dir() -> None:
         module_in_lower = INTERNAL_PATH.test_modules
 
     module_log_folders = {
-        module_name:  f'{today_log_folder}/{module_name}' for module_name
-        in module_in_lower if module_name in INTERNAL_PATH.test_modules
+        run_name: f'{today_log_folder}/{run_name}' for run_name
+        in get_test_runs([module_name for module_name in module_in_lower
+                          if module_name in INTERNAL_PATH.test_modules])
     }
 
     current_time_execution_log_dir = {
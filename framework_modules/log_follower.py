@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module follows the lines appended to a log file or written to the
+output stream of a process, and detects the lines that match patterns.
+
+    Functions in this module:
+
+        +   LogFollower(file_path: str)
+                Follow a log file with one handle, read only the new bytes.
+
+        +   StreamFollower(stream, patterns: list, echo: bool = True,
+                           ignore_case: bool = False)
+                Follow the output stream of a process in a background thread.
+"""
+
+from threading import Thread, Event
+from typing import Iterable
+
+
+def _find_pattern(line: str, patterns: Iterable[str],
+                  ignore_case: bool = False) -> str:
+    """Get the first pattern that is in the line, None if no pattern is."""
+    if ignore_case:
+        line = line.lower()
+    for pattern in patterns:
+        if (pattern.lower() if ignore_case else pattern) in line:
+            return pattern
+    return None
+
+
+class LogFollower:
+    """Log follower.
+
+    Keep one handle of a log file and read only the bytes appended since the
+    previous read, like `tail -f`.
+
+    Attributes
+    ----------
+    file_path : str
+        Path to the log file.
+    """
+
+    def __init__(self, file_path: str, from_start: bool = True):
+        """Constructor.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the log file.
+        from_start : bool
+            False to follow only the lines appended after the constructor.
+        """
+        self.file_path = file_path
+        self.__file = open(file_path, 'rb')
+        if not from_start:
+            self.__file.seek(0, 2)
+        self.__partial_line = b''
+
+    def read_new_lines(self) -> list:
+        """Read new lines.
+
+        Returns
+        -------
+        list
+            The complete lines appended since the previous read, an
+            unfinished last line is kept until it is complete.
+        """
+        data = self.__partial_line + self.__file.read()
+        lines = data.split(b'\n')
+        self.__partial_line = lines.pop()
+        return [line.rstrip(b'\r').decode('utf-8', errors='replace')
+                for line in lines]
+
+    def match(self, patterns: Iterable[str]) -> str:
+        """Match the new lines against the patterns.
+
+        Parameters
+        ----------
+        patterns : Iterable[str]
+            Texts to be found in a line.
+
+        Returns
+        -------
+        str
+            The first found pattern, None if no new line matches.
+        """
+        for line in self.read_new_lines():
+            pattern = _find_pattern(line, patterns)
+            if pattern is not None:
+                return pattern
+        return None
+
+    def close(self) -> None:
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class StreamFollower:
+    """Stream follower.
+
+    Read the output stream of a process line by line in a background thread,
+    thus the process never blocks on a full pipe and the caller is woken up
+    as soon as a line matches.
+
+    Attributes
+    ----------
+    matched_pattern : str
+        The first pattern that is found, None until then.
+    """
+
+    def __init__(self, stream, patterns: Iterable[str], echo: bool = True,
+                 ignore_case: bool = False):
+        """Constructor.
+
+        Parameters
+        ----------
+        stream
+            Binary output stream of a process, such as Popen.stdout.
+        patterns : Iterable[str]
+            Texts to be found in a line.
+        echo : bool
+            True to print every line.
+        ignore_case : bool
+            True to match the patterns case-insensitively.
+        """
+        self.matched_pattern = None
+        self.__patterns = list(patterns)
+        self.__echo = echo
+        self.__ignore_case = ignore_case
+        self.__matched = Event()
+        self.__closed = Event()
+        self.__wake_up = Event()
+        self.__thread = Thread(target=self.__follow, args=(stream,),
+                               daemon=True, name='stream-follower')
+        self.__thread.start()
+
+    def __follow(self, stream) -> None:
+        for raw_line in iter(stream.readline, b''):
+            line = raw_line.rstrip().decode('utf-8', errors='replace')
+            if self.__echo:
+                print(line)
+            if not self.__matched.is_set():
+                pattern = _find_pattern(line, self.__patterns,
+                                        self.__ignore_case)
+                if pattern is not None:
+                    self.matched_pattern = pattern
+                    self.__matched.set()
+                    self.__wake_up.set()
+        self.__closed.set()
+        self.__wake_up.set()
+
+    @property
+    def is_matched(self) -> bool:
+        return self.__matched.is_set()
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__closed.is_set()
+
+    def wait(self, timeout: float) -> str:
+        """Wait for a line that matches one of the patterns.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time to wait in seconds.
+
+        Returns
+        -------
+        str
+            The found pattern, None if the timeout is over or the stream is
+            closed without a match.
+        """
+        self.__wake_up.wait(timeout)
+        return self.matched_pattern
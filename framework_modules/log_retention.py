@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module applies the retention policies to the logs tree.
+
+The logs of every run are stored in logs/{date}/{module}/{time}. A run is
+pruned when it is older than the max age, when it is not one of the latest
+runs of its module, or when the logs tree is over the size limit (oldest runs
+first). The kept runs that are not among the latest ones are compressed into
+{time}.zip, which can still be listed and extracted file by file with
+`python -m zipfile`.
+
+    Functions in this module:
+
+        +   start_log_retention(excluded_dirs: list) -> Thread
+                Apply the retention policies in a background thread.
+
+        +   apply_retention_policies(*args) -> None
+                Prune and compress the runs of the logs tree.
+"""
+
+from datetime import datetime
+from os import scandir, path, remove, replace, rmdir
+from shutil import rmtree
+from threading import Thread
+from time import time
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from .args_parser import ARGUMENTS
+from .internal_path import INTERNAL_PATH
+
+
+ARCHIVE_SUFFIX = '.zip'
+TEMP_SUFFIX = '.tmp'
+
+# Age in seconds after which a temporary archive is left over by a killed
+# compression, younger ones may be written by another execution.
+STALE_TEMP_ARCHIVE_AGE = 60 * 60
+
+
+class _Run:
+    """Run of a module in the logs tree.
+
+    Attributes
+    ----------
+    path : str
+        Path to the run directory or archive.
+    module : str
+        Test module of the run.
+    started : float
+        Start time of the run as epoch seconds.
+    """
+
+    def __init__(self, run_path: str, module: str, started: float):
+        """Constructor."""
+        self.path = run_path
+        self.module = module
+        self.started = started
+
+    @property
+    def is_archived(self) -> bool:
+        return self.path.endswith(ARCHIVE_SUFFIX)
+
+    @property
+    def size(self) -> int:
+        if self.is_archived:
+            return path.getsize(self.path)
+        return _get_dir_size(self.path)
+
+    def remove(self) -> None:
+        if self.is_archived:
+            remove(self.path)
+        else:
+            rmtree(self.path, ignore_errors=True)
+
+
+def _get_dir_size(directory: str) -> int:
+    """Get the size in bytes of every file under a directory."""
+    size = 0
+    with scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                size += _get_dir_size(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                size += entry.stat(follow_symlinks=False).st_size
+    return size
+
+
+def _is_date_dir(name: str) -> bool:
+    try:
+        datetime.strptime(name, "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+
+def _parse_started_time(date: str, run_name: str) -> float:
+    """Parse the start time of a run from its date and time directories.
+
+    Returns
+    -------
+    float
+        Epoch seconds, None if the names are not a run.
+    """
+    if run_name.endswith(ARCHIVE_SUFFIX):
+        run_name = run_name[:-len(ARCHIVE_SUFFIX)]
+    try:
+        return datetime.strptime(f"{date} {run_name}",
+                                 "%Y-%m-%d %H-%M-%S").timestamp()
+    except ValueError:
+        return None
+
+
+def _collect_runs(log_dir: str, excluded_dirs: set) -> list:
+    """Collect runs.
+
+    Only the logs/{date}/{module}/{time} entries are runs, other entries of
+    the logs tree (latest_combined_log, test_durations...) are never touched.
+
+    Parameters
+    ----------
+    log_dir : str
+        Path to the logs tree.
+    excluded_dirs : set
+        Run directories to be kept, such as the ones of the current run.
+
+    Returns
+    -------
+    list
+        Runs sorted from the oldest to the latest.
+    """
+    runs = []
+    with scandir(log_dir) as date_entries:
+        date_dirs = [entry for entry in date_entries
+                     if entry.is_dir(follow_symlinks=False)
+                     and _is_date_dir(entry.name)]
+    for date_entry in date_dirs:
+        with scandir(date_entry.path) as module_entries:
+            module_dirs = [entry for entry in module_entries
+                           if entry.is_dir(follow_symlinks=False)]
+        for module_entry in module_dirs:
+            with scandir(module_entry.path) as run_entries:
+                for run_entry in run_entries:
+                    if run_entry.name.endswith(ARCHIVE_SUFFIX + TEMP_SUFFIX):
+                        _remove_stale_temp_archive(run_entry)
+                        continue
+                    started = _parse_started_time(date_entry.name,
+                                                  run_entry.name)
+                    if started is None \
+                            or path.abspath(run_entry.path) in excluded_dirs:
+                        continue
+                    runs.append(_Run(run_entry.path, module_entry.name,
+                                     started))
+    return sorted(runs, key=lambda run_: run_.started)
+
+
+def _remove_stale_temp_archive(entry) -> None:
+    """Remove a temporary archive left over by a killed compression."""
+    try:
+        if time() - entry.stat(follow_symlinks=False).st_mtime \
+                > STALE_TEMP_ARCHIVE_AGE:
+            remove(entry.path)
+    except OSError:
+        pass
+
+
+def _compress_run(run: _Run) -> None:
+    """Compress a run directory into {time}.zip and remove the directory.
+
+    The archive is written to a temporary file first, thus an interrupted
+    compression never leaves a broken archive.
+    """
+    archive = f"{run.path}{ARCHIVE_SUFFIX}"
+    temp_archive = f"{archive}{TEMP_SUFFIX}"
+    try:
+        with ZipFile(temp_archive, 'w', compression=ZIP_DEFLATED) \
+                as zip_file:
+            _add_dir_to_archive(zip_file, run.path, '')
+        replace(temp_archive, archive)
+    finally:
+        if path.exists(temp_archive):
+            remove(temp_archive)
+    rmtree(run.path, ignore_errors=True)
+    run.path = archive
+
+
+def _add_dir_to_archive(zip_file: ZipFile, directory: str,
+                        prefix: str) -> None:
+    with scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _add_dir_to_archive(zip_file, entry.path,
+                                    f"{prefix}{entry.name}/")
+            elif entry.is_file(follow_symlinks=False):
+                zip_file.write(entry.path, f"{prefix}{entry.name}")
+
+
+def _remove_empty_dirs(log_dir: str) -> None:
+    """Remove date and module directories that have no runs left."""
+    with scandir(log_dir) as date_entries:
+        date_dirs = [entry.path for entry in date_entries
+                     if entry.is_dir(follow_symlinks=False)
+                     and _is_date_dir(entry.name)]
+    for date_dir in date_dirs:
+        with scandir(date_dir) as module_entries:
+            module_dirs = [entry.path for entry in module_entries
+                           if entry.is_dir(follow_symlinks=False)]
+        for module_dir in module_dirs:
+            with scandir(module_dir) as run_entries:
+                if next(run_entries, None) is None:
+                    rmdir(module_dir)
+        with scandir(date_dir) as module_entries:
+            if next(module_entries, None) is None:
+                rmdir(date_dir)
+
+
+def apply_retention_policies(log_dir: str, excluded_dirs: list = (),
+                             max_age_days: float = None,
+                             max_size_mb: float = None,
+                             keep_last: int = None,
+                             compress_after: int = None) -> None:
+    """Apply retention policies.
+
+    Parameters
+    ----------
+    log_dir : str
+        Path to the logs tree.
+    excluded_dirs : list
+        Run directories to be kept, such as the ones of the current run.
+    max_age_days : float
+        Remove the runs older than this amount of days.
+    max_size_mb : float
+        Remove the oldest runs until the runs take at most this size.
+    keep_last : int
+        Keep only this amount of latest runs per module.
+    compress_after : int
+        Compress the runs per module except this amount of latest ones.
+
+    Returns
+    -------
+    None
+    """
+    if not path.isdir(log_dir):
+        return
+    runs = _collect_runs(log_dir, {path.abspath(dir_)
+                                   for dir_ in excluded_dirs})
+    removed = set()
+
+    if max_age_days is not None:
+        oldest_allowed = time() - max_age_days * 24 * 60 * 60
+        removed.update(run_ for run_ in runs if run_.started < oldest_allowed)
+
+    runs_of_module = {}
+    for run_ in runs:
+        if run_ not in removed:
+            runs_of_module.setdefault(run_.module, []).append(run_)
+    for module_runs in runs_of_module.values():
+        if keep_last is not None and len(module_runs) > keep_last:
+            removed.update(module_runs[:len(module_runs) - keep_last])
+            del module_runs[:len(module_runs) - keep_last]
+
+    for run_ in removed:
+        run_.remove()
+    runs = [run_ for run_ in runs if run_ not in removed]
+
+    if compress_after is not None:
+        for module_runs in runs_of_module.values():
+            for run_ in module_runs[:max(len(module_runs) - compress_after,
+                                         0)]:
+                if not run_.is_archived:
+                    _compress_run(run_)
+
+    if max_size_mb is not None:
+        max_size = max_size_mb * 1024 * 1024
+        sizes = {run_.path: run_.size for run_ in runs}
+        total_size = sum(sizes.values())
+        for run_ in runs:
+            if total_size <= max_size:
+                break
+            total_size -= sizes.get(run_.path)
+            run_.remove()
+
+    _remove_empty_dirs(log_dir)
+
+
+def _apply_retention_policies_safely(*args) -> None:
+    """Retention must never fail the test run."""
+    try:
+        apply_retention_policies(*args)
+    except OSError as error:
+        print(f"Log retention is interrupted: {error}")
+
+
+def start_log_retention(excluded_dirs: list) -> Thread:
+    """Start log retention.
+
+    Apply the retention policies of the arguments in a background thread,
+    while the test cases are running.
+
+    Parameters
+    ----------
+    excluded_dirs : list
+        Run directories to be kept, such as the ones of the current run.
+
+    Returns
+    -------
+    Thread
+        The started thread, None if no policy is given.
+    """
+    policies = (ARGUMENTS.retention_max_age, ARGUMENTS.retention_max_size,
+                ARGUMENTS.retention_keep_last,
+                ARGUMENTS.retention_compress_after)
+    if all(policy is None for policy in policies):
+        return None
+    retention_thread = Thread(
+        target=_apply_retention_policies_safely,
+        args=(INTERNAL_PATH.log_dir_path, list(excluded_dirs), *policies),
+        name='log-retention'
+    )
+    retention_thread.start()
+    return retention_thread
+
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module provides buffered log sinks that keep one file handle open per
+log file.
+
+    Functions in this module:
+
+        +   get_log_sink(file_path: str) -> LogSink
+                Get the shared sink of a log file.
+
+        +   close_log_sinks() -> None
+                Flush and close every sink of the current process.
+
+        +   register_exit_handler(obj, method: Callable,
+                                  priority: int = 10) -> None
+                Call a method of an object when the process exits.
+"""
+
+from atexit import register as register_at_exit
+from multiprocessing.util import Finalize, register_after_fork
+from os import path, makedirs
+from threading import Lock, Thread, Event
+from typing import Callable
+
+
+# Flush a sink when its buffer reaches this size in bytes.
+BUFFER_SIZE = 64 * 1024
+# Flush every sink that has pending data at this interval in seconds.
+FLUSH_INTERVAL = 1.0
+
+
+def register_exit_handler(obj, method: Callable, priority: int = 10) -> None:
+    """Register exit handler.
+
+    atexit covers the main process, Finalize covers the worker processes,
+    which exit without running atexit handlers.
+
+    Parameters
+    ----------
+    obj
+        Object to be finalized.
+    method : Callable
+        Method of the class of the object, called with the object.
+    priority : int
+        Exit priority of Finalize, the higher ones are called first.
+
+    Returns
+    -------
+    None
+    """
+    register_at_exit(method, obj)
+    Finalize(obj, method, args=(obj,), exitpriority=priority)
+
+
+class LogSink:
+    """Log sink.
+
+    This class holds one handle of a log file open and buffers the written
+    text in memory. The buffer is written at once when it reaches
+    BUFFER_SIZE, on the FLUSH_INTERVAL tick of the background flusher, on
+    flush() and on close().
+
+    The file is opened in append mode and every flush is a single write, so
+    several processes can share the log file without splitting lines.
+
+    Attributes
+    ----------
+    file_path : str
+        Path to the log file.
+    """
+
+    def __init__(self, file_path: str, buffer_size: int = BUFFER_SIZE):
+        """Constructor."""
+        self.file_path = file_path
+        self.__buffer_size = buffer_size
+        self.__buffer = []
+        self.__buffered_bytes = 0
+        self.__lock = Lock()
+        if not path.exists(path.dirname(file_path)):
+            makedirs(path.dirname(file_path), exist_ok=True)
+        self.__file = open(file_path, 'ab', buffering=0)
+
+    def __flush_buffer(self) -> None:
+        """Write the buffer to the file, the lock must be held."""
+        if not self.__buffer or self.__file is None:
+            return
+        self.__file.write(b''.join(self.__buffer))
+        self.__buffer = []
+        self.__buffered_bytes = 0
+
+    def write(self, text: str) -> int:
+        """Write.
+
+        Parameters
+        ----------
+        text : str
+            Text to be written.
+
+        Returns
+        -------
+        int
+            The amount of written bytes.
+        """
+        data = text.encode('utf-8')
+        with self.__lock:
+            self.__buffer.append(data)
+            self.__buffered_bytes += len(data)
+            if self.__buffered_bytes >= self.__buffer_size:
+                self.__flush_buffer()
+        return len(data)
+
+    def flush(self) -> None:
+        with self.__lock:
+            self.__flush_buffer()
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__flush_buffer()
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+    @property
+    def has_pending_data(self) -> bool:
+        return bool(self.__buffer)
+
+
+class _LogSinkRegistry:
+    """Log sink registry.
+
+    Keep one sink per log file in the current process and flush them from a
+    background thread.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self.sinks = {}
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.flusher = None
+
+    def get(self, file_path: str) -> LogSink:
+        with self.lock:
+            sink = self.sinks.get(file_path)
+            if sink is None:
+                sink = LogSink(file_path)
+                self.sinks[file_path] = sink
+            if self.flusher is None:
+                self.flusher = Thread(target=self.__flush_periodically,
+                                      args=(self.stop_event,),
+                                      name='log-sink-flusher', daemon=True)
+                self.flusher.start()
+            return sink
+
+    def __flush_periodically(self, stop_event: Event) -> None:
+        while not stop_event.wait(FLUSH_INTERVAL):
+            with self.lock:
+                sinks = list(self.sinks.values())
+            for sink in sinks:
+                if sink.has_pending_data:
+                    sink.flush()
+
+    def close_all(self) -> None:
+        with self.lock:
+            self.stop_event.set()
+            self.stop_event = Event()
+            self.flusher = None
+            sinks = list(self.sinks.values())
+            self.sinks.clear()
+        for sink in sinks:
+            sink.close()
+
+    def after_fork(self) -> None:
+        """Reset after fork.
+
+        The child process must not write the buffers inherited from its
+        parent, the parent writes them. The flusher thread does not survive
+        the fork, it is started again on the next get().
+        """
+        self.sinks = {}
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.flusher = None
+        Finalize(self, _LogSinkRegistry.close_all, args=(self,),
+                 exitpriority=0)
+
+
+_REGISTRY = _LogSinkRegistry()
+
+# The sinks are closed after the other exit handlers, which may still log.
+register_exit_handler(_REGISTRY, _LogSinkRegistry.close_all, priority=0)
+register_after_fork(_REGISTRY, _LogSinkRegistry.after_fork)
+
+
+def get_log_sink(file_path: str) -> LogSink:
+    """Get log sink.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the log file.
+
+    Returns
+    -------
+    LogSink
+        The shared sink of the log file in the current process.
+    """
+    return _REGISTRY.get(file_path)
+
+
+def close_log_sinks() -> None:
+    """Close log sinks.
+
+    Flush and close every sink of the current process.
+
+    Returns
+    -------
+    None
+    """
+    _REGISTRY.close_all()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module merges robot output.xml files with bounded memory.
+
+Unlike `rebot`, which loads every output file fully into memory, the files
+are streamed with iterparse. Only one test element is kept in memory at a
+time, the tests are spooled to a temporary file and the combined XML is
+written from the spool.
+
+    Functions in this module:
+
+        +   merge_outputs(output: str, *sources: str, merge: bool = False,
+                          name: str = None) -> str
+                Merge or combine output files.
+"""
+
+from os import remove
+from xml.etree.ElementTree import iterparse, tostring
+from xml.sax.saxutils import quoteattr
+
+
+_SUITE_ITEM_TAGS = ('kw', 'setup', 'teardown', 'doc', 'meta')
+
+
+class _SuiteNode:
+    """Suite node.
+
+    Structure of a suite in the merged output. Tests and suite items are
+    references to the spool file: (offset, length).
+    """
+
+    def __init__(self, attributes: dict):
+        """Constructor."""
+        self.attributes = dict(attributes)
+        self.suites = {}
+        self.tests = {}
+        self.setup = None
+        self.teardown = None
+        self.items = {}
+        self.status = {}
+
+    def update_status(self, attributes: dict) -> None:
+        """Update status.
+
+        Keep the earliest start time and the latest end time of the suite
+        across all outputs.
+        """
+        status = dict(attributes)
+        for key_, pick in (('starttime', min), ('endtime', max)):
+            values = [value_ for value_ in (self.status.get(key_),
+                                            status.get(key_))
+                      if value_ and value_ != 'N/A']
+            if values:
+                status[key_] = pick(values)
+        self.status = status
+
+
+def _start_tag(tag: str, attributes: dict) -> str:
+    """Build start tag.
+
+    Parameters
+    ----------
+    tag : str
+    attributes : dict
+
+    Returns
+    -------
+    str
+    """
+    return f"<{tag}" + "".join(
+        f" {key_}={quoteattr(str(value_))}"
+        for key_, value_ in attributes.items()
+    ) + ">"
+
+
+class _OutputMerger:
+    """Output merger.
+
+    Attributes
+    ----------
+    merge : bool
+        True: suites with the same name are merged and a test of a later
+        output replaces the one with the same long name, as `rebot --merge`.
+        False: every output becomes a child suite of a new root suite.
+    """
+
+    def __init__(self, spool_file: str, merge: bool):
+        """Constructor."""
+        self.merge = merge
+        self.root = _SuiteNode({})
+        self.robot_attributes = {}
+        self.errors = []
+        self.spool_file = spool_file
+        self.spool = open(spool_file, 'w+b')
+
+    def __spool_element(self, element) -> tuple:
+        """Serialize an element to the spool file.
+
+        Returns
+        -------
+        tuple
+            (offset, length)
+        """
+        element.tail = None
+        data = tostring(element, encoding='utf-8') + b'\n'
+        offset = self.spool.seek(0, 2)
+        self.spool.write(data)
+        return offset, len(data)
+
+    def read_source(self, index: int, source: str) -> None:
+        """Read source.
+
+        Stream a source output and register its suites, tests, suite items
+        and errors.
+
+        Parameters
+        ----------
+        index : int
+            Position of the source, used to separate combined outputs.
+        source : str
+            Path to the output file.
+
+        Returns
+        -------
+        None
+        """
+        elements = []
+        suite_nodes = []
+        for event, element in iterparse(source, events=('start', 'end')):
+            parent = elements[-1] if elements else None
+            if event == 'start':
+                elements.append(element)
+                if element.tag == 'robot' and not self.robot_attributes:
+                    self.robot_attributes = dict(element.attrib)
+                if element.tag == 'suite' and parent is not None \
+                        and parent.tag in ('robot', 'suite'):
+                    container = suite_nodes[-1].suites if suite_nodes \
+                        else self.root.suites
+                    key_ = element.get('name')
+                    if not suite_nodes and not self.merge:
+                        key_ = f"{index}:{key_}"
+                    if key_ not in container:
+                        container[key_] = _SuiteNode(element.attrib)
+                    suite_nodes.append(container[key_])
+                continue
+
+            elements.pop()
+            parent = elements[-1] if elements else None
+            if parent is None:
+                continue
+            if element.tag == 'suite' and parent.tag in ('robot', 'suite'):
+                suite_nodes.pop()
+                parent.remove(element)
+            elif parent.tag == 'suite' and suite_nodes:
+                suite_node = suite_nodes[-1]
+                if element.tag == 'test':
+                    suite_node.tests[element.get('name')] = (
+                        self.__spool_element(element),
+                        element.find('status').get('status')
+                    )
+                elif element.tag == 'status':
+                    suite_node.update_status(element.attrib)
+                elif element.tag in _SUITE_ITEM_TAGS:
+                    kind = element.get('type', element.tag).lower()
+                    if kind == 'setup':
+                        suite_node.setup = self.__spool_element(element)
+                    elif kind == 'teardown':
+                        suite_node.teardown = self.__spool_element(element)
+                    elif (kind, element.get('name')) not in suite_node.items:
+                        suite_node.items[(kind, element.get('name'))] = \
+                            self.__spool_element(element)
+                parent.remove(element)
+            elif parent.tag == 'errors' and element.tag == 'msg':
+                self.errors.append(self.__spool_element(element))
+                parent.remove(element)
+
+    def __copy_reference(self, output, reference: tuple) -> None:
+        """Copy a spooled element to the output."""
+        offset, length = reference
+        self.spool.seek(offset)
+        output.write(self.spool.read(length))
+
+    def __write_suite(self, output, suite_node: _SuiteNode,
+                      suite_id: str) -> str:
+        """Write suite.
+
+        Returns
+        -------
+        str
+            Status of the suite.
+        """
+        attributes = {'id': suite_id}
+        attributes.update({key_: value_ for key_, value_
+                           in suite_node.attributes.items() if key_ != 'id'})
+        output.write(_start_tag('suite', attributes).encode() + b'\n')
+        if suite_node.setup:
+            self.__copy_reference(output, suite_node.setup)
+
+        statuses = []
+        for position, child in enumerate(suite_node.suites.values(), 1):
+            statuses.append(
+                self.__write_suite(output, child, f"{suite_id}-s{position}")
+            )
+        for reference, status in suite_node.tests.values():
+            self.__copy_reference(output, reference)
+            statuses.append(status)
+
+        if suite_node.teardown:
+            self.__copy_reference(output, suite_node.teardown)
+        for reference in suite_node.items.values():
+            self.__copy_reference(output, reference)
+
+        status = 'SKIP'
+        if 'FAIL' in statuses:
+            status = 'FAIL'
+        elif 'PASS' in statuses:
+            status = 'PASS'
+        suite_status = dict(suite_node.status)
+        suite_status['status'] = status
+        output.write(_start_tag('status', suite_status)[:-1].encode()
+                     + b'/>\n</suite>\n')
+        return status
+
+    def write(self, output_file: str, name: str = None) -> None:
+        """Write the merged output.
+
+        Parameters
+        ----------
+        output_file : str
+            Path to the merged output.
+        name : str
+            Name of the root suite when outputs are combined.
+
+        Returns
+        -------
+        None
+        """
+        root_suites = list(self.root.suites.values())
+        if len(root_suites) == 1 and self.merge:
+            root_node = root_suites[0]
+        else:
+            root_node = self.root
+            root_node.attributes = {
+                'name': name or ' & '.join(
+                    suite_.attributes.get('name') for suite_ in root_suites
+                )
+            }
+            for suite_ in root_suites:
+                root_node.update_status(suite_.status)
+
+        with open(output_file, 'wb') as output:
+            output.write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+            output.write(_start_tag('robot', self.robot_attributes).encode()
+                         + b'\n')
+            self.__write_suite(output, root_node, 's1')
+            output.write(b'<statistics>\n<total>\n</total>\n<tag>\n</tag>\n'
+                         b'<suite>\n</suite>\n</statistics>\n<errors>\n')
+            for reference in self.errors:
+                self.__copy_reference(output, reference)
+            output.write(b'</errors>\n</robot>\n')
+
+    def close(self) -> None:
+        self.spool.close()
+        remove(self.spool_file)
+
+
+def merge_outputs(output: str, *sources: str, merge: bool = False,
+                  name: str = None) -> str:
+    """Merge outputs.
+
+    Stream robot output files into one output file.
+
+    Parameters
+    ----------
+    output : str
+        Path to the merged output.
+    sources : str
+        Paths to the output files, in order. With merge, a test of a later
+        output replaces the test with the same long name of an earlier one.
+    merge : bool
+        True to merge re-executed outputs, False to combine the outputs under
+        a new root suite.
+    name : str
+        Name of the root suite when outputs are combined.
+
+    Returns
+    -------
+    str
+        Path to the merged output.
+    """
+    merger = _OutputMerger(f"{output}.spool", merge=merge)
+    try:
+        for index, source in enumerate(sources):
+            merger.read_source(index, source)
+        merger.write(output, name=name)
+    finally:
+        merger.close()
+    return output
@@ -25,17 +25,14 @@ This module handles call to other processes.
                 Push execution results to report sever.
 """
 
-from os import kill, environ, system, listdir, path, name, mkdir, remove
-
-if name == "posix":
-    from os import O_NONBLOCK
-    import fcntl
+from os import kill, environ, system, path, name, mkdir, makedirs, \
+    cpu_count
 
 from signal import SIGTERM
-from subprocess import Popen, PIPE, run
-from time import sleep
+from subprocess import Popen, PIPE
+from time import time
 from sys import stdout
-from shutil import copyfile, rmtree
+from shutil import rmtree
 from requests import request
 from requests.exceptions import ConnectionError, ConnectTimeout
 
@@ -45,6 +42,33 @@ from allure_robotframework import allure_robotframework
 from robot import run as robot_run, rebot
 from .internal_path import INTERNAL_PATH
 from .args_parser import ARGUMENTS
+from .output_merger import merge_outputs
+from .log_sink import get_log_sink
+from .event_log import EventLogListener, merge_test_index
+from .file_collector import collect_files
+from .wait_statistics import merge_wait_statistics
+from .command_latency import CommandLatencyListener, merge_command_latency
+from .log_follower import LogFollower, StreamFollower
+from .readiness import wait_for, is_process_exited, is_http_ready, \
+    is_android_boot_completed, get_free_port
+from .shard_executor import ShardTask, collect_shard_tasks, execute_shards
+from .shard_scheduler import TestDurationDatabase, order_longest_first, \
+    predict_makespan
+from .test_runs import get_run_module, get_run_browser
+
+# Maximum time in seconds to wait for the external processes to be ready.
+ALLURE_GENERATE_TIMEOUT = 600
+ALLURE_OPEN_TIMEOUT = 60
+APPIUM_START_TIMEOUT = 60
+EMULATOR_BOOT_TIMEOUT = 300
+
+APPIUM_STARTED_LOG = 'Appium REST http interface listener started'
+APPIUM_FAILED_LOG = 'Could not start REST http interface listener'
+EMULATOR_BOOTED_LOG = 'boot completed'
+
+# Modules whose tests share one device, a test is retried only once the run
+# that failed it is finished.
+SHARED_DEVICE_MODULES = ('mobile',)
 
 
 class AppiumProperties:
@@ -104,162 +128,267 @@ def check_appium_session(port: int) -> dict:
             'available_session': available_session}
 
 
-def print_progress_bar(wait_time: float, progress_status: str,
-                       done: bool = False) -> None:
-    """Print progress bar.
+class LogToConsoleAndFile:
+    """Log to console and file.
+
+    File-like object for robot stdout and stderr, it writes to the console
+    and to the execution.log of the test module. The log sink flushes the
+    file by itself on size and time, so flush() only flushes the console.
+    """
+
+    def __init__(self, test_module: str):
+        """Constructor."""
+        self.test_module = test_module
+        self.execution_log = get_log_sink(
+            INTERNAL_PATH.current_execution_log_dir.get(test_module)
+            + '/execution.log'
+        )
+
+    def flush(self):
+        stdout.flush()
+
+    def write(self, text):
+        self.execution_log.write(text)
+        stdout.write(text)
+
 
-    This function visible the progress on console.
+def _get_log_level(debug: bool) -> str:
+    """Get robot log level.
 
     Parameters
     ----------
-    wait_time : float
-        total time to wait.
-    progress_status : str
-        Status of the process.
-    done : bool
-        If done, progress bar shows 100%
+    debug : bool
+        True to debug.
+
+    Returns
+    -------
+    str
     """
+    if debug:
+        return "TRACE:TRACE"
+    return "INFO:INFO"
 
-    def progress_bar(count: int, total: float, status: str):
-        bar_len = 60
-        filled_len = int(round(bar_len * count / float(total)))
 
-        percents = round(100.0 * count / float(total), 1)
-        bar = '=' * filled_len + '-' * (bar_len - filled_len)
+def _run_robot_shard(test_module: str, execution_log_dir: str,
+                     appium_properties: dict, debug: bool,
+                     stop_on_failure: bool, worker_index: int,
+                     task: ShardTask, failure_listener: object) -> int:
+    """Run robot shard.
 
-        stdout.write('[%s] %s%s ...%s\r' % (bar, percents, '%', status))
-        stdout.flush()
+    Execute one shard of the test module in the current worker process.
 
-    increase = 0.01
-    total_progress = wait_time / increase
-    counter = 0
-    while counter < total_progress:
-        if done:
-            counter = total_progress
-        progress_bar(counter, total_progress, progress_status)
-        sleep(increase)  # emulating long-playing job
-        counter += 1
+    The tests of a browser run get the BROWSER variable and a browser:{name}
+    tag, and the root suite of a run of the browser matrix is named after
+    the browser, thus the runs stay apart in the combined reports.
+
+    Parameters
+    ----------
+    test_module : str
+        Test module: api, web, mobile, or run of the web module on one of
+        several browsers: web-chrome, web-brave
+    execution_log_dir : str
+        Log directory of the module in current execution.
+    appium_properties : dict
+        Attributes of APPIUM_PROPERTIES in the main process.
+    debug : bool
+        True to debug.
+    stop_on_failure : bool
+        Immediately stop the test script.
+    worker_index : int
+        Index of the worker process.
+    task : ShardTask
+        The shard to be executed.
+    failure_listener : object
+        Listener that reports failed tests to the retry engine.
+
+    Returns
+    -------
+    int
+        Return code of robot.
+    """
+    INTERNAL_PATH.current_execution_log_dir.update(
+        {test_module: execution_log_dir}
+    )
+    APPIUM_PROPERTIES.__dict__.update(appium_properties)
+    robot_report_dir = INTERNAL_PATH.current_robot_report_dir.get(test_module)
+    environ['ROBOT_SYSLOG_FILE'] = \
+        f'{robot_report_dir}/syslog-worker-{worker_index}.txt'
+    log_to_console_and_file = LogToConsoleAndFile(test_module)
+    shard_filter = {}
+    if task.suite:
+        shard_filter['suite'] = [task.suite]
+    if task.test:
+        shard_filter['test'] = [task.test_pattern]
+
+    listeners = [
+        allure_robotframework(
+            INTERNAL_PATH.current_allure_result_dir.get(test_module)
+        ), EventLogListener(test_module), failure_listener
+    ]
+    if ARGUMENTS.command_latency:
+        # Attaches the latencies before Allure closes the test.
+        listeners.insert(0, CommandLatencyListener(test_module))
+
+    run_options = {}
+    variables = [f"TEST_MODULE:{test_module}"]
+    browser = get_run_browser(test_module)
+    if browser:
+        variables.append(f"BROWSER:{browser}")
+        run_options['settag'] = [f"browser:{browser}"]
+    if test_module != get_run_module(test_module):
+        run_options['name'] = test_module.replace('-', ' ').title()
+
+    return robot_run(
+        INTERNAL_PATH.test_modules.get(get_run_module(test_module)),
+        loglevel=_get_log_level(debug), **shard_filter, **run_options,
+        listener=listeners, outputdir=robot_report_dir,
+        stdout=log_to_console_and_file, stderr=log_to_console_and_file,
+        exitonfailure=stop_on_failure, exitonerror=stop_on_failure,
+        log='NONE', report='NONE',
+        output=f'{robot_report_dir}/shards/output-{task.task_id}.xml',
+        consolecolors="on", variable=variables
+    )
 
 
 def execute_robot_test_cases(test_module: str, debug: bool = False,
                              retry_times: int = 1,
-                             stop_on_failure: bool = False) -> None:
+                             stop_on_failure: bool = False,
+                             shard_by: str = None,
+                             shard_workers: int = None,
+                             generate_html: bool = False) -> None:
     """Execute robot test cases.
 
-    This function call robot as sub-subprocess, execute robot test cases and
-    export log.
+    This function executes robot test cases in worker processes and export
+    log.
+
+    Every failed test is retried by an idle worker as soon as it fails, then
+    all outputs are merged once into the output.xml of the module. Without
+    shards and shard workers, the module runs in one worker and the failed
+    tests are retried after it. The tests of the modules that share a device
+    are retried only once the run that failed them is finished.
 
     Parameters
     ----------
     test_module : str
-        Test module: api, web, mobile
+        Test module: api, web, mobile, or run of the web module on one of
+        several browsers: web-chrome, web-brave
     debug : bool
         True to debug.
     retry_times : int
         The amount of times to retry test cases when they are failed.
     stop_on_failure : Immediately stop the test script.
+    shard_by : str
+        {suite, test} to split the module into shards that are executed in
+        worker processes, None to execute the module at once.
+    shard_workers : int
+        The amount of worker processes for shards and retries. None to use
+        the CPU count for shards, and one worker without shards.
+    generate_html : bool
+        True to generate robot log and report from the merged output.
 
     Returns
     -------
     None
     """
+    robot_report_dir = INTERNAL_PATH.current_robot_report_dir.get(test_module)
+    if not path.exists(f'{robot_report_dir}/shards'):
+        makedirs(f'{robot_report_dir}/shards')
+
+    retry_times = int(retry_times)
+    if debug or stop_on_failure:
+        retry_times = 0
+
+    tasks = [ShardTask(0)]
+    workers = 1
+    if retry_times > 0 and shard_workers:
+        workers = shard_workers
+
+    if shard_by:
+        # Schedule the longest shards first by using the previous durations
+        tasks = collect_shard_tasks(get_run_module(test_module), shard_by)
+        duration_db = TestDurationDatabase(test_module)
+        estimates = {
+            task.task_id: duration_db.estimate(task.suite, task.test)
+            for task in tasks
+        }
+        tasks = order_longest_first(tasks, estimates)
+        workers = min(shard_workers or cpu_count() or 1, max(len(tasks), 1))
+        predicted_makespan = predict_makespan(
+            [estimates.get(task.task_id) for task in tasks], workers
+        )
 
-    class LogToConsoleAndFile:
-        @staticmethod
-        def flush():
-            stdout.flush()
-            open(
-                INTERNAL_PATH.current_execution_log_dir.get(test_module)
-                + '/execution.log', 'a+'
-            ).flush()
-
-        @staticmethod
-        def write(text):
-            execution_log = open(
-                INTERNAL_PATH.current_execution_log_dir.get(test_module)
-                + '/execution.log', 'a+'
-            )
-            execution_log.write(text)
-            stdout.write(text)
-
-    log_level = "INFO:INFO"
-    if debug:
-        log_level = "TRACE:TRACE"
-
-    robot_run(
-        INTERNAL_PATH.test_modules.get(test_module), loglevel=log_level,
-        listener=allure_robotframework(
-            INTERNAL_PATH.current_allure_result_dir.get(test_module)
-        ), outputdir=INTERNAL_PATH.current_robot_report_dir.get(test_module),
-        stdout=LogToConsoleAndFile, stderr=LogToConsoleAndFile,
-        exitonfailure=stop_on_failure, exitonerror=stop_on_failure,
-        log=f'{INTERNAL_PATH.current_robot_log_file.get(test_module)}',
-        output=f'{INTERNAL_PATH.current_output_xml.get(test_module)}',
-        consolecolors="on", variable=[f"TEST_MODULE:{test_module}"]
-    )
-
-    if not debug and not stop_on_failure:
-        if retry_times > 0:
-            copyfile(
-                f'{INTERNAL_PATH.current_robot_report_dir.get(test_module)}'
-                f'/output.xml',
-                f'{INTERNAL_PATH.current_robot_report_dir.get(test_module)}'
-                f'/output-0.xml'
-            )
-        for i in range(retry_times):
-            robot_run(
-                INTERNAL_PATH.test_modules.get(test_module),
-                loglevel=log_level,
-                listener=
-                allure_robotframework(
-                    INTERNAL_PATH.current_allure_result_dir.get(test_module)),
-                outputdir=
-                INTERNAL_PATH.current_robot_report_dir.get(test_module),
-                stdout=LogToConsoleAndFile, stderr=LogToConsoleAndFile,
-                log=
-                f'{INTERNAL_PATH.current_robot_report_dir.get(test_module)}'
-                f'/log-rerun-{i + 1}.html',
-                rerunfailed=
-                f'{INTERNAL_PATH.current_robot_report_dir.get(test_module)}'
-                f'/output-{i}.xml',
-                output=
-                f'{INTERNAL_PATH.current_robot_report_dir.get(test_module)}'
-                f'/output-{i +  1}.xml',
-                consolecolors="on"
-            )
-
-    # Collect all output file after run
-    list_output_file = []
-    for file_ in listdir(
-            INTERNAL_PATH.current_robot_report_dir.get(test_module)):
-        if file_.startswith('output'):
-            list_output_file.append(
-                f'{INTERNAL_PATH.current_robot_report_dir.get(test_module)}'
-                f'/{file_}'
-            )
-
-    # Merge all the output
-    rebot(output=f'{INTERNAL_PATH.current_output_xml.get(test_module)}',
-          log=f'{INTERNAL_PATH.current_robot_report_dir.get(test_module)}'
-              f'/log-final.html',
-          report=
-          f'{INTERNAL_PATH.current_robot_report_dir.get(test_module)}'
-          f'/report-final.html',
-          merge=True, *list_output_file)
-
-    # Remove redundant output file
-    list_output_file.remove(
-        f'{INTERNAL_PATH.current_robot_report_dir.get(test_module)}'
-        f'/output.xml'
+    start_time = time()
+    results = execute_shards(
+        tasks, workers, _run_robot_shard, test_module,
+        INTERNAL_PATH.current_execution_log_dir.get(test_module),
+        vars(APPIUM_PROPERTIES), debug, stop_on_failure,
+        stop_on_failure=stop_on_failure, retry_times=retry_times,
+        defer_retries=get_run_module(test_module) in SHARED_DEVICE_MODULES
     )
-    [remove(file_) for file_ in list_output_file]
+    if shard_by:
+        print(f"Executed {len(tasks)} shards of {test_module} on {workers} "
+              f"workers. Predicted makespan: {predicted_makespan:.1f}s, "
+              f"actual makespan: {time() - start_time:.1f}s.")
+
+    # Merge first executions and retries at once, the latter results win
+    list_output_file = [
+        f'{robot_report_dir}/shards/output-{result.get("task").task_id}.xml'
+        for result in results
+    ]
+    list_output_file = [file_ for file_ in list_output_file
+                        if path.exists(file_)]
+    if list_output_file:
+        merge_outputs(INTERNAL_PATH.current_output_xml.get(test_module),
+                      *list_output_file, merge=True)
+    rmtree(f'{robot_report_dir}/shards')
+
+    if generate_html and list_output_file:
+        rebot(INTERNAL_PATH.current_output_xml.get(test_module),
+              output='NONE', log=f'{robot_report_dir}/log-final.html',
+              report=f'{robot_report_dir}/report-final.html')
+
+    merge_test_index(INTERNAL_PATH.current_execution_log_dir.get(test_module))
+
+    wait_statistics = merge_wait_statistics(robot_report_dir)
+    if wait_statistics:
+        print(f"Time in explicit waits of {test_module}: "
+              f"{wait_statistics.get('total'):.1f}s. Longest waits:")
+        for wait_ in wait_statistics.get('locators')[:5]:
+            print(f"    {wait_.get('total'):.1f}s in {wait_.get('count')} "
+                  f"waits ({wait_.get('timeouts')} timeouts) for "
+                  f"{wait_.get('condition')} of {wait_.get('locator')}")
+
+    command_latency = merge_command_latency(robot_report_dir)
+    if command_latency:
+        print(f"WebDriver command latency of {test_module}, slowest "
+              f"commands:")
+        for command_, latency_ in \
+                list(command_latency.get('commands').items())[:5]:
+            print(f"    {command_}: {latency_.get('count')} commands, "
+                  f"{latency_.get('total_ms') / 1000:.1f}s, "
+                  f"p50 {latency_.get('p50_ms')}ms, "
+                  f"p95 {latency_.get('p95_ms')}ms, "
+                  f"p99 {latency_.get('p99_ms')}ms")
+
+    # Feed durations of the merged output to the scheduler history
+    if path.exists(INTERNAL_PATH.current_output_xml.get(test_module)):
+        duration_db = TestDurationDatabase(test_module)
+        duration_db.update_from_output(
+            INTERNAL_PATH.current_output_xml.get(test_module)
+        )
+        duration_db.save()
 
 
-def create_latest_combined_log() -> None:
+def create_latest_combined_log(generate_html: bool = False) -> None:
     """Create latest combined log.
 
     Combine all output.xml from all current execution suite in to one xml.
 
+    Parameters
+    ----------
+    generate_html : bool
+        True to generate robot log, report and xunit from the combined output.
+
     Returns
     -------
     None
@@ -272,41 +401,26 @@ def create_latest_combined_log() -> None:
         rmtree(f"{INTERNAL_PATH.latest_combined_log}/robot")
 
     mkdir(f"{INTERNAL_PATH.latest_combined_log}/robot")
-    rebot(output=f'{INTERNAL_PATH.latest_combined_log}/robot/output.xml',
-          log=f'{INTERNAL_PATH.latest_combined_log}/robot/log.html',
-          report=f'{INTERNAL_PATH.latest_combined_log}/robot/report.html',
-          xunit=f'{INTERNAL_PATH.latest_combined_log}/robot/report.xml',
-          *INTERNAL_PATH.current_output_xml.values())
+    list_output_file = [file_ for file_
+                        in INTERNAL_PATH.current_output_xml.values()
+                        if path.exists(file_)]
+    if list_output_file:
+        merge_outputs(f'{INTERNAL_PATH.latest_combined_log}/robot/output.xml',
+                      *list_output_file)
+    if generate_html and list_output_file:
+        rebot(f'{INTERNAL_PATH.latest_combined_log}/robot/output.xml',
+              output='NONE',
+              log=f'{INTERNAL_PATH.latest_combined_log}/robot/log.html',
+              report=f'{INTERNAL_PATH.latest_combined_log}/robot/report.html',
+              xunit=f'{INTERNAL_PATH.latest_combined_log}/robot/report.xml')
     collect_current_allure_result_and_generate_report()
 
 
-def _get_all_result_files_in_current_execution() -> tuple:
-    """Get all result files in current execution.
-
-    This function gets all files name and their absolute path of Allure result
-    in current execution time.
-
-    Returns
-    -------
-    tuple
-        (result_files - list of absolute path to files,
-         files - list name of files)
-    """
-    result_dir = INTERNAL_PATH.current_allure_result_dir.values()
-
-    result_files = list()
-    files = list()
-    for directory in result_dir:
-        files += [file for file in listdir(directory)]
-        result_files += [f'{directory}/{file}' for file in listdir(directory)]
-    return result_files, files
-
-
 def collect_current_allure_result_and_generate_report() -> None:
     """Collect current Allure result and generate report.
 
-    Collect all the Allure result, copy it to temp folder and then generate
-    Allure report.
+    Collect all the Allure result to temp folder, by hardlink, reflink or
+    parallel copy, and then generate Allure report.
 
     Returns
     -------
@@ -323,21 +437,24 @@ def collect_current_allure_result_and_generate_report() -> None:
     if path.exists(temp_allure_result):
         rmtree(temp_allure_result)
 
-    result_files, files = _get_all_result_files_in_current_execution()
-    mkdir(temp_allure_result)
-
-    for full_path, file_name in zip(result_files, files):
-        copyfile(full_path, f"{temp_allure_result}/{file_name}")
+    collect_files(
+        [directory for directory
+         in INTERNAL_PATH.current_allure_result_dir.values()
+         if path.isdir(directory)],
+        temp_allure_result
+    )
 
     allure_local_generating = Popen(
         [INTERNAL_PATH.allure_bin, 'generate', temp_allure_result,
          '--output', temp_allure_report, '--clean'],
         env=environ
     )
-    print_progress_bar(
-        wait_time=3,
-        progress_status=f"Generating Allure local report."
-    )
+    if not wait_for(is_process_exited(allure_local_generating),
+                    timeout=ALLURE_GENERATE_TIMEOUT,
+                    progress_status="Generating Allure local report."):
+        allure_local_generating.terminate()
+        print("Could not generate Allure local report in "
+              f"{ALLURE_GENERATE_TIMEOUT} seconds.")
     allure_local_generating.wait()
 
 
@@ -352,15 +469,21 @@ def run_allure_report_server() -> Popen:
         allure session
     """
     temp_allure_report = f"{INTERNAL_PATH.latest_combined_log}/allure/report"
+    allure_port = get_free_port()
 
     allure_local_session = \
         Popen(
-            [INTERNAL_PATH.allure_bin, 'open', temp_allure_report], env=environ
+            [INTERNAL_PATH.allure_bin, 'open', temp_allure_report,
+             '--port', str(allure_port)], env=environ
         )
-    print_progress_bar(
-        wait_time=2,
-        progress_status=f"Starting Allure local report."
-    )
+    is_allure_ready = is_http_ready(f'http://127.0.0.1:{allure_port}')
+    if not wait_for(lambda: is_allure_ready()
+                    or allure_local_session.poll() is not None,
+                    timeout=ALLURE_OPEN_TIMEOUT,
+                    progress_status=f"Starting Allure local report on port "
+                                    f"{allure_port}."):
+        print(f"Allure local report is not ready in {ALLURE_OPEN_TIMEOUT} "
+              f"seconds.")
     return allure_local_session
 
 
@@ -401,6 +524,9 @@ def run_appium_server(test_module: str) -> tuple:
         f'/appium-{APPIUM_PROPERTIES.port}.log'
     appium_log = open(appium_log_file, 'a')
     appium_log.flush()
+    # Follow only the lines of this session, the log file is shared by the
+    # Appium sessions of the same port.
+    appium_log_follower = LogFollower(appium_log_file, from_start=False)
     appium_command = ['appium']
     if name == "nt":
         appium_command = ['appium.cmd']
@@ -409,16 +535,25 @@ def run_appium_server(test_module: str) -> tuple:
                             '--allow-insecure', 'chromedriver_autodownload'],
                            stdout=appium_log, stderr=appium_log, env=environ)
 
-    print_progress_bar(
-        wait_time=3,
-        progress_status=f"Starting Appium server on port "
-                        f"{APPIUM_PROPERTIES.port}."
-    )
-    while True:
-        if 'Appium REST http interface listener started' in \
-                open(appium_log_file).read():
-            break
-        sleep(1)
+    matched_log = []
+
+    def is_appium_started_or_failed() -> bool:
+        pattern = appium_log_follower.match((APPIUM_STARTED_LOG,
+                                             APPIUM_FAILED_LOG))
+        if pattern:
+            matched_log.append(pattern)
+        return bool(pattern) or appium_session.poll() is not None
+
+    with appium_log_follower:
+        wait_for(is_appium_started_or_failed, timeout=APPIUM_START_TIMEOUT,
+                 interval=0.05,
+                 progress_status=f"Starting Appium server on port "
+                                 f"{APPIUM_PROPERTIES.port}.")
+    if APPIUM_STARTED_LOG not in matched_log \
+            or appium_session.poll() is not None:
+        appium_session.terminate()
+        raise Exception(f"Could not start Appium server on port "
+                        f"{APPIUM_PROPERTIES.port}, see {appium_log_file}")
     return appium_session, appium_log
 
 
@@ -439,7 +574,6 @@ def get_attached_android_devices() -> list:
     if name == 'posix':  # For MacOS user
         splitter = '\n'
         is_shell = False
-    run(command)
     c = Popen(command, shell=is_shell, stdout=PIPE, stderr=PIPE)
     standard_out, _ = c.communicate()
     output = standard_out.decode().strip().split(splitter)
@@ -553,34 +687,37 @@ def run_android_emulator(**kwargs) -> Union[Popen, None]:
     # if not debug:
     #     command += ['-noaudio', '-no-boot-anim', '-no-window']
     emulator_session = Popen(command, stdout=PIPE)
-    print_progress_bar(
-        wait_time=10,
-        progress_status=f"Starting emulator {emulator_name}."
+    emulator_follower = StreamFollower(emulator_session.stdout,
+                                       patterns=[EMULATOR_BOOTED_LOG],
+                                       ignore_case=True)
+
+    emulator_udid = {}
+
+    def is_emulator_booted() -> bool:
+        """The emulator logs its boot, or adb tells it once it is attached:
+        some builds do not log the boot line."""
+        if emulator_follower.is_matched:
+            return True
+        if emulator_name not in emulator_udid:
+            attached_devices_ = get_attached_android_devices()
+            emulator_udid.update(zip(
+                get_emulators_real_name(attached_devices_), attached_devices_
+            ))
+        return emulator_name in emulator_udid and \
+            is_android_boot_completed(emulator_udid.get(emulator_name))()
+
+    is_booted = wait_for(
+        is_emulator_booted, timeout=EMULATOR_BOOT_TIMEOUT, interval=1,
+        progress_status=f"Booting emulator {emulator_name}."
     )
-    timeout = 10
-    while True:
-        if name == "posix":  # For MacOS 12
-            fd = emulator_session.stdout.fileno()
-            fl = fcntl.fcntl(fd, fcntl.F_GETFL)
-            fcntl.fcntl(fd, fcntl.F_SETFL, fl | O_NONBLOCK)
-        line = emulator_session.stdout.readline()
-        line_in_string = line.rstrip().decode('utf-8')
-        print(line_in_string)
-        if "emulator: INFO: boot completed" in line_in_string:
-            break
-        if not line_in_string:
-            break
-        if timeout <= 0:
-            break
-        sleep(1)
-        timeout += -1
-    attached_devices = get_attached_android_devices()
-    emulators_real_name = get_emulators_real_name(attached_devices)
-    emulator_udid = {
-        name_: id_ for name_, id_ in zip(emulators_real_name, attached_devices)
-    }
+    if emulator_name not in emulator_udid:
+        attached_devices = get_attached_android_devices()
+        emulator_udid.update(zip(get_emulators_real_name(attached_devices),
+                                 attached_devices))
+    if not is_booted:
+        print(f"The emulator {emulator_name} is not booted in "
+              f"{EMULATOR_BOOT_TIMEOUT} seconds.")
     APPIUM_PROPERTIES.mobile_udid = emulator_udid.get(emulator_name)
-    print("exit")
     return emulator_session
 
 
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module waits for external processes to be ready.
+
+Instead of sleeping for a fixed time, the caller waits for a readiness
+signal: the exit of a process, the answer of an HTTP server, a line of a log
+file or a property of an Android device. The elapsed time is displayed by a
+background thread, thus the display never delays the caller.
+
+    Functions in this module:
+
+        +   wait_for(predicate: Callable[[], bool], timeout: float,
+                     progress_status: str, interval: float = 0.2) -> bool
+                Wait until the predicate is true or the timeout is over.
+
+        +   is_process_exited(process: Popen) -> Callable[[], bool]
+                Readiness signal of the exit of a process.
+
+        +   is_http_ready(url: str) -> Callable[[], bool]
+                Readiness signal of an HTTP server.
+
+        +   is_android_boot_completed(udid: str) -> Callable[[], bool]
+                Readiness signal of the boot of an Android device.
+
+        +   get_free_port() -> int
+                Get a free TCP port of the local machine.
+"""
+
+from socket import socket
+from subprocess import Popen, run, PIPE, TimeoutExpired
+from sys import stdout
+from threading import Thread, Event
+from time import monotonic, sleep
+from typing import Callable
+
+from requests import request
+from requests.exceptions import RequestException
+
+
+class ProgressIndicator:
+    """Progress indicator.
+
+    Display the elapsed time of a waiting step in a background thread.
+
+    Attributes
+    ----------
+    progress_status : str
+        Status of the waiting step.
+    timeout : float
+        Timeout of the waiting step in seconds.
+    """
+
+    REFRESH_INTERVAL = 0.1
+
+    def __init__(self, progress_status: str, timeout: float):
+        """Constructor."""
+        self.progress_status = progress_status
+        self.timeout = timeout
+        self.__started = monotonic()
+        self.__stop_event = Event()
+        self.__thread = Thread(target=self.__display, daemon=True,
+                               name='progress-indicator')
+
+    def __display(self) -> None:
+        while not self.__stop_event.wait(self.REFRESH_INTERVAL):
+            self.__write('...')
+
+    def __write(self, state: str, end: str = '\r') -> None:
+        stdout.write(f'[{monotonic() - self.__started:6.1f}s/'
+                     f'{self.timeout:.0f}s] {state} {self.progress_status}'
+                     f'{end}')
+        stdout.flush()
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self, ready: bool) -> None:
+        self.__stop_event.set()
+        self.__thread.join()
+        self.__write('Ready:' if ready else 'Timeout:', end='\n')
+
+
+def wait_for(predicate: Callable[[], bool], timeout: float,
+             progress_status: str, interval: float = 0.2) -> bool:
+    """Wait for.
+
+    Poll the readiness signal until it is true or the timeout is over.
+
+    Parameters
+    ----------
+    predicate : Callable
+        Readiness signal, returns True when ready.
+    timeout : float
+        Maximum time to wait in seconds.
+    progress_status : str
+        Status of the waiting step to be displayed.
+    interval : float
+        Time between two polls in seconds.
+
+    Returns
+    -------
+    bool
+        True if ready, False if the timeout is over.
+    """
+    progress_indicator = ProgressIndicator(progress_status, timeout)
+    progress_indicator.start()
+    deadline = monotonic() + timeout
+    ready = False
+    try:
+        while True:
+            ready = bool(predicate())
+            if ready or monotonic() >= deadline:
+                break
+            sleep(min(interval, max(deadline - monotonic(), 0)))
+    finally:
+        progress_indicator.stop(ready)
+    return ready
+
+
+def is_process_exited(process: Popen) -> Callable[[], bool]:
+    """Readiness signal of the exit of a process."""
+    return lambda: process.poll() is not None
+
+
+def is_http_ready(url: str) -> Callable[[], bool]:
+    """Readiness signal of an HTTP server, which is ready once it answers
+    without a server error."""
+
+    def probe() -> bool:
+        try:
+            return request(method='GET', url=url, timeout=1).status_code < 500
+        except RequestException:
+            return False
+
+    return probe
+
+
+def is_android_boot_completed(udid: str) -> Callable[[], bool]:
+    """Readiness signal of the boot of an Android device, from the adb
+    property sys.boot_completed."""
+
+    def probe() -> bool:
+        try:
+            completed = run(['adb', '-s', udid, 'shell', 'getprop',
+                             'sys.boot_completed'],
+                            stdout=PIPE, stderr=PIPE, timeout=5)
+        except (OSError, TimeoutExpired):
+            return False
+        return completed.stdout.decode().strip() == '1'
+
+    return probe
+
+
+def get_free_port() -> int:
+    """Get free port.
+
+    Returns
+    -------
+    int
+        A TCP port of the local machine that is not in use.
+    """
+    with socket() as socket_:
+        socket_.bind(('127.0.0.1', 0))
+        return socket_.getsockname()[1]
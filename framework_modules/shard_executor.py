@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module splits a test module into shards and executes them in a pool of
+worker processes.
+
+    Functions in this module:
+
+        +   collect_shard_tasks(test_module: str, shard_by: str) -> list
+                Split a test module into suite or test shards.
+
+        +   execute_shards(tasks: list, workers: int, run_shard: callable,
+                           *args, stop_on_failure: bool = False,
+                           retry_times: int = 0,
+                           defer_retries: bool = False) -> list
+                Execute shards in worker processes and retry failed tests.
+"""
+
+from multiprocessing import Array, Event, Process, Queue
+from os import cpu_count
+from queue import Empty
+from pathlib import Path
+from re import sub
+from time import time
+
+from robot.api import TestSuiteBuilder
+
+from .internal_path import INTERNAL_PATH
+
+
+SHARD_BY_SUITE = "suite"
+SHARD_BY_TEST = "test"
+
+# Interval in seconds to check that the workers are alive while no result
+# arrives.
+WORKER_CHECK_INTERVAL = 5
+
+
+class ShardTask:
+    """Shard task.
+
+    A shard is the whole test module, one suite of it, or one test of a
+    suite. Robot selects it via the `suite` and `test` options when running
+    the whole module directory, so every shard output has the same root suite
+    and can be merged.
+
+    Attributes
+    ----------
+    task_id : int
+        Identifier of the task, also used for naming its output file.
+    suite : str
+        Name of the suite file without extension, None to run the whole
+        module.
+    test : str
+        Name of the test case, None to run the whole suite.
+    attempt : int
+        0 for the first execution, n for the n-th retry.
+    """
+
+    def __init__(self, task_id: int, suite: str = None, test: str = None,
+                 attempt: int = 0):
+        """Constructor."""
+        self.task_id = task_id
+        self.suite = suite
+        self.test = test
+        self.attempt = attempt
+
+    @property
+    def name(self) -> str:
+        if self.test:
+            return f"{self.suite}.{self.test}"
+        return self.suite or "all"
+
+    @property
+    def test_pattern(self) -> str:
+        """Get test pattern.
+
+        Robot treats `*`, `?` and `[` as wildcards in the `test` option, they
+        are escaped to match the test name literally.
+
+        Returns
+        -------
+        str
+        """
+        if not self.test:
+            return None
+        return sub(r'([*?\[])', r'[\1]', self.test)
+
+
+def collect_shard_tasks(test_module: str, shard_by: str) -> list:
+    """Collect shard tasks.
+
+    Split the test module into suites, or into individual tests of every
+    suite.
+
+    Parameters
+    ----------
+    test_module : str
+        Test module: api, web, mobile
+    shard_by : str
+        {suite, test}
+
+    Returns
+    -------
+    list
+        List of ShardTask.
+    """
+    suite_files = {
+        suite_name: suite_file for suite_name, suite_file
+        in INTERNAL_PATH.test_suites_of_module(test_module).items()
+        if suite_file.endswith(".robot") and suite_name != "__init__"
+    }
+    tasks = []
+    for suite_name, suite_file in sorted(suite_files.items()):
+        if shard_by != SHARD_BY_TEST:
+            tasks.append(ShardTask(len(tasks), suite_name))
+            continue
+        suite = TestSuiteBuilder().build(suite_file)
+        for test in suite.tests:
+            tasks.append(ShardTask(len(tasks), suite_name, test.name))
+    return tasks
+
+
+class _FailureListener:
+    """Failure listener.
+
+    Robot listener that reports every failed test of a shard to the main
+    process as soon as the test ends, so it can be retried by another worker
+    while the shard is still running.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, result_queue: Queue, task: ShardTask):
+        """Constructor."""
+        self.result_queue = result_queue
+        self.task = task
+
+    def end_test(self, name: str, attributes: dict) -> None:
+        if attributes.get('status') != 'FAIL':
+            return
+        source = attributes.get('source')
+        suite = Path(source).stem if source \
+            else attributes.get('longname').split('.')[-2]
+        self.result_queue.put({'type': 'failure', 'task': self.task,
+                               'suite': suite, 'test': name})
+
+
+def _shard_worker(worker_index: int, task_queue: Queue, result_queue: Queue,
+                  stop_event: Event, current_tasks: Array,
+                  run_shard: callable, *args) -> None:
+    """Shard worker.
+
+    Pull tasks from the queue until the sentinel None arrives.
+
+    Parameters
+    ----------
+    worker_index : int
+        Index of the worker.
+    task_queue : Queue
+        Queue of ShardTask.
+    result_queue : Queue
+        Queue to put the failed tests and the result of every task.
+    stop_event : Event
+        Once it is set, the remaining tasks are skipped.
+    current_tasks : Array
+        Id of the task that every worker runs, -1 when it is idle. It is
+        shared memory, thus it is up to date even if the worker dies.
+    run_shard : callable
+        Function that executes one task:
+        run_shard(*args, worker_index, task, listener) and returns the return
+        code of robot. The listener must be registered to robot.
+
+    Returns
+    -------
+    None
+    """
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        current_tasks[worker_index] = task.task_id
+        if stop_event.is_set():
+            result_queue.put({'type': 'done', 'task': task,
+                              'return_code': None, 'elapsed': 0.0,
+                              'worker': worker_index})
+            current_tasks[worker_index] = -1
+            continue
+        start = time()
+        try:
+            return_code = run_shard(*args, worker_index, task,
+                                    _FailureListener(result_queue, task))
+        except Exception as error:
+            print(f"Shard {task.name} could not be executed. {error}")
+            return_code = None
+        result_queue.put({'type': 'done', 'task': task,
+                          'return_code': return_code,
+                          'elapsed': time() - start, 'worker': worker_index})
+        current_tasks[worker_index] = -1
+
+
+def execute_shards(tasks: list, workers: int, run_shard: callable, *args,
+                   stop_on_failure: bool = False, retry_times: int = 0,
+                   defer_retries: bool = False) -> list:
+    """Execute shards.
+
+    Start the worker processes, every worker pulls the next task from a
+    shared queue as soon as it finishes the previous one.
+
+    Every failed test is queued again as a single-test shard as soon as it
+    fails, until it passes or has been retried retry_times times. Retries are
+    pulled by idle workers while the other shards are still running.
+
+    A worker that dies while running a task (crash, out of memory) is
+    replaced, and its task gets a failed result with the return code and
+    elapsed time None.
+
+    Parameters
+    ----------
+    tasks : list
+        List of ShardTask.
+    workers : int
+        The amount of worker processes, None to use the CPU count.
+    run_shard : callable
+        Module-level function that executes one task.
+    args
+        Arguments to be passed to run_shard before worker index, task and
+        listener.
+    stop_on_failure : bool
+        Skip the remaining tasks after a task fails.
+    retry_times : int
+        The amount of times to retry a failed test.
+    defer_retries : bool
+        Queue the retries of a task only once the task is finished, for the
+        modules whose tests share one device.
+
+    Returns
+    -------
+    list
+        Result of every task, ordered by attempt then task id:
+            {"task": , "return_code": , "elapsed": , "worker": }
+    """
+    if not tasks:
+        return []
+    workers = max(1, workers or cpu_count() or 1)
+    if not retry_times:
+        workers = min(workers, len(tasks))
+    task_queue = Queue()
+    result_queue = Queue()
+    stop_event = Event()
+    current_tasks = Array('i', [-1] * workers, lock=False)
+
+    # Tasks that have no result yet, by task id
+    pending_tasks = {}
+    for task in tasks:
+        task_queue.put(task)
+        pending_tasks[task.task_id] = task
+    next_task_id = max(task.task_id for task in tasks) + 1
+
+    def start_worker(worker_index: int) -> Process:
+        process = Process(target=_shard_worker,
+                          args=(worker_index, task_queue, result_queue,
+                                stop_event, current_tasks, run_shard, *args))
+        process.start()
+        return process
+
+    processes = [start_worker(worker_index)
+                 for worker_index in range(workers)]
+
+    results = []
+    # Retries held until their task is finished, by task id
+    deferred_retries = {}
+    while pending_tasks:
+        try:
+            messages = [result_queue.get(timeout=WORKER_CHECK_INTERVAL)]
+        except Empty:
+            # A worker that died lost its task, which is recorded as failed
+            messages = []
+            for worker_index, process in enumerate(processes):
+                if process.is_alive():
+                    continue
+                task = pending_tasks.get(current_tasks[worker_index])
+                if task:
+                    print(f"Shard worker {worker_index} exited with code "
+                          f"{process.exitcode} while running {task.name}.")
+                    messages.append({'type': 'done', 'task': task,
+                                     'return_code': None, 'elapsed': None,
+                                     'worker': worker_index})
+                current_tasks[worker_index] = -1
+                processes[worker_index] = start_worker(worker_index)
+        for result in messages:
+            task = result.get('task')
+            if result.get('type') == 'failure':
+                if task.attempt < retry_times and not stop_event.is_set():
+                    retry = ShardTask(next_task_id, result.get('suite'),
+                                      result.get('test'), task.attempt + 1)
+                    pending_tasks[retry.task_id] = retry
+                    if defer_retries:
+                        deferred_retries.setdefault(task.task_id, []) \
+                            .append(retry)
+                    else:
+                        task_queue.put(retry)
+                    next_task_id += 1
+                continue
+            if pending_tasks.pop(task.task_id, None) is None:
+                # Already recorded as lost
+                continue
+            for retry in deferred_retries.pop(task.task_id, []):
+                task_queue.put(retry)
+            if stop_on_failure and result.get('return_code') != 0:
+                stop_event.set()
+            results.append(result)
+
+    for _ in processes:
+        task_queue.put(None)
+    for process in processes:
+        process.join()
+    results.sort(key=lambda result_: (result_.get('task').attempt,
+                                      result_.get('task').task_id))
+    return results
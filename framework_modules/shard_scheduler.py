@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module schedules shards by using the durations of previous executions.
+
+    Functions in this module:
+
+        +   order_longest_first(tasks: list, estimates: dict) -> list
+                Order shards longest-processing-time-first.
+
+        +   predict_makespan(durations: list, workers: int) -> float
+                Predict the makespan of shards on the workers.
+"""
+
+from heapq import heapify, heapreplace
+from json import dump, load
+from os import getpid, makedirs, path, replace
+from pathlib import Path
+from statistics import median
+
+from robot.api import ExecutionResult
+
+from .internal_path import INTERNAL_PATH
+
+
+# Estimated duration in seconds of a shard without any history.
+DEFAULT_ESTIMATE = 60.0
+# Weight of the latest duration in the moving average.
+SMOOTHING_FACTOR = 0.5
+
+
+def _get_suite_tests(suite) -> list:
+    """Get the tests of a suite and of its child suites."""
+    tests = list(suite.tests)
+    for child_suite in suite.suites:
+        tests += _get_suite_tests(child_suite)
+    return tests
+
+
+class TestDurationDatabase:
+    """Test duration database.
+
+    This class persists the durations of every suite and test of one module
+    under INTERNAL_PATH.test_duration_dir, one JSON file per module:
+        {
+            "suites": {<suite>: {"duration": , "runs": }},
+            "tests": {<suite>.<test>: {"duration": , "runs": }}
+        }
+
+    Attributes
+    ----------
+    test_module : str
+        Test module: api, web, mobile
+    durations : dict
+        Content of the database.
+    """
+
+    def __init__(self, test_module: str):
+        """Constructor."""
+        self.test_module = test_module
+        self.__file = f"{INTERNAL_PATH.test_duration_dir}/{test_module}.json"
+        self.durations = {'suites': {}, 'tests': {}}
+        if path.exists(self.__file):
+            try:
+                with open(self.__file) as duration_file:
+                    self.durations.update(load(duration_file))
+            except ValueError:
+                pass
+
+    def __record(self, kind: str, key: str, duration: float) -> None:
+        """Record a duration as moving average.
+
+        Parameters
+        ----------
+        kind : str
+            {suites, tests}
+        key : str
+            Name of the suite or test.
+        duration : float
+            Duration in seconds.
+
+        Returns
+        -------
+        None
+        """
+        record = self.durations[kind].get(key)
+        if not record:
+            self.durations[kind][key] = {'duration': duration, 'runs': 1}
+            return
+        record['duration'] = SMOOTHING_FACTOR * duration \
+            + (1 - SMOOTHING_FACTOR) * record.get('duration')
+        record['runs'] += 1
+
+    def update_from_output(self, output_xml: str) -> None:
+        """Update the database from a merged output.xml.
+
+        Parameters
+        ----------
+        output_xml : str
+            Path to the output.xml of the module.
+
+        Returns
+        -------
+        None
+        """
+        result = ExecutionResult(output_xml, include_keywords=False)
+        suites = result.suite.suites or [result.suite]
+        for suite in suites:
+            suite_name = Path(suite.source).stem if suite.source \
+                else suite.name
+            self.__record('suites', suite_name, suite.elapsedtime / 1000)
+            for test in _get_suite_tests(suite):
+                self.__record('tests', f"{suite_name}.{test.name}",
+                              test.elapsedtime / 1000)
+
+    def save(self) -> None:
+        """Save the database atomically.
+
+        Returns
+        -------
+        None
+        """
+        makedirs(INTERNAL_PATH.test_duration_dir, exist_ok=True)
+        temp_file = f"{self.__file}.{getpid()}.tmp"
+        with open(temp_file, 'w') as duration_file:
+            dump(self.durations, duration_file, indent=4, sort_keys=True)
+        replace(temp_file, self.__file)
+
+    def estimate(self, suite: str, test: str = None) -> float:
+        """Estimate duration of a suite or test.
+
+        A suite or test without history is estimated by the median of the
+        known durations of the same kind, or by DEFAULT_ESTIMATE.
+
+        Parameters
+        ----------
+        suite : str
+            Name of the suite.
+        test : str
+            Name of the test, None for the whole suite.
+
+        Returns
+        -------
+        float
+            Duration in seconds.
+        """
+        kind, key = ('tests', f"{suite}.{test}") if test \
+            else ('suites', suite)
+        record = self.durations[kind].get(key)
+        if record:
+            return record.get('duration')
+        known_durations = [record_.get('duration')
+                           for record_ in self.durations[kind].values()]
+        if known_durations:
+            return median(known_durations)
+        return DEFAULT_ESTIMATE
+
+
+def order_longest_first(tasks: list, estimates: dict) -> list:
+    """Order shards longest-processing-time-first.
+
+    The workers pull shards from the queue in order, so the longest shards
+    start first and the short ones fill the gaps at the end.
+
+    Parameters
+    ----------
+    tasks : list
+        List of ShardTask.
+    estimates : dict
+        {task_id: estimated duration in seconds}
+
+    Returns
+    -------
+    list
+    """
+    return sorted(tasks, key=lambda task_: estimates.get(task_.task_id),
+                  reverse=True)
+
+
+def predict_makespan(durations: list, workers: int) -> float:
+    """Predict makespan.
+
+    Simulate the workers pulling the durations from the queue in order.
+
+    Parameters
+    ----------
+    durations : list
+        Durations in seconds, in queue order.
+    workers : int
+        The amount of workers.
+
+    Returns
+    -------
+    float
+        Predicted wall-clock time in seconds.
+    """
+    if not durations:
+        return 0.0
+    finish_times = [0.0] * max(1, min(workers, len(durations)))
+    heapify(finish_times)
+    for duration in durations:
+        heapreplace(finish_times, finish_times[0] + duration)
+    return max(finish_times)
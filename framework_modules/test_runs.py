@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module maps the test modules to their runs.
+
+A run is one execution of a test module. The web module runs once per browser
+of the --browser flag. With several browsers, every run is named
+{module}-{browser} and has its own log directories:
+    logs/{date}/web-chrome/{time}, logs/{date}/web-brave/{time}
+The other modules, and the web module with one browser, run once under the
+name of the module.
+
+    Functions in this module:
+
+        +   get_test_runs(test_modules: list) -> list
+                Get the runs of the test modules.
+
+        +   get_run_module(run_name: str) -> str
+                Get the test module of a run.
+
+        +   get_run_browser(run_name: str) -> str
+                Get the browser of a run.
+"""
+
+from .args_parser import ARGUMENTS
+
+
+# Test modules that run once per browser.
+BROWSER_MODULES = ('web',)
+
+
+def _get_browsers() -> list:
+    """Get the browsers of the --browser flag, without duplicates."""
+    browsers = [browser_.lower() for browser_ in ARGUMENTS.browser]
+    return sorted(set(browsers), key=browsers.index)
+
+
+def get_test_runs(test_modules: list) -> list:
+    """Get test runs.
+
+    Parameters
+    ----------
+    test_modules : list
+        Test modules to be executed.
+
+    Returns
+    -------
+    list
+        Names of the runs.
+    """
+    browsers = _get_browsers()
+    runs = []
+    for test_module in test_modules:
+        if test_module in BROWSER_MODULES and len(browsers) > 1:
+            runs += [f'{test_module}-{browser_}' for browser_ in browsers]
+        else:
+            runs.append(test_module)
+    return runs
+
+
+def get_run_module(run_name: str) -> str:
+    """Get run module.
+
+    Parameters
+    ----------
+    run_name : str
+
+    Returns
+    -------
+    str
+        Test module: api, web, mobile
+    """
+    return run_name.split('-', 1)[0]
+
+
+def get_run_browser(run_name: str) -> str:
+    """Get run browser.
+
+    Parameters
+    ----------
+    run_name : str
+
+    Returns
+    -------
+    str
+        Browser of the run, None if the module does not run in a browser.
+    """
+    if get_run_module(run_name) not in BROWSER_MODULES:
+        return None
+    if '-' in run_name:
+        return run_name.split('-', 1)[1]
+    return _get_browsers()[0]
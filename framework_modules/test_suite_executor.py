@@ -5,6 +5,7 @@
 This module handles test cases execution.
 """
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from shutil import copyfile
 
 from .args_parser import ARGUMENTS
@@ -14,6 +15,116 @@ from .process_executor import run_android_emulator, run_appium_server, \
     execute_robot_test_cases, create_latest_combined_log, \
     run_allure_report_server
 from .env_vars_setup import set_robot_syslog_file_env_var
+from .log_sink import close_log_sinks
+from .log_retention import start_log_retention
+from .test_runs import get_test_runs, get_run_module
+
+
+def _execute_test_module(test_module: str,
+                         execution_log_dir: str = None) -> str:
+    """Execute test module.
+
+    This function runs every test case of one module, including starting and
+    stopping the emulator and Appium server that the mobile module needs.
+
+    Parameters
+    ----------
+    test_module : str
+        Test module: api, web, mobile, or run of the web module on one of
+        several browsers: web-chrome, web-brave
+    execution_log_dir : str
+        Log directory of the module in current execution. It is given when
+        the module runs in a worker process, which does not share the
+        InternalPath state of the main process.
+
+    Returns
+    -------
+    str
+        The executed test module.
+    """
+    if execution_log_dir:
+        INTERNAL_PATH.current_execution_log_dir.update(
+            {test_module: execution_log_dir}
+        )
+
+    emulator_session = None
+    appium_session = None
+    appium_log = None
+
+    if test_module == "mobile":
+        emulator_session = run_android_emulator(
+            device_name=ARGUMENTS.device_name
+        )
+        appium_session, appium_log = run_appium_server(test_module)
+
+    set_robot_syslog_file_env_var(
+        INTERNAL_PATH.current_syslog_robot_path.get(test_module)
+    )
+
+    execute_robot_test_cases(
+        debug=ARGUMENTS.debug, retry_times=ARGUMENTS.retry_times,
+        stop_on_failure=ARGUMENTS.stop_on_failure, test_module=test_module,
+        shard_by=ARGUMENTS.shard_by, shard_workers=ARGUMENTS.shard_workers,
+        generate_html=ARGUMENTS.robot_html
+    )
+
+    if test_module == "mobile":
+        if appium_log and appium_session:
+            appium_log.flush()
+            appium_session.terminate()
+            appium_session.wait()
+            appium_log.close()
+            copyfile(
+                f'{INTERNAL_PATH.current_execution_log_dir[test_module]}'
+                f'/appium-{ARGUMENTS.appium_port}.log',
+                f'{INTERNAL_PATH.latest_combined_log}'
+                f'/appium-{ARGUMENTS.appium_port}.log'
+            )
+        if emulator_session:
+            emulator_session.terminate()
+            emulator_session.wait()
+            emulator_session.kill()
+    return test_module
+
+
+def _execute_test_modules_in_parallel(test_modules: list,
+                                      max_workers: int) -> dict:
+    """Execute test modules in parallel.
+
+    Every module runs in its own worker process, so each of them gets its own
+    ROBOT_SYSLOG_FILE and log directories.
+
+    Parameters
+    ----------
+    test_modules : list
+        Test modules, or runs of the web module, to be executed.
+    max_workers : int
+        The maximum amount of worker processes.
+
+    Returns
+    -------
+    dict
+        Error of every module that could not be executed.
+    """
+    failed_modules = {}
+    with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(test_modules))) as executor:
+        futures = {
+            executor.submit(
+                _execute_test_module, test_module,
+                INTERNAL_PATH.current_execution_log_dir.get(test_module)
+            ): test_module
+            for test_module in test_modules
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as error:
+                failed_modules[futures[future]] = error
+
+    for test_module, error in failed_modules.items():
+        print(f"The module {test_module} could not be executed. {error}")
+    return failed_modules
 
 
 def execute_test_cases() -> None:
@@ -28,52 +139,42 @@ def execute_test_cases() -> None:
     """
 
     generate_current_time_execution_log_dir()
+    retention_thread = start_log_retention(
+        INTERNAL_PATH.current_execution_log_dir.values()
+    )
 
     test_module_in_lower = [test_module.lower()
                             for test_module in list(set(ARGUMENTS.module))]
     if 'all' in test_module_in_lower:
         test_module_in_lower = INTERNAL_PATH.test_modules
 
-    emulator_session = None
-    appium_session = None
-    appium_log = None
-
-    for test_module in [module.lower() for module in test_module_in_lower
-                        if module.lower() in INTERNAL_PATH.test_modules]:
-        if test_module == "mobile":
-            emulator_session = run_android_emulator(
-                device_name=ARGUMENTS.device_name
-            )
-            appium_session, appium_log = run_appium_server(test_module)
-
-        set_robot_syslog_file_env_var(
-            INTERNAL_PATH.current_syslog_robot_path.get(test_module)
-        )
-
-        execute_robot_test_cases(
-            debug=ARGUMENTS.debug, retry_times=ARGUMENTS.retry_times,
-            stop_on_failure=ARGUMENTS.stop_on_failure, test_module=test_module
+    test_modules = get_test_runs(
+        [module.lower() for module in test_module_in_lower
+         if module.lower() in INTERNAL_PATH.test_modules]
+    )
+
+    # The runs of the web module on several browsers are always executed in
+    # parallel, thus the browser matrix costs the time of the slowest one.
+    browser_runs = [test_module for test_module in test_modules
+                    if test_module != get_run_module(test_module)]
+    max_workers = max(ARGUMENTS.parallel_modules, len(browser_runs))
+    failed_modules = {}
+    if max_workers > 1 and len(test_modules) > 1:
+        failed_modules = _execute_test_modules_in_parallel(
+            test_modules=test_modules, max_workers=max_workers
         )
-
-        if test_module == "mobile":
-            if appium_log and appium_session:
-                appium_log.flush()
-                appium_session.terminate()
-                appium_session.wait()
-                appium_log.close()
-                copyfile(
-                    f'{INTERNAL_PATH.current_execution_log_dir[test_module]}'
-                    f'/appium-{ARGUMENTS.appium_port}.log',
-                    f'{INTERNAL_PATH.latest_combined_log}'
-                    f'/appium-{ARGUMENTS.appium_port}.log'
-                )
-            if emulator_session:
-                emulator_session.terminate()
-                emulator_session.wait()
-                emulator_session.kill()
+    else:
+        for test_module in test_modules:
+            _execute_test_module(test_module)
 
     # Export latest combined logs
-    create_latest_combined_log()
+    close_log_sinks()
+    create_latest_combined_log(generate_html=ARGUMENTS.robot_html)
+    if retention_thread:
+        retention_thread.join()
+    # A module that crashed fails the invocation, as in the serial path.
+    if failed_modules:
+        raise next(iter(failed_modules.values()))
 
     if ARGUMENTS.run_allure:
         allure_local_session = run_allure_report_server()
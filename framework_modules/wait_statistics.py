@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module accounts the time that the tests spend in explicit waits.
+
+Every worker process records its waits per test and per locator, and saves
+them next to the output.xml of the module when it exits:
+    {robot report dir}/wait-statistics-{pid}.json
+The files of the workers are merged into wait-statistics.json once the module
+is executed, the waits that burn the most time come first.
+
+    Functions in this module:
+
+        +   get_wait_statistics(output_dir: str) -> WaitStatistics
+                Get the wait statistics of the current process.
+
+        +   merge_wait_statistics(output_dir: str) -> dict
+                Merge the wait statistics of the worker processes.
+"""
+
+from glob import glob
+from json import load, dump
+from os import getpid, remove, path
+from threading import Lock
+
+from .log_sink import register_exit_handler
+
+
+class WaitStatistics:
+    """Wait statistics.
+
+    Attributes
+    ----------
+    statistics_file : str
+        Path to the file that the statistics are saved to.
+    """
+
+    def __init__(self, statistics_file: str):
+        """Constructor."""
+        self.statistics_file = statistics_file
+        self.__waits = {}
+        self.__lock = Lock()
+
+    def record(self, test_name: str, locator: str, condition: str,
+               elapsed: float, result: bool) -> None:
+        """Record a wait.
+
+        Parameters
+        ----------
+        test_name : str
+        locator : str
+        condition : str
+            Expected condition of the wait.
+        elapsed : float
+            Time in seconds spent in the wait.
+        result : bool
+            False if the wait timed out.
+
+        Returns
+        -------
+        None
+        """
+        with self.__lock:
+            wait = self.__waits.setdefault(
+                (test_name, locator, condition),
+                {'count': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0}
+            )
+            wait['count'] += 1
+            wait['total'] += elapsed
+            wait['max'] = max(wait['max'], elapsed)
+            wait['timeouts'] += 0 if result else 1
+
+    def save(self) -> None:
+        with self.__lock:
+            waits = [dict(wait_, test=test_, locator=locator_,
+                          condition=condition_)
+                     for (test_, locator_, condition_), wait_
+                     in self.__waits.items()]
+        if not waits:
+            return
+        with open(self.statistics_file, 'w', encoding='utf-8') as file_:
+            dump(waits, file_)
+
+
+_WAIT_STATISTICS = {}
+
+
+def get_wait_statistics(output_dir: str) -> WaitStatistics:
+    """Get wait statistics.
+
+    The statistics are created on the first call of the current process, and
+    saved when the process exits.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directory of the output.xml of the module.
+
+    Returns
+    -------
+    WaitStatistics
+    """
+    if output_dir not in _WAIT_STATISTICS:
+        statistics = WaitStatistics(
+            f"{output_dir}/wait-statistics-{getpid()}.json"
+        )
+        register_exit_handler(statistics, WaitStatistics.save)
+        _WAIT_STATISTICS[output_dir] = statistics
+    return _WAIT_STATISTICS[output_dir]
+
+
+def _summarize(waits: list, keys: tuple) -> list:
+    """Sum the waits that have the same keys, the longest total first."""
+    summary = {}
+    for wait_ in waits:
+        key = tuple(wait_.get(key_) for key_ in keys)
+        item = summary.setdefault(key, dict(
+            zip(keys, key), count=0, total=0.0, max=0.0, timeouts=0
+        ))
+        item['count'] += wait_.get('count', 0)
+        item['total'] += wait_.get('total', 0.0)
+        item['max'] = max(item['max'], wait_.get('max', 0.0))
+        item['timeouts'] += wait_.get('timeouts', 0)
+    return sorted(summary.values(), key=lambda item_: -item_['total'])
+
+
+def merge_wait_statistics(output_dir: str) -> dict:
+    """Merge wait statistics.
+
+    Merge the statistics of the worker processes into wait-statistics.json,
+    the files of the workers are removed.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directory of the output.xml of the module.
+
+    Returns
+    -------
+    dict
+        total, per test and per locator statistics, None if no wait was
+        recorded.
+    """
+    waits = []
+    for statistics_file in glob(f"{output_dir}/wait-statistics-*.json"):
+        try:
+            with open(statistics_file, encoding='utf-8') as file_:
+                waits += load(file_)
+        except (OSError, ValueError):
+            continue
+        remove(statistics_file)
+    if not waits:
+        return None
+    merged = {
+        'total': sum(wait_.get('total', 0.0) for wait_ in waits),
+        'tests': _summarize(waits, ('test',)),
+        'locators': _summarize(waits, ('locator', 'condition'))
+    }
+    with open(path.join(output_dir, 'wait-statistics.json'), 'w',
+              encoding='utf-8') as file_:
+        dump(merged, file_, indent=4)
+    return merged
@@ -14,7 +14,8 @@ def main() -> None:
 
     # Import custom library
     from framework_modules import (
-        ARGUMENTS, set_python_path_env_var, generate_docs, execute_test_cases
+        ARGUMENTS, set_python_path_env_var, generate_docs, execute_test_cases,
+        extract_test_log
     )
 
     # Add workspace directory to PYTHON_PATH, thus the RobotFramework can
@@ -25,6 +26,11 @@ def main() -> None:
     if ARGUMENTS.gen_doc:
         return generate_docs()
 
+    # Print the events of a test from the event logs of previous runs
+    if ARGUMENTS.extract_test_log:
+        return extract_test_log(ARGUMENTS.extract_test_log,
+                                ARGUMENTS.events_dir)
+
     # Run test cases in normal environment
     execute_test_cases()
 